@@ -1,2 +1,15 @@
-from .a_star import AStar
-from .dijkstra import Dijkstra
+from .a_star import AStar, AGridNode
+from .dijkstra import Dijkstra, DijkstraGridNode
+from .d_star_lite import DStarLite
+from .jump_point_search import JumpPointSearch
+from .bidirectional import BidirectionalAStar, BidirectionalDijkstra, BidirectionalGridNode
+from .costs import CostModel
+from .grid import Grid, GridNode
+from .batch import find_paths
+from .path_cache import PathCache
+from .hpa_star import HPAStar
+from .board_file import MappedGrid, open_board, write_board
+from .components import ComponentIndex
+from .landmarks import LandmarkTable, LandmarkCostModel
+from .server import PathServer, PathClient
+from .cooperative import CooperativePlanner
@@ -1,40 +1,65 @@
-from base import BaseNode, BaseAlgorithm
+from heapq import heapify
+from itertools import count
+
+from .base import BaseNode, BaseAlgorithm, SearchResult
+from .costs import COST_DIGITS
+from .grid import GridField, GridNode
 
 
 class ANode(BaseNode):
+    __slots__ = ('g_cost', 'h_cost', 'open_order')
+
     def __init__(self, x, y):
         super().__init__(x, y)
         self.g_cost = 0  # temp
         self.h_cost = None
+        self.open_order = None
 
     def __repr__(self):
         return "ANode({},{})".format(self.x, self.y)
 
     def __str__(self):
-        return "{}, {}".format(self.g_cost, self.h_cost)
+        return "{:.3g}, {:.3g}".format(self.g_cost, self.h_cost or 0)
+
+
+class AGridNode(GridNode):
+    __slots__ = ()
+    g_cost = GridField('d', 0)
+    h_cost = GridField('d', 0)
+    open_order = GridField('i', 0)
+
+    def __repr__(self):
+        return "AGridNode({},{})".format(self.x, self.y)
+
+    def __str__(self):
+        return "{:.3g}, {:.3g}".format(self.g_cost, self.h_cost)
+
 
 class AStar(BaseAlgorithm):
 
-    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=ANode):
-        super().__init__(rows, cols, start, end, board, node_type)
-        self.start_node.h_cost = self._calc_cost(self.start_node)
-        self.open_nodes.append(self.start_node)
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=ANode,
+                 cost_model=None, components=None):
+        super().__init__(rows, cols, start, end, board, node_type, cost_model, components)
+        # open_heap holds (f_cost, h_cost, open_order, node) entries; stale ones are skipped on pop
+        self.open_heap = []
+        self.open_nodes = set()
+        self.closed_nodes = set()
+        self._open_order = count()
+        self.start_node.h_cost = self._heuristic_cost(self.start_node)
+        self._push_open(self.start_node)
 
     def algorithm_loop(self):
         """
         Perform one A* algorithm loop.
         :return: None
         """
-        if self.path_found or not self.open_nodes:
+        if self.path_found or not self.open_nodes or self._unreachable():
             self.path = self.backtrack_path()
             self.alg_end = True
             return None
 
-        self.open_nodes.sort(key=lambda t: t.h_cost)
-        current = min(self.open_nodes, key=lambda t: t.g_cost + t.h_cost)
-
-        self.open_nodes.remove(current)
-        self.closed_nodes.append(current)
+        current = self._pop_open()
+        self.closed_nodes.add(current)
 
         if current == self.end_node:
             self.path_found = True
@@ -43,23 +68,98 @@ class AStar(BaseAlgorithm):
             return None
 
         self.board_array[current.y][current.x] = 6
-        if not current.neighbours:
-            self._set_node_neighbours(current)
-
-        for neighbour in current.neighbours:
+        for neighbour in self._successors(current):
 
             if not neighbour.traversable or neighbour in self.closed_nodes:
                 continue
 
-            if neighbour not in self.open_nodes or self._calc_cost(neighbour,
-                                                                   current) + current.g_cost < neighbour.g_cost:
-                neighbour.g_cost = self._calc_cost(neighbour, current) + current.g_cost
+            g_cost = self._step_cost(current, neighbour) + current.g_cost
+            if neighbour not in self.open_nodes or g_cost < neighbour.g_cost:
+                neighbour.g_cost = g_cost
                 if not neighbour.h_cost:
-                    neighbour.h_cost = self._calc_cost(neighbour)
+                    neighbour.h_cost = self._heuristic_cost(neighbour)
                 neighbour.parent = current
                 if neighbour not in self.open_nodes:
-                    self.open_nodes.append(neighbour)
                     self.board_array[neighbour.y][neighbour.x] = 5
+                self._push_open(neighbour)
+
+    def solve(self):
+        """
+        Run A* to the end in one loop, without painting board_array. Continues a search started with algorithm_loop.
+        :return: SearchResult
+        """
+        if self._unreachable():
+            self.alg_end = True
+            self.path = []
+            return SearchResult(self.path, len(self.closed_nodes), None)
+        open_heap, open_nodes, closed_nodes = self.open_heap, self.open_nodes, self.closed_nodes
+        end_node, open_order = self.end_node, self._open_order
+        step_cost, heuristic_cost = self._step_cost, self._heuristic_cost
+        heappush, heappop = self._heappush, self._heappop
+
+        while open_nodes and not self.path_found:
+            f_cost, _, _, current = heappop(open_heap)
+            if current not in open_nodes or f_cost != round(current.g_cost + current.h_cost, COST_DIGITS):
+                continue
+            open_nodes.remove(current)
+            closed_nodes.add(current)
+            if current == end_node:
+                self.path_found = True
+                break
+
+            current_g_cost = current.g_cost
+            for neighbour in self._successors(current):
+                if not neighbour.traversable or neighbour in closed_nodes:
+                    continue
+                g_cost = step_cost(current, neighbour) + current_g_cost
+                is_open = neighbour in open_nodes
+                if not is_open or g_cost < neighbour.g_cost:
+                    neighbour.g_cost = g_cost
+                    if not neighbour.h_cost:
+                        neighbour.h_cost = heuristic_cost(neighbour)
+                    neighbour.parent = current
+                    if not is_open:
+                        open_nodes.add(neighbour)
+                        neighbour.open_order = next(open_order)
+                    h_cost = neighbour.h_cost
+                    heappush(open_heap, (round(neighbour.g_cost + h_cost, COST_DIGITS), h_cost,
+                                         neighbour.open_order, neighbour))
+
+        self.alg_end = True
+        self.path = self._backtrack_path(paint=False)
+        return SearchResult(self.path, len(closed_nodes), end_node.g_cost if self.path_found else None)
+
+    def _successors(self, node):
+        """
+        Nodes reachable from an expanded node, their step cost is _step_cost(node, successor)
+        :return: list of nodes
+        """
+        if not node.neighbours:
+            self._set_node_neighbours(node)
+        return node.neighbours
+
+    def _push_open(self, node):
+        """
+        Add node to the open set, or re-queue it with its lowered cost.
+        Ties on f_cost are broken by h_cost, then by the order nodes were first opened in.
+        :return: None
+        """
+        if node not in self.open_nodes:
+            self.open_nodes.add(node)
+            node.open_order = next(self._open_order)
+        self._heappush(self.open_heap, (round(node.g_cost + node.h_cost, COST_DIGITS), node.h_cost, node.open_order,
+                                        node))
+
+    def _pop_open(self):
+        """
+        Pop the open node with the lowest f_cost, skipping entries superseded by a cheaper re-queue.
+        :return: ANode
+        """
+        while True:
+            f_cost, _, _, node = self._heappop(self.open_heap)
+            if node in self.open_nodes and f_cost == round(node.g_cost + node.h_cost, COST_DIGITS):
+                self.open_nodes.remove(node)
+                return node
 
     def backtrack_path(self, current=None):
         """
@@ -88,11 +188,13 @@ class AStar(BaseAlgorithm):
         self.board_array[self.start_node.y][self.start_node.x] = 0
         self.board_array[y][x] = 2
 
-        self.open_nodes.remove(self.start_node)
-        self.open_nodes.append(self.BOARD[y][x])
+        self.open_nodes.discard(self.start_node)
+        self.open_heap = [entry for entry in self.open_heap if entry[-1] != self.start_node]
+        heapify(self.open_heap)
 
         self.start_node = self.BOARD[y][x]
-        self.start_node.h_cost = self._calc_cost(self.start_node)
+        self.start_node.h_cost = self._heuristic_cost(self.start_node)
+        self._push_open(self.start_node)
 
     def move_end_node(self, x, y):
         """
@@ -1,5 +1,6 @@
 import unittest
 from algorithms.a_star import AStar
+from algorithms.costs import SQRT_2
 
 
 class TestStringMethods(unittest.TestCase):
@@ -68,6 +69,26 @@ class TestStringMethods(unittest.TestCase):
                                                 [1, 1, 1, 4],
                                                 [0, 0, 0, 3]])
 
+    def test_solve(self):
+        board = [[2, 0, 0, 0],
+                 [1, 1, 1, 0],
+                 [0, 0, 0, 3]]
+        a = AStar(board=[row[:] for row in board])
+        result = a.solve()
+        self.assertEqual([(node.x, node.y) for node in result.path], [(3, 2), (3, 1), (2, 0), (1, 0), (0, 0)])
+        self.assertAlmostEqual(result.cost, 3 + SQRT_2)
+        self.assertEqual(result.nodes_expanded, len(a.closed_nodes))
+        self.assertEqual(a.board_array, board)
+
+    def test_solve_unreachable(self):
+        a = AStar(board=[[2, 1, 0],
+                         [1, 1, 0],
+                         [0, 0, 3]])
+        result = a.solve()
+        self.assertFalse(a.path_found)
+        self.assertEqual(result.path, [])
+        self.assertIsNone(result.cost)
+
 
 if __name__ == '__main__':
     unittest.main()
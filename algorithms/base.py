@@ -1,7 +1,81 @@
 from abc import abstractmethod
+from collections import namedtuple
+from heapq import heappush, heappop
+
+from . import instrumentation, paths
+from .costs import DEFAULT_COST_MODEL
+from .grid import Grid, GridNode, ScratchGrid, NEIGHBOUR_OFFSETS
+
+
+SearchResult = namedtuple('SearchResult', ['path', 'nodes_expanded', 'cost'])
+# kind is 'opened'/'closed' (value = board_array code), 'cell' (any other board_array change, value = code),
+# 'parent' (value = (x, y) of the new parent or None) or 'path' (x, y of the end node, value = [(x, y)] from start)
+SearchEvent = namedtuple('SearchEvent', ['kind', 'x', 'y', 'value'])
+_EVENT_KINDS = {5: 'opened', 6: 'closed'}
+
+
+class _RecordingRow(object):
+    """
+    board_array row wrapper that logs (x, y, code) of every write that changes a cell
+    """
+    __slots__ = ('row', 'y', 'writes')
+
+    def __init__(self, row, y, writes):
+        self.row = row
+        self.y = y
+        self.writes = writes
+
+    def __getitem__(self, x):
+        return self.row[x]
+
+    def __setitem__(self, x, value):
+        if self.row[x] != value:
+            self.writes.append((x, self.y, value))
+        self.row[x] = value
+
+    def __len__(self):
+        return len(self.row)
+
+    def __iter__(self):
+        return iter(self.row)
+
+
+class _RecordingParents(object):
+    """
+    Grid parent array wrapper that logs the index of every write that changes a parent
+    """
+    __slots__ = ('parents', 'writes')
+
+    def __init__(self, parents, writes):
+        self.parents = parents
+        self.writes = writes
+
+    def __getitem__(self, index):
+        return self.parents[index]
+
+    def __setitem__(self, index, value):
+        if self.parents[index] != value:
+            self.writes.append(index)
+        self.parents[index] = value
+
+    def __len__(self):
+        return len(self.parents)
+
+
+def _recording_push(heappush, nodes):
+    """
+    heappush that logs the node of every entry, the entries of every heap end with their node
+    :return: function
+    """
+    def recording_push(heap, item):
+        nodes.append(item[-1])
+        heappush(heap, item)
+    return recording_push
 
 
 class BaseNode(object):
+    __slots__ = ('x', 'y', 'traversable', 'parent', 'neighbours')
+
     def __init__(self, x, y):
         """
         Node object.
@@ -19,21 +93,38 @@ class BaseNode(object):
 
 
 class BaseAlgorithm(object):
-    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=BaseNode):
+    # heap operations go through these so instrument() can count them per instance
+    _heappush = staticmethod(heappush)
+    _heappop = staticmethod(heappop)
+    # methods generating the neighbours of a node, instrument() counts and times their calls
+    _neighbour_methods = ('_set_node_neighbours',)
+
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=BaseNode,
+                 cost_model=None, components=None):
         """
         Creating object that contains board for algorithm. Each element in board is Node
         :param int rows:    Number of rows
         :param int cols:    Number of columns
         :param (int,int) start:   Start node [(x-coordinate, y-coordinate)]
         :param (int,int) end:   End node [(x-coordinate, y-coordinate)]
-        :param [[]] board:    (oprtional) 2d Int Array [1-obstacle, 2-start node, 3-end node]
+        :param [[]] board:    (oprtional) 2d Int Array [1-obstacle, 2-start node, 3-end node] or a Grid, which is
+                              copied unless it is a ScratchGrid from Grid.scratch()
+        :param type node_type:    Node class, a GridNode subclass stores the board in a compact Grid instead
+        :param CostModel cost_model:    (optional) Step costs and heuristic, octile distance by default
+        :param ComponentIndex components:   (optional) Connectivity of the board, a start and end in different
+                                            components end the search before any node is expanded
         """
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.components = components
         self.open_nodes = []
         self.closed_nodes = []
         self.path_found = False
         self.alg_end = False
+        self.grid = None
 
-        if board:
+        if issubclass(node_type, GridNode):
+            self._init_grid(rows, cols, start, end, board, node_type)
+        elif board:
             self.BOARD = [[node_type(x, y) for x in range(len(board[0]))] for y in range(len(board))]
             self.board_array = board
             self.len_x = len(self.BOARD[0])
@@ -63,6 +154,40 @@ class BaseAlgorithm(object):
             self.end_node = self.BOARD[end[1]][end[0]]
             self.board_array[end[1]][end[0]] = 3
 
+    def _init_grid(self, rows, cols, start, end, board, node_type):
+        """
+        Build the board as a Grid, board_array rows are views into its state array
+        :return: None
+        """
+        if isinstance(board, Grid):
+            # shared board template, start/end come from the arguments unless the grid marks them.
+            # A ScratchGrid is already this search's own grid over the template.
+            self.grid = board if isinstance(board, ScratchGrid) else board.copy(node_type)
+            start_index, end_index = self.grid.find(2), self.grid.find(3)
+            start_index = start_index if start_index >= 0 else self.grid.index(*start)
+            end_index = end_index if end_index >= 0 else self.grid.index(*end)
+            self.grid.state[start_index] = 2
+            self.grid.state[end_index] = 3
+        elif board:
+            self.grid = Grid.from_board(board, node_type)
+            start_index = self.grid.find(2)
+            end_index = self.grid.find(3)
+            if start_index < 0 or end_index < 0:
+                raise AttributeError("No start/end node specified!")
+        else:
+            self.grid = Grid(rows, cols, node_type)
+            start_index = self.grid.index(*start)
+            end_index = self.grid.index(*end)
+            self.grid.state[start_index] = 2
+            self.grid.state[end_index] = 3
+
+        self.BOARD = self.grid
+        self.board_array = self.grid.rows()
+        self.len_x = self.grid.len_x
+        self.len_y = self.grid.len_y
+        self.start_node = self.grid.node(start_index)
+        self.end_node = self.grid.node(end_index)
+
     abstractmethod
 
     def algorithm_loop(self):
@@ -70,6 +195,115 @@ class BaseAlgorithm(object):
         Perform one algorithm loop
         """
 
+    @abstractmethod
+    def solve(self):
+        """
+        Run the search to the end in one go, without painting board_array
+        :return: SearchResult
+        """
+
+    def instrument(self, callback=None):
+        """
+        Start collecting metrics of this instance: nodes expanded, neighbour generations, heap operations,
+        open heap peak and time spent searching, generating neighbours, in the queue and backtracking.
+        Off by default, only instrumented instances pay for it.
+        :param callback:    (optional) Called with the Metrics after each finished search
+        :return: instrumentation.Metrics, also available as self.metrics
+        """
+        return instrumentation.attach(self, callback)
+
+    def _expansions(self):
+        """
+        Nodes expanded by the current search so far, instrument() counts algorithm_loop steps by it
+        :return: int
+        """
+        return len(self.closed_nodes)
+
+    def stop_instrumenting(self):
+        """
+        :return: instrumentation.Metrics collected so far, None if not instrumented
+        """
+        return instrumentation.detach(self)
+
+    def iter_search(self, max_expansions=1):
+        """
+        Run the search step by step, yielding what changed instead of the whole board.
+        Each yield is a list of SearchEvent covering up to max_expansions algorithm loops, the search only advances
+        while the consumer asks for more, so a slow consumer pauses it and nothing queues up in between.
+        send(n) to the generator changes max_expansions from the next batch on.
+        Parent changes are recorded where they are written in the grid parent links. Node objects have no such
+        array, their parents are compared with the last report for the nodes pushed on a heap in the batch (every
+        parent write of a step is followed by a push) and, once the search ends, for the nodes of the path.
+        Usage: for events in alg.iter_search(): ...
+        :param int max_expansions:  Algorithm loops per yield
+        :return: generator of [SearchEvent]
+        """
+        writes, parent_writes = [], []
+        recording_rows = [_RecordingRow(row, y, writes) for y, row in enumerate(self.board_array)]
+        parents = {}
+        while not self.alg_end:
+            board_array = self.board_array
+            self.board_array = recording_rows
+            if self.grid is not None:
+                self.grid.parent = _RecordingParents(self.grid.parent, parent_writes)
+            else:
+                # per instance, like instrument(), which may have replaced _heappush already
+                heappush = self.__dict__.get('_heappush')
+                self._heappush = _recording_push(self._heappush, parent_writes)
+            try:
+                for _ in range(max_expansions):
+                    self.algorithm_loop()
+                    if self.alg_end:
+                        break
+            finally:
+                self.board_array = board_array
+                if self.grid is not None:
+                    self.grid.parent = self.grid.parent.parents
+                elif heappush is None:
+                    del self._heappush
+                else:
+                    self._heappush = heappush
+            events = [SearchEvent(_EVENT_KINDS.get(code, 'cell'), x, y, code) for x, y, code in writes]
+            if self.grid is not None:
+                written = map(self.grid.node, dict.fromkeys(parent_writes))
+            else:
+                written = dict.fromkeys(parent_writes + (self.path if self.alg_end and self.path_found else []))
+            events += self._parent_events(written, parents)
+            del writes[:]
+            del parent_writes[:]
+            if self.alg_end:
+                path = [(node.x, node.y) for node in reversed(self.path)] if self.path_found else []
+                events.append(SearchEvent('path', self.end_node.x, self.end_node.y, path))
+            max_expansions = (yield events) or max_expansions
+
+    def _parent_events(self, nodes, parents):
+        """
+        Parent changes since the last report
+        :param nodes:   Nodes whose parent may have been written in this step
+        :param dict parents:    (x, y) -> parent (x, y) last reported, updated in place
+        :return: list of SearchEvent
+        """
+        events = []
+        for node in nodes:
+            parent = node.parent
+            parent = (parent.x, parent.y) if parent is not None else None
+            if parents.get((node.x, node.y)) != parent:
+                parents[(node.x, node.y)] = parent
+                events.append(SearchEvent('parent', node.x, node.y, parent))
+        return events
+
+    def path_array(self):
+        """
+        Path of the finished search as a flat array of coordinates [x0, y0, x1, y1, ...] from start to end,
+        read from the grid parent links without creating node objects
+        :return: array('i'), empty if no path was found
+        """
+        if not self.path_found:
+            return paths.as_array([])
+        if self.grid is not None:
+            return paths.backtrack(self.grid, self.end_node.index)
+        return paths.as_array(reversed(self.path))
+
     def add_obstacle(self, x, y):
         """
         Add obstacle in given (x,y) position
@@ -77,6 +311,8 @@ class BaseAlgorithm(object):
         """
         self.BOARD[y][x].traversable = False
         self.board_array[y][x] = 1
+        if self.components is not None:
+            self.components.add_obstacle(x, y)
 
     def remove_obstacle(self, x, y):
         """
@@ -85,6 +321,8 @@ class BaseAlgorithm(object):
         """
         self.BOARD[y][x].traversable = True
         self.board_array[y][x] = 0
+        if self.components is not None:
+            self.components.remove_obstacle(x, y)
 
     @abstractmethod
     def move_start_node(self, x, y):
@@ -108,50 +346,75 @@ class BaseAlgorithm(object):
         :param node: Node to be moved (start/end)
         :return: None
         """
-        if node is self.start_node:
+        if node == self.start_node:
             self.move_start_node(x, y)
-        elif node is self.end_node:
+        elif node == self.end_node:
             self.move_end_node(x, y)
         else:
             print("WARNING: can move only start/end.\n"
                   "TIP: Use add/remove obstacles to modify board")
 
+    def board_to_2d_list(self):
+        """
+        Copy of board_array without the open/closed visualisation states (path is kept)
+        :return: list
+        """
+        return [[0 if value in [5, 6] else value for value in row] for row in self.board_array]
+
     def _set_node_neighbours(self, node):
         """
         Returns node neighbours that are traversable
         :return list of traversable nodes
         """
-        all_neighbours = [self.BOARD[node.y + y][node.x + x] for x in reversed(range(-1, 2)) for y in
-                          reversed(range(-1, 2))
-                          if 0 <= node.x + x < self.len_x and 0 <= node.y + y < self.len_y]
-        non_traversable_neighbours = []
-        for neighbour in all_neighbours:
+        if self.grid is not None:
+            node.neighbours = [self.grid.node(index) for index in self.grid.neighbours(node.index)]
+        else:
+            node.neighbours = list(self._iter_node_neighbours(node))
+
+    def _iter_node_neighbours(self, node):
+        """
+        Yield traversable neighbours, a diagonal is blocked only when both nodes next to it are obstacles
+        :return: generator of nodes
+        """
+        board = self.BOARD
+        x, y = node.x, node.y
+        for x_diff, y_diff in NEIGHBOUR_OFFSETS:
+            if not (0 <= x + x_diff < self.len_x and 0 <= y + y_diff < self.len_y):
+                continue
+            neighbour = board[y + y_diff][x + x_diff]
             if not neighbour.traversable:
-                non_traversable_neighbours.append(neighbour)
-            elif neighbour.x != node.x and neighbour.y != node.y:
-                x_diff = neighbour.x - node.x
-                y_diff = neighbour.y - node.y
-                if not self.BOARD[node.y + y_diff][node.x].traversable and \
-                        not self.BOARD[node.y][node.x + x_diff].traversable:
-                    non_traversable_neighbours.append(neighbour)
-        node.neighbours = [neighbour for neighbour in all_neighbours if neighbour not in non_traversable_neighbours]
+                continue
+            if x_diff and y_diff and not board[y + y_diff][x].traversable and not board[y][x + x_diff].traversable:
+                continue
+            yield neighbour
+
+    def _unreachable(self):
+        """
+        Start and end lie in different components of the connectivity index
+        :return: bool, False without an index
+        """
+        return self.components is not None and not self.components.connected(
+            (self.start_node.x, self.start_node.y), (self.end_node.x, self.end_node.y))
+
+    def _step_cost(self, current, destination):
+        """
+        Cost of moving from current to the adjacent destination node
+        :return: number
+        """
+        return self.cost_model.step_cost(current, destination)
 
-    def _calc_cost(self, current, destination=None):
+    def _heuristic_cost(self, current, destination=None):
         """
-        TBC
-        :param current:
-        :param destination:
-        :return:
+        Heuristic estimate of the cost from current to destination (end node by default)
+        :return: number
         """
-        if not destination:
-            destination = self.end_node
-        distance = abs(destination.x - current.x) + abs(destination.y - current.y)
-        return distance
+        return self.cost_model.heuristic(current, destination or self.end_node)
 
-    def _backtrack_path(self, current=None):
+    def _backtrack_path(self, current=None, paint=True):
         """
         Backtrack node (based on their parent value)
         :param current: (optional) backtrack from specific node
+        :param bool paint: Mark the path on board_array
         :return: list
         """
         path = []
@@ -161,8 +424,11 @@ class BaseAlgorithm(object):
                 path.append(self.end_node)
             while current.parent:
                 path.append(current.parent)
-                self.board_array[current.parent.y][current.parent.x] = 4
+                if paint:
+                    self.board_array[current.parent.y][current.parent.x] = 4
                 current = current.parent
+        if not paint:
+            return path
         self.board_array[self.start_node.y][self.start_node.x] = 2
         self.board_array[self.end_node.y][self.end_node.x] = 3
         return path
@@ -174,3 +440,5 @@ class BaseAlgorithm(object):
         """
         self.BOARD[y][x].traversable = False
         self.board_array[y][x] = 1
+        if self.components is not None:
+            self.components.add_obstacle(x, y)
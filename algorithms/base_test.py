@@ -0,0 +1,119 @@
+import random
+import unittest
+from algorithms.a_star import AStar, ANode, AGridNode
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalDijkstra, BidirectionalGridNode
+from algorithms.d_star_lite import DStarLite
+from algorithms.dijkstra import Dijkstra
+from algorithms.jump_point_search import JumpPointSearch
+
+
+class TestNeighbours(unittest.TestCase):
+
+    def test_slotted_nodes(self):
+        self.assertFalse(hasattr(ANode(0, 0), '__dict__'))
+
+    def test_corner_rule_matches_grid(self):
+        board = [[2, 1, 0],
+                 [1, 0, 0],
+                 [0, 1, 3]]
+        nodes = AStar(board=[row[:] for row in board])
+        grid = AStar(board=[row[:] for row in board], node_type=AGridNode)
+        for y in range(3):
+            for x in range(3):
+                node, view = nodes.BOARD[y][x], grid.BOARD[y][x]
+                nodes._set_node_neighbours(node)
+                grid._set_node_neighbours(view)
+                self.assertEqual([(n.x, n.y) for n in node.neighbours], [(n.x, n.y) for n in view.neighbours])
+        self.assertEqual(nodes.BOARD[0][0].neighbours, [])
+        self.assertEqual([(n.x, n.y) for n in nodes.BOARD[1][1].neighbours], [(2, 2), (2, 1), (2, 0)])
+
+
+class TestIterSearch(unittest.TestCase):
+    BOARD = [[2, 0, 0, 0],
+             [1, 1, 1, 0],
+             [0, 0, 0, 0],
+             [3, 1, 1, 1]]
+
+    def test_events_replay_board(self):
+        for algorithm, node_type in [(AStar, ANode), (AStar, AGridNode), (Dijkstra, None)]:
+            a = algorithm(board=[row[:] for row in self.BOARD], **({'node_type': node_type} if node_type else {}))
+            mirror = [list(row) for row in a.board_array]
+            parents = {}
+            for events in a.iter_search():
+                for event in events:
+                    if event.kind == 'parent':
+                        parents[(event.x, event.y)] = event.value
+                    elif event.kind != 'path':
+                        mirror[event.y][event.x] = event.value
+            self.assertEqual(mirror, [list(row) for row in a.board_array])
+            self.assertEqual(event.kind, 'path')
+            self.assertEqual(event.value, [(0, 0), (1, 0), (2, 0), (3, 1), (2, 2), (1, 2), (0, 3)])
+            # the parent events alone rebuild the path
+            cell, path = (0, 3), [(0, 3)]
+            while parents.get(cell):
+                cell = parents[cell]
+                path.append(cell)
+            self.assertEqual(path[::-1], event.value)
+
+    def test_parent_events_match_parents(self):
+        rnd = random.Random(0)
+        for seed in range(20):
+            board = [[1 if rnd.random() < 0.3 else 0 for _ in range(8)] for _ in range(8)]
+            board[0][0], board[7][7] = 2, 3
+            for algorithm, node_type in [(JumpPointSearch, AGridNode), (BidirectionalAStar, BidirectionalGridNode),
+                                         (BidirectionalDijkstra, None), (DStarLite, None), (AStar, ANode),
+                                         (JumpPointSearch, ANode)]:
+                a = algorithm(board=[row[:] for row in board], **({'node_type': node_type} if node_type else {}))
+                parents = {}
+                for events in a.iter_search(3):
+                    parents.update(((event.x, event.y), event.value) for event in events if event.kind == 'parent')
+                for y in range(8):
+                    for x in range(8):
+                        parent = a.BOARD[y][x].parent
+                        self.assertEqual(parents.get((x, y)), (parent.x, parent.y) if parent else None,
+                                         (seed, algorithm.__name__, x, y))
+
+    def test_overlapping_searches(self):
+        a = AStar(board=[row[:] for row in self.BOARD])
+        first = a.iter_search()
+        next(first)
+        second = a.iter_search()
+        next(second)
+        first.close()
+        second.close()
+        # node classes and the heap operations are left as they were
+        self.assertIs(type(a.BOARD[2][2]), ANode)
+        self.assertNotIn('_heappush', vars(a))
+        other = AStar(board=[row[:] for row in self.BOARD])
+        search = other.iter_search()
+        next(search)
+        self.assertEqual(len(AStar(board=[row[:] for row in self.BOARD]).solve().path), 7)
+        self.assertEqual(search.send(100)[-1].kind, 'path')
+
+    def test_instrumented_search(self):
+        a = AStar(board=[row[:] for row in self.BOARD])
+        metrics = a.instrument()
+        parents = {}
+        for events in a.iter_search(2):
+            parents.update(((event.x, event.y), event.value) for event in events if event.kind == 'parent')
+        self.assertEqual(parents[(0, 3)], (1, 2))
+        self.assertGreater(metrics.heap_pushes, 0)
+        self.assertIn('_heappush', vars(a))
+
+    def test_max_expansions(self):
+        one_by_one = len(list(Dijkstra(board=[row[:] for row in self.BOARD]).iter_search()))
+        search = Dijkstra(board=[row[:] for row in self.BOARD]).iter_search(max_expansions=2)
+        batches = [next(search), search.send(100)]
+        self.assertRaises(StopIteration, next, search)
+        self.assertEqual(batches[-1][-1].kind, 'path')
+        self.assertGreater(one_by_one, 2)
+
+    def test_no_path(self):
+        a = AStar(board=[[2, 1, 0],
+                         [1, 1, 3]])
+        events = [event for events in a.iter_search(10) for event in events]
+        self.assertEqual(events[-1], ('path', 2, 1, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
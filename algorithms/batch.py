@@ -0,0 +1,114 @@
+from multiprocessing import Pool
+
+from .a_star import AStar, AGridNode
+from .grid import Grid, GridNode
+from .paths import FORMATS, as_array
+
+# board template and algorithm of the current worker process, set once by _init_worker
+_BOARD = None
+_ALGORITHM = None
+_NODE_TYPE = None
+_COST_MODEL = None
+_COMPONENTS = None
+_PATH_FORMAT = 'cells'
+
+
+def _init_worker(board, algorithm, node_type, cost_model=None, components=None, path_format='cells'):
+    global _BOARD, _ALGORITHM, _NODE_TYPE, _COST_MODEL, _COMPONENTS, _PATH_FORMAT
+    _BOARD = board
+    _ALGORITHM = algorithm
+    _NODE_TYPE = node_type
+    _COST_MODEL = cost_model
+    _COMPONENTS = components
+    _PATH_FORMAT = path_format
+
+
+def solve_query(board, start, end, algorithm=AStar, node_type=AGridNode, cost_model=None, components=None,
+                path_format='cells'):
+    """
+    Run one (start, end) query against a board template
+    :param Grid board:  Board from board_template
+    :param type node_type:      GridNode subclass, or a node class of the algorithm, which searches a list board
+                                built from the template per query
+    :param ComponentIndex components:   (optional) Connectivity of the board, unreachable queries are answered
+                                        without building the algorithm
+    :param str path_format:     'cells' for a list of (x, y), otherwise a flat array('i') [x0, y0, x1, y1, ...] of
+                                'array' every cell, 'waypoints' the cells where the direction changes or
+                                'smoothed' any-angle waypoints, see algorithms.paths
+    :return: (path from start to end, empty if end is unreachable; path cost (of the cell path) or None)
+    """
+    if path_format != 'cells' and path_format not in FORMATS:
+        raise ValueError("Unknown path format {!r}".format(path_format))
+    if components is not None and not components.connected(start, end):
+        return ([] if path_format == 'cells' else as_array([])), None
+    # grid node searches run on a scratch grid of the template, sized once and reset only where the last search went
+    grid = board.scratch(node_type) if issubclass(node_type, GridNode) else board
+    try:
+        if grid is not board:
+            alg = algorithm(start=start, end=end, board=grid, node_type=node_type, cost_model=cost_model)
+        else:
+            # node objects are built from a list board, marked with this query's start/end
+            marked = [list(row) for row in board.rows()]
+            marked[start[1]][start[0]] = 2
+            marked[end[1]][end[0]] = 3
+            alg = algorithm(board=marked, node_type=node_type, cost_model=cost_model)
+            # marks made the cells under them traversable, obstacles stay obstacles like on grids
+            for x, y in [start, end]:
+                if not board.traversable[board.index(x, y)]:
+                    alg.BOARD[y][x].traversable = False
+        result = alg.solve()
+        if path_format == 'cells':
+            return [(node.x, node.y) for node in reversed(result.path)], result.cost
+        return FORMATS[path_format](board, alg.path_array()), result.cost
+    finally:
+        if grid is not board:
+            grid.release()
+
+
+def _find_path(query):
+    start, end = query
+    return solve_query(_BOARD, start, end, _ALGORITHM, _NODE_TYPE, _COST_MODEL, _COMPONENTS, _PATH_FORMAT)[0]
+
+
+def board_template(board):
+    """
+    Parse board once into a Grid without start/end marks, so it can be shared by many queries.
+    Marks left in a template would override the start/end of every query.
+    :param [[]] board:    2d Int Array [1-obstacle, 2-start node, 3-end node] or a Grid, which is copied
+    :return: Grid
+    """
+    grid = board.copy() if isinstance(board, Grid) else Grid.from_board(board)
+    for code in [2, 3]:
+        index = grid.find(code)
+        if index >= 0:
+            grid.state[index] = 0
+    return grid
+
+
+def find_paths(board, queries, workers=1, algorithm=AStar, node_type=AGridNode, chunksize=None, cost_model=None,
+               components=None, path_format='cells'):
+    """
+    Find paths for many (start, end) pairs on one board.
+    The board is parsed once and handed to every worker process when it starts, not pickled per query.
+    :param [[]] board:    2d Int Array [1-obstacle] or a Grid, start/end marks are ignored
+    :param queries:     Sequence of ((x, y), (x, y)) start/end pairs
+    :param int workers:     Number of processes, 1 runs the queries in this process
+    :param type algorithm:      BaseAlgorithm subclass
+    :param type node_type:      Node class of the algorithm, GridNode subclasses search the shared board in place
+    :param int chunksize:       (optional) Queries sent to a worker at once
+    :param CostModel cost_model:    (optional) Step costs and heuristic of the algorithm
+    :param ComponentIndex components:   (optional) Connectivity of the board, rejects unreachable queries
+    :param str path_format:     'cells', 'array', 'waypoints' or 'smoothed', see solve_query
+    :return: list of paths (from start to end, empty if unreachable), in query order
+    """
+    grid = board_template(board)
+    queries = list(queries)
+    if workers <= 1:
+        return [solve_query(grid, start, end, algorithm, node_type, cost_model, components, path_format)[0]
+                for start, end in queries]
+
+    if not chunksize:
+        chunksize = max(1, len(queries) // (workers * 8))
+    with Pool(workers, initializer=_init_worker,
+              initargs=(grid, algorithm, node_type, cost_model, components, path_format)) as pool:
+        return pool.map(_find_path, queries, chunksize)
@@ -0,0 +1,47 @@
+import unittest
+from algorithms import batch
+from algorithms.batch import find_paths
+from algorithms.a_star import ANode
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.grid import Grid
+
+BOARD = [[0, 0, 0, 0],
+         [1, 1, 1, 0],
+         [0, 0, 0, 0],
+         [0, 1, 1, 1]]
+
+
+class TestFindPaths(unittest.TestCase):
+
+    def test_in_process(self):
+        paths = find_paths(BOARD, [((0, 0), (0, 2)), ((0, 2), (3, 0)), ((0, 0), (3, 3))])
+        self.assertEqual(paths, [[(0, 0), (1, 0), (2, 0), (3, 1), (2, 2), (1, 2), (0, 2)],
+                                 [(0, 2), (1, 2), (2, 2), (3, 1), (3, 0)],
+                                 []])
+        # the worker globals are left to pool workers
+        self.assertIsNone(batch._BOARD)
+
+    def test_pool_keeps_query_order(self):
+        queries = [((0, 0), (x, 2)) for x in range(4)] * 5
+        self.assertEqual(find_paths(BOARD, queries, workers=2, chunksize=3), find_paths(BOARD, queries))
+
+    def test_marked_grid_template(self):
+        marked = [row[:] for row in BOARD]
+        marked[0][0], marked[2][0] = 2, 3
+        grid = Grid.from_board(marked)
+        self.assertEqual(find_paths(grid, [((1, 2), (3, 0))]), [[(1, 2), (2, 2), (3, 1), (3, 0)]])
+        self.assertEqual(grid.find(2), 0)
+
+    def test_node_objects(self):
+        queries = [((0, 0), (0, 2)), ((0, 2), (3, 0)), ((0, 0), (3, 3))]
+        expected = find_paths(BOARD, queries)
+        self.assertEqual(find_paths(BOARD, queries, node_type=ANode), expected)
+        self.assertEqual(find_paths(BOARD, queries, workers=2, node_type=ANode), expected)
+
+    def test_dijkstra(self):
+        paths = find_paths(BOARD, [((0, 2), (3, 0))], algorithm=Dijkstra, node_type=DijkstraGridNode)
+        self.assertEqual(len(paths[0]), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
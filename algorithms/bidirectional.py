@@ -0,0 +1,243 @@
+from math import inf
+
+from .base import BaseNode, BaseAlgorithm, SearchResult
+from .costs import COST_DIGITS
+from .grid import GridField, GridNode
+
+
+class BidirectionalNode(BaseNode):
+    __slots__ = ('d', 'd_reverse', 'child')
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.d = inf  # distance from the start node
+        self.d_reverse = inf  # distance to the end node
+        self.child = None  # next node towards the end node, found by the backward search
+
+    def __repr__(self):
+        return "BidirectionalNode({},{})".format(self.x, self.y)
+
+    def __str__(self):
+        return "{:.3g}, {:.3g}".format(self.d, self.d_reverse)
+
+
+class BidirectionalGridNode(GridNode):
+    __slots__ = ()
+    d = GridField('d', inf)
+    d_reverse = GridField('d', inf)
+    child_index = GridField('i', 0)  # index + 1, like GridNode.parent
+
+    @property
+    def child(self):
+        child = self.child_index
+        return self.grid.node(child - 1) if child else None
+
+    @child.setter
+    def child(self, node):
+        self.child_index = node.index + 1 if node is not None else 0
+
+    def __repr__(self):
+        return "BidirectionalGridNode({},{})".format(self.x, self.y)
+
+    def __str__(self):
+        return "{:.3g}, {:.3g}".format(self.d, self.d_reverse)
+
+
+class BidirectionalDijkstra(BaseAlgorithm):
+    """
+    Dijkstra grown from both the start and the end node, the search with the smaller frontier is expanded first.
+    best_cost is the cheapest start-to-end path seen where the searches touched, the search ends once the two
+    smallest frontier keys add up to it. Parent chains of both halves are then spliced at the meeting node.
+    """
+
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=BidirectionalNode,
+                 cost_model=None):
+        super().__init__(rows, cols, start, end, board, node_type, cost_model)
+        self._start_search()
+
+    def _start_search(self):
+        """
+        Root the forward search at the start node and the backward search at the end node
+        :return: None
+        """
+        # open heaps hold (key, y, x, distance, node) entries; stale ones are skipped
+        self.open_heap, self.open_heap_reverse = [], []
+        self.open_nodes, self.open_nodes_reverse = set(), set()
+        self.closed_nodes, self.closed_nodes_reverse = set(), set()
+        self.best_cost = 0 if self.start_node == self.end_node else inf
+        self.meeting_node = self.start_node if self.start_node == self.end_node else None
+        self.path = []
+        self.path_found = False
+        self.alg_end = False
+        self.start_node.d = 0
+        self.end_node.d_reverse = 0
+        self._push(self.start_node, self.start_node.d, False)
+        self._push(self.end_node, self.end_node.d_reverse, True)
+
+    def _potential(self, node):
+        """
+        Node potential added to forward keys and subtracted from backward keys, 0 for plain Dijkstra
+        :return: number
+        """
+        return 0
+
+    def _push(self, node, distance, reverse):
+        if reverse:
+            self.open_nodes_reverse.add(node)
+            key = distance - self._potential(node)
+            self._heappush(self.open_heap_reverse, (round(key, COST_DIGITS), node.y, node.x, distance, node))
+        else:
+            self.open_nodes.add(node)
+            key = distance + self._potential(node)
+            self._heappush(self.open_heap, (round(key, COST_DIGITS), node.y, node.x, distance, node))
+
+    def _top_key(self, reverse):
+        """
+        Smallest key of one frontier, stale heap entries are dropped on the way
+        :return: number (inf if the frontier is empty)
+        """
+        heap = self.open_heap_reverse if reverse else self.open_heap
+        open_nodes = self.open_nodes_reverse if reverse else self.open_nodes
+        while heap:
+            node, distance = heap[0][-1], heap[0][-2]
+            if node in open_nodes and distance == (node.d_reverse if reverse else node.d):
+                return heap[0][0]
+            self._heappop(heap)
+        return inf
+
+    def _search_done(self):
+        return self._top_key(False) + self._top_key(True) >= self.best_cost
+
+    def _expand(self, paint):
+        """
+        Expand the best node of the smaller frontier
+        :return: None
+        """
+        reverse = len(self.open_nodes_reverse) < len(self.open_nodes)
+        heap = self.open_heap_reverse if reverse else self.open_heap
+        current = self._heappop(heap)[-1]
+        (self.open_nodes_reverse if reverse else self.open_nodes).remove(current)
+        closed_nodes = self.closed_nodes_reverse if reverse else self.closed_nodes
+        closed_nodes.add(current)
+        if paint and current != self.start_node and current != self.end_node:
+            self.board_array[current.y][current.x] = 6
+
+        if not current.neighbours:
+            self._set_node_neighbours(current)
+        for neighbour in current.neighbours:
+            if neighbour in closed_nodes:
+                continue
+            if reverse:
+                distance = current.d_reverse + self._step_cost(neighbour, current)
+                if distance >= neighbour.d_reverse:
+                    continue
+                neighbour.d_reverse = distance
+                neighbour.child = current
+                distance = neighbour.d_reverse
+            else:
+                distance = current.d + self._step_cost(current, neighbour)
+                if distance >= neighbour.d:
+                    continue
+                neighbour.d = distance
+                neighbour.parent = current
+                distance = neighbour.d
+            if paint and self.board_array[neighbour.y][neighbour.x] == 0:
+                self.board_array[neighbour.y][neighbour.x] = 5
+            self._push(neighbour, distance, reverse)
+            if neighbour.d + neighbour.d_reverse < self.best_cost:
+                self.best_cost = neighbour.d + neighbour.d_reverse
+                self.meeting_node = neighbour
+
+    def _finish(self, paint):
+        """
+        Splice the backward chain onto the forward one at the meeting node and backtrack the path
+        :return: None
+        """
+        self.alg_end = True
+        self.path_found = self.meeting_node is not None
+        if self.path_found:
+            node = self.meeting_node
+            while node != self.end_node:
+                node.child.parent = node
+                node = node.child
+        self.path = self._backtrack_path(paint=paint)
+
+    def algorithm_loop(self):
+        """
+        Perform one bidirectional search loop.
+        :return: None
+        """
+        if self.alg_end:
+            return None
+        if self._search_done():
+            self._finish(True)
+            return None
+        self._expand(True)
+
+    def solve(self):
+        """
+        Run the search to the end in one loop, without painting board_array.
+        Continues a search started with algorithm_loop.
+        :return: SearchResult
+        """
+        if not self.alg_end:
+            while not self._search_done():
+                self._expand(False)
+            self._finish(False)
+        return SearchResult(self.path, len(self.closed_nodes) + len(self.closed_nodes_reverse),
+                            self.best_cost if self.path_found else None)
+
+    def _expansions(self):
+        return len(self.closed_nodes) + len(self.closed_nodes_reverse)
+
+    def _reset_search(self):
+        """
+        Clear the labels of every node either search reached
+        :return: None
+        """
+        for node in self.open_nodes | self.closed_nodes | self.open_nodes_reverse | self.closed_nodes_reverse:
+            node.d = node.d_reverse = inf
+            node.parent = node.child = None
+
+    def move_start_node(self, x, y):
+        """
+        Move start node to a given (x,y) position, the search starts over
+        :return: None
+        """
+        self._reset_search()
+        self.board_array[self.start_node.y][self.start_node.x] = 0
+        self.board_array[y][x] = 2
+        self.start_node = self.BOARD[y][x]
+        self._start_search()
+
+    def move_end_node(self, x, y):
+        """
+        Move end node to a given (x,y) position, the search starts over
+        :return: None
+        """
+        self._reset_search()
+        self.board_array[self.end_node.y][self.end_node.x] = 0
+        self.board_array[y][x] = 3
+        self.end_node = self.BOARD[y][x]
+        self._start_search()
+
+
+class BidirectionalAStar(BidirectionalDijkstra):
+    """
+    Bidirectional A* with average potentials: forward keys add (h(node, end) - h(start, node)) / 2 and backward keys
+    subtract it. Both searches then see the same consistent reduced costs, so the bidirectional Dijkstra stopping
+    rule stays exact while each frontier is pulled towards the other end.
+    """
+
+    def _potential(self, node):
+        return (self._heuristic_cost(node, self.end_node) - self._heuristic_cost(self.start_node, node)) / 2
+
+
+if __name__ == "__main__":
+    a = BidirectionalAStar(board=[[2, 0, 0],
+                                  [0, 1, 1],
+                                  [0, 1, 0],
+                                  [0, 0, 3]])
+    while not a.alg_end:
+        a.algorithm_loop()
+    print(a.board_array)
@@ -0,0 +1,63 @@
+import random
+import unittest
+from algorithms.batch import board_template, solve_query
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalDijkstra, BidirectionalGridNode
+from algorithms.costs import SQRT_2
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+
+
+class TestBidirectional(unittest.TestCase):
+
+    def test_path(self):
+        for algorithm in [BidirectionalDijkstra, BidirectionalAStar]:
+            board = [[2, 0, 0],
+                     [0, 1, 1],
+                     [0, 1, 0],
+                     [0, 0, 3]]
+            a = algorithm(board=board)
+            while not a.alg_end:
+                a.algorithm_loop()
+            self.assertEqual(a.board_to_2d_list(), [[2, 0, 0],
+                                                    [4, 1, 1],
+                                                    [4, 1, 0],
+                                                    [0, 4, 3]])
+            self.assertAlmostEqual(a.solve().cost, 3 + SQRT_2)
+
+    def test_matches_dijkstra(self):
+        rnd = random.Random(0)
+        for seed in range(30):
+            board = [[1 if rnd.random() < 0.3 else 0 for _ in range(15)] for _ in range(15)]
+            grid = board_template(board)
+            start, end = (rnd.randrange(15), rnd.randrange(15)), (rnd.randrange(15), rnd.randrange(15))
+            if board[start[1]][start[0]] or board[end[1]][end[0]]:
+                continue
+            _, expected = solve_query(grid, start, end, Dijkstra, DijkstraGridNode)
+            for algorithm in [BidirectionalDijkstra, BidirectionalAStar]:
+                result = algorithm(start=start, end=end, board=grid, node_type=BidirectionalGridNode).solve()
+                if expected is None:
+                    self.assertIsNone(result.cost)
+                    self.assertEqual(result.path, [])
+                    continue
+                self.assertAlmostEqual(result.cost, expected)
+                self.assertEqual((result.path[-1].x, result.path[-1].y), start)
+                self.assertEqual((result.path[0].x, result.path[0].y), end)
+
+    def test_expands_fewer_nodes(self):
+        board = [[0 for _ in range(40)] for _ in range(40)]
+        board[20][5] = 2
+        board[20][35] = 3
+        expanded = Dijkstra(board=[row[:] for row in board]).solve().nodes_expanded
+        self.assertLess(BidirectionalDijkstra(board=[row[:] for row in board]).solve().nodes_expanded, expanded)
+
+    def test_move_nodes(self):
+        a = BidirectionalAStar(6, 6, start=(0, 0), end=(5, 5))
+        a.solve()
+        a.move_node(2, 0, a.start_node)
+        a.move_node(2, 5, a.end_node)
+        result = a.solve()
+        self.assertEqual(result.cost, 5)
+        self.assertEqual(len(result.path), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
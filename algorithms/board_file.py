@@ -0,0 +1,362 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from .grid import NEIGHBOUR_OFFSETS, Grid, GridNode, _StateRow, _TRAVERSABLE_TABLE
+
+# file layout: 32 byte header, then len_y rows of cells.
+# 1-byte cells are 1 (traversable) or 0 (obstacle), packed rows hold 8 cells per byte, first cell in the top bit,
+# each row padded to a whole byte
+MAGIC = b'PFGD'
+VERSION = 1
+FLAG_PACKED = 1
+_HEADER = struct.Struct('<4sHHIIiiii')
+HEADER_SIZE = 32
+
+# 8-bit samples of an image at or above the threshold (white) are free cells
+DEFAULT_THRESHOLD = 128
+_BITS_TABLE = bytes(0x31 if code else 0x30 for code in range(256))  # traversability -> '1'/'0' digits
+
+BoardHeader = namedtuple('BoardHeader', ['version', 'packed', 'len_x', 'len_y', 'start', 'end'])
+
+
+def read_header(path):
+    """
+    :param str path:    Board file
+    :return: BoardHeader, start/end are (x, y) tuples or None
+    """
+    with open(path, 'rb') as file:
+        return _parse_header(file.read(HEADER_SIZE), path)
+
+
+def _parse_header(data, path):
+    if len(data) < HEADER_SIZE or data[:4] != MAGIC:
+        raise ValueError("{} is not a board file".format(path))
+    magic, version, flags, len_x, len_y, start_x, start_y, end_x, end_y = _HEADER.unpack_from(data)
+    if version > VERSION:
+        raise ValueError("{} has board file version {}, newest supported is {}".format(path, version, VERSION))
+    return BoardHeader(version, bool(flags & FLAG_PACKED), len_x, len_y,
+                       (start_x, start_y) if start_x >= 0 else None,
+                       (end_x, end_y) if end_x >= 0 else None)
+
+
+def _write(path, len_x, len_y, rows, start, end, packed):
+    """
+    Stream rows of traversability bytes into a board file
+    :return: None
+    """
+    start_x, start_y = start if start is not None else (-1, -1)
+    end_x, end_y = end if end is not None else (-1, -1)
+    header = _HEADER.pack(MAGIC, VERSION, FLAG_PACKED if packed else 0, len_x, len_y, start_x, start_y, end_x, end_y)
+    row_bytes = (len_x + 7) // 8
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\x00'))
+        for row in rows:
+            if packed:
+                digits = bytes(row).translate(_BITS_TABLE).ljust(row_bytes * 8, b'0')
+                row = int(digits, 2).to_bytes(row_bytes, 'big')
+            file.write(row)
+
+
+def write_board(path, board, start=None, end=None, packed=False):
+    """
+    Save board as a board file
+    :param str path:    Output file
+    :param board:   2d Int Array [1-obstacle, 2-start node, 3-end node] (lists of ints or bytes-like rows) or Grid
+    :param (int,int) start:     (optional) Start node, the board's start mark by default
+    :param (int,int) end:   (optional) End node, the board's end mark by default
+    :param bool packed:     Store 8 cells per byte
+    :return: None
+    """
+    if isinstance(board, Grid):
+        len_x, len_y = board.len_x, board.len_y
+        marks = [board.find(code) for code in [2, 3]]
+        marks = [divmod(index, len_x)[::-1] if index >= 0 else None for index in marks]
+        rows = (bytes(board.traversable[y * len_x:(y + 1) * len_x]) for y in range(len_y))
+    else:
+        len_x, len_y = len(board[0]), len(board)
+        marks = [None, None]
+        for y, row in enumerate(board):
+            row = bytes(row)
+            for position, code in enumerate([2, 3]):
+                x = row.find(code)
+                if marks[position] is None and x >= 0:
+                    marks[position] = (x, y)
+        rows = (bytes(row).translate(_TRAVERSABLE_TABLE) for row in board)
+    _write(path, len_x, len_y, rows, start or marks[0], end or marks[1], packed)
+
+
+def _pgm_rows(path, threshold):
+    """
+    Stream a binary (P5) or plain (P2) PGM image row by row
+    :return: generator of (len_x, len_y), then the traversability rows
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(2)
+        if magic not in [b'P5', b'P2']:
+            raise ValueError("{} is not a PGM image".format(path))
+        tokens = []
+        while len(tokens) < 3:
+            line = file.readline()
+            if not line:
+                raise ValueError("{} has a truncated PGM header".format(path))
+            tokens += line.split(b'#')[0].split()
+        try:
+            len_x, len_y, max_value = (int(token) for token in tokens[:3])
+        except ValueError:
+            raise ValueError("{} has a bad PGM header".format(path))
+        yield len_x, len_y
+
+        if magic == b'P2':
+            samples = [int(token) for token in tokens[3:]]
+            for _ in range(len_y):
+                while len(samples) < len_x:
+                    line = file.readline()
+                    if not line:
+                        raise ValueError("{} is truncated".format(path))
+                    samples += [int(token) for token in line.split(b'#')[0].split()]
+                yield bytes(1 if value * 255 >= threshold * max_value else 0 for value in samples[:len_x])
+                del samples[:len_x]
+        elif max_value < 256:
+            table = bytes(1 if value * 255 >= threshold * max_value else 0 for value in range(256))
+            for _ in range(len_y):
+                row = file.read(len_x)
+                if len(row) != len_x:
+                    raise ValueError("{} is truncated".format(path))
+                yield row.translate(table)
+        else:
+            for _ in range(len_y):
+                data = file.read(2 * len_x)
+                if len(data) != 2 * len_x:
+                    raise ValueError("{} is truncated".format(path))
+                samples = array('H', data)
+                if sys.byteorder == 'little':
+                    samples.byteswap()
+                yield bytes(1 if value * 255 >= threshold * max_value else 0 for value in samples)
+
+
+def _png_rows(path, threshold):
+    """
+    Read a PNG (or any image Pillow knows) as 8-bit grayscale
+    :return: generator of (len_x, len_y), then the traversability rows
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow is needed to convert {} (pip install Pillow), PGM images need no extra module"
+                          .format(path))
+    with Image.open(path) as image:
+        image = image.convert('L')
+    len_x, len_y = image.size
+    yield len_x, len_y
+    pixels = image.tobytes()
+    table = bytes(1 if value >= threshold else 0 for value in range(256))
+    for y in range(len_y):
+        yield pixels[y * len_x:(y + 1) * len_x].translate(table)
+
+
+def convert_image(image_path, path, start=None, end=None, threshold=DEFAULT_THRESHOLD, packed=False):
+    """
+    Convert a grayscale map image into a board file, light pixels are free cells and dark pixels obstacles.
+    PGM images are read natively and streamed row by row, other formats (PNG) need Pillow.
+    :param str image_path:  Input image
+    :param str path:    Output board file
+    :param (int,int) start:     (optional) Start node stored in the header
+    :param (int,int) end:   (optional) End node stored in the header
+    :param int threshold:   Smallest 8-bit gray value of a free cell
+    :param bool packed:     Store 8 cells per byte
+    :return: None
+    """
+    with open(image_path, 'rb') as file:
+        pgm = file.read(2) in [b'P5', b'P2']
+    rows = (_pgm_rows if pgm else _png_rows)(image_path, threshold)
+    try:
+        len_x, len_y = next(rows)
+        _write(path, len_x, len_y, rows, start, end, packed)
+    finally:
+        rows.close()
+
+
+def open_board(path, node_type=GridNode, marks=True):
+    """
+    Map a board file as a Grid, see MappedGrid
+    :param str path:    Board file
+    :param type node_type:  GridNode subclass
+    :param bool marks:  Mark the header's start/end node in the state, set False for templates shared by many queries
+    :return: MappedGrid
+    """
+    return MappedGrid(path, node_type, marks)
+
+
+class PackedCells(object):
+    """
+    Writable 0/1 sequence over bit-packed rows, the traversable array of a packed board file
+    """
+    __slots__ = ('data', 'len_x', 'row_bytes', 'length')
+
+    def __init__(self, data, len_x, len_y):
+        self.data = data
+        self.len_x = len_x
+        self.row_bytes = (len_x + 7) // 8
+        self.length = len_x * len_y
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return bytes(self[i] for i in range(*index.indices(self.length)))
+        y, x = divmod(index, self.len_x)
+        return self.data[y * self.row_bytes + (x >> 3)] >> (7 - (x & 7)) & 1
+
+    def __setitem__(self, index, value):
+        y, x = divmod(index, self.len_x)
+        position = y * self.row_bytes + (x >> 3)
+        bit = 1 << (7 - (x & 7))
+        self.data[position] = self.data[position] | bit if value else self.data[position] & ~bit
+
+    def __len__(self):
+        return self.length
+
+
+class _PagedArray(object):
+    """
+    Typed array allocated one page at a time on first write, unwritten items read as the default
+    """
+    __slots__ = ('typecode', 'default', 'length', 'pages')
+    PAGE_BITS = 12
+
+    def __init__(self, typecode, default, length):
+        self.typecode = typecode
+        self.default = default
+        self.length = length
+        self.pages = {}
+
+    @property
+    def itemsize(self):
+        return array(self.typecode).itemsize
+
+    def __getitem__(self, index):
+        page = self.pages.get(index >> self.PAGE_BITS)
+        return self.default if page is None else page[index & ((1 << self.PAGE_BITS) - 1)]
+
+    def __setitem__(self, index, value):
+        page = self.pages.get(index >> self.PAGE_BITS)
+        if page is None:
+            page = self.pages[index >> self.PAGE_BITS] = array(self.typecode, [self.default]) * (1 << self.PAGE_BITS)
+        page[index & ((1 << self.PAGE_BITS) - 1)] = value
+
+    def __len__(self):
+        return self.length
+
+
+def _zeroed(typecode, length):
+    """
+    Zero-filled typed array backed by an anonymous map, the OS hands out pages on first touch
+    :return: memoryview
+    """
+    itemsize = array(typecode).itemsize
+    return memoryview(mmap.mmap(-1, max(length * itemsize, 1))).cast(typecode)[:length]
+
+
+class _MarkedState(object):
+    """
+    State array of a MappedGrid. Remembers where start/end marks were written, so find() does not scan the map.
+    """
+    __slots__ = ('cells', 'marked')
+
+    def __init__(self, length):
+        self.cells = _zeroed('B', length)
+        self.marked = set()
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __setitem__(self, index, value):
+        if value in (2, 3):
+            self.marked.add(index)
+        self.cells[index] = value
+
+    def __len__(self):
+        return len(self.cells)
+
+    def find(self, code):
+        indexes = [index for index in self.marked if self.cells[index] == code]
+        return min(indexes) if indexes else -1
+
+
+class MappedGrid(Grid):
+    def __init__(self, path, node_type=GridNode, marks=True):
+        """
+        Grid over a memory mapped board file. Nothing is read or allocated up front: traversable is a private
+        copy-on-write map of the file, state, parents and cost fields are anonymous maps (or pages allocated on
+        first write for fields with a non-zero default), so a search only touches the pages it explores.
+        Obstacles live in traversable only, board_array rows read them back as 1.
+        Edits stay private to this grid. Copies and pickles map the file again and replay the start/end marks and
+        the traversability edits made through set_traversable (GridNode.traversable, PathCache, HPAStar).
+        :param str path:    Board file
+        :param type node_type:  GridNode subclass
+        :param bool marks:  Mark the header's start/end node in the state
+        """
+        self.path = os.path.abspath(path)
+        self.node_type = node_type
+        with open(self.path, 'rb') as file:
+            self.header = _parse_header(file.read(HEADER_SIZE), path)
+            len_x, len_y = self.header.len_x, self.header.len_y
+            row_bytes = (len_x + 7) // 8 if self.header.packed else len_x
+            if os.fstat(file.fileno()).st_size < HEADER_SIZE + row_bytes * len_y:
+                raise ValueError("{} is truncated".format(path))
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        size = len_x * len_y
+        self.len_x = len_x
+        self.len_y = len_y
+        cells = memoryview(self._map)[HEADER_SIZE:HEADER_SIZE + row_bytes * len_y]
+        self.traversable = PackedCells(cells, len_x, len_y) if self.header.packed else cells
+        self.state = _MarkedState(size)
+        self.parent, self.fields = self._search_arrays(node_type)
+        self._offsets = tuple((x_diff, y_diff, y_diff * len_x + x_diff) for x_diff, y_diff in NEIGHBOUR_OFFSETS)
+        self.edits = {}  # cell index -> traversable value written by set_traversable
+        self._scratch_grids = {}
+        if marks:
+            for code, position in [(2, self.header.start), (3, self.header.end)]:
+                if position is not None:
+                    self.state[self.index(*position)] = code
+
+    def copy(self, node_type=None):
+        """
+        Map the file again, carrying over the start/end marks and the traversability edits
+        :return: MappedGrid
+        """
+        grid = MappedGrid(self.path, node_type or self.node_type, marks=False)
+        grid.__setstate__(self._edited_state())
+        return grid
+
+    def _search_arrays(self, node_type):
+        size = self.len_x * self.len_y
+        return _zeroed('i', size), {name: _zeroed(field.typecode, size) if not field.default
+                                    else _PagedArray(field.typecode, field.default, size)
+                                    for name, field in node_type.grid_fields().items()}
+
+    def set_traversable(self, index, value):
+        self.traversable[index] = value
+        self.edits[index] = value
+
+    def _edited_state(self):
+        """
+        :return: (marks as [(index, code)], traversability edits as {index: value})
+        """
+        marks = [(index, self.state[index]) for index in self.state.marked if self.state[index] in (2, 3)]
+        return marks, dict(self.edits)
+
+    def rows(self):
+        return [_StateRow(self, y) for y in range(self.len_y)]
+
+    def __reduce__(self):
+        return MappedGrid, (self.path, self.node_type, False), self._edited_state()
+
+    def __setstate__(self, state):
+        marks, edits = state
+        for index, code in marks:
+            self.state[index] = code
+        for index, value in edits.items():
+            self.set_traversable(index, value)
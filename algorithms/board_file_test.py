@@ -0,0 +1,119 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template, find_paths
+from algorithms.board_file import convert_image, open_board, read_header, write_board
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.path_cache import PathCache
+
+BOARD = [[2, 0, 0],
+         [0, 1, 1],
+         [0, 1, 0],
+         [0, 0, 3]]
+
+
+class TestBoardFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "board.pfg")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_header(self):
+        write_board(self.path, BOARD)
+        header = read_header(self.path)
+        self.assertEqual((header.len_x, header.len_y, header.start, header.end), (3, 4, (0, 0), (2, 3)))
+        self.assertFalse(header.packed)
+        self.assertEqual(os.path.getsize(self.path), 32 + 12)
+        write_board(self.path, BOARD, packed=True)
+        self.assertTrue(read_header(self.path).packed)
+        self.assertEqual(os.path.getsize(self.path), 32 + 4)
+
+    def test_search(self):
+        for packed in [False, True]:
+            write_board(self.path, BOARD, packed=packed)
+            for algorithm, node_type in [(AStar, AGridNode), (Dijkstra, DijkstraGridNode)]:
+                a = algorithm(board=open_board(self.path), node_type=node_type)
+                while not a.alg_end:
+                    a.algorithm_loop()
+                self.assertEqual(a.board_to_2d_list(), [[2, 0, 0],
+                                                        [4, 1, 1],
+                                                        [4, 1, 0],
+                                                        [0, 4, 3]])
+
+    def test_matches_in_memory_grid(self):
+        rnd = random.Random(0)
+        board = [[1 if rnd.random() < 0.3 else 0 for _ in range(21)] for _ in range(13)]
+        queries = [((rnd.randrange(21), rnd.randrange(13)), (rnd.randrange(21), rnd.randrange(13)))
+                   for _ in range(20)]
+        queries = [(start, end) for start, end in queries if not board[start[1]][start[0]] and not
+                   board[end[1]][end[0]]]
+        expected = find_paths(board_template(board), queries)
+        for packed in [False, True]:
+            write_board(self.path, board, packed=packed)
+            self.assertEqual(find_paths(open_board(self.path, marks=False), queries), expected)
+
+    def test_edits_stay_private(self):
+        write_board(self.path, BOARD)
+        a = AStar(board=open_board(self.path), node_type=AGridNode)
+        a.add_obstacle(0, 2)
+        self.assertEqual(a.solve().path, [])
+        self.assertEqual(open_board(self.path)[2][0].traversable, True)
+
+    def test_pickle_keeps_marks(self):
+        write_board(self.path, BOARD)
+        grid = open_board(self.path)
+        grid.state[grid.find(2)] = 0
+        grid.state[1] = 2
+        copy = pickle.loads(pickle.dumps(grid))
+        self.assertEqual((copy.find(2), copy.find(3)), (1, 11))
+
+    def test_copies_keep_edits(self):
+        for packed in [False, True]:
+            write_board(self.path, BOARD, packed=packed)
+            cache = PathCache(open_board(self.path, marks=False))
+            cache.add_obstacle(1, 0)
+            self.assertEqual(cache.find_path((0, 0), (2, 0)), [])
+            grid = open_board(self.path, marks=False)
+            grid[0][1].traversable = False
+            grid[1][1].traversable = True
+            grid[1][2].traversable = True
+            for copy in [grid.copy(), pickle.loads(pickle.dumps(grid))]:
+                self.assertEqual((copy[0][1].traversable, copy[1][1].traversable), (False, True))
+            self.assertEqual(find_paths(grid, [((0, 0), (2, 0))], workers=2), [[(0, 0), (1, 1), (2, 0)]])
+
+    def test_convert_pgm(self):
+        image = os.path.join(self.directory.name, "map.pgm")
+        with open(image, 'wb') as file:
+            file.write(b"P5\n# map\n3 2\n255\n" + bytes([255, 0, 200, 127, 128, 255]))
+        convert_image(image, self.path, start=(0, 0), end=(2, 1))
+        grid = open_board(self.path)
+        self.assertEqual(list(grid.traversable), [1, 0, 1, 0, 1, 1])
+        self.assertEqual((grid.find(2), grid.find(3)), (0, 5))
+        with open(image, 'wb') as file:
+            file.write(b"P2\n3 2\n15\n15 0 15\n0 15 15\n")
+        convert_image(image, self.path, packed=True)
+        self.assertEqual([open_board(self.path).traversable[index] for index in range(6)], [1, 0, 1, 0, 1, 1])
+        # plain samples are read line by line, rows need not follow the lines
+        with open(image, 'wb') as file:
+            file.write(b"P2\n3 2 15 15\n0 15 0\n# comment\n15 15\n")
+        convert_image(image, self.path)
+        self.assertEqual(list(open_board(self.path).traversable), [1, 0, 1, 0, 1, 1])
+
+    def test_convert_bad_pgm(self):
+        image = os.path.join(self.directory.name, "map.pgm")
+        for data in [b"P5\n3 2\n255\n" + bytes(5), b"P2\n3 2\n15\n15 0 15\n0 15\n", b"P5\n3 x\n255\n",
+                     b"P5\n3 2\n"]:
+            with open(image, 'wb') as file:
+                file.write(data)
+            with self.assertRaises(ValueError):
+                convert_image(image, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import re
+from array import array
+from collections import deque
+
+from .grid import Grid
+
+_FREE_RUN = re.compile(b'\x01+')
+# cells around a cell in ring order, consecutive ones are orthogonal neighbours of each other
+_RING = ((-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0))
+
+
+class ComponentIndex(object):
+    def __init__(self, board):
+        """
+        Connected components of the traversable cells, for rejecting unreachable queries without a search.
+        A diagonal step is only allowed when a cell next to it is traversable, and then the same two cells are also
+        joined by two orthogonal steps, so the components of the 8-neighbour/corner rule of _set_node_neighbours
+        are the 4-connected ones.
+        Cells hold labels, labels are merged by union-find. add_obstacle / remove_obstacle update the index in place.
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid
+        """
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.len_x = grid.len_x
+        self.len_y = grid.len_y
+        self.traversable = bytearray(grid.traversable)
+        self.labels = array('i', [0]) * (self.len_x * self.len_y)  # 0 for obstacles
+        self._parent = [0]  # label -> parent label
+        self.splits = 0
+        self._build()
+
+    def _build(self):
+        """
+        Label runs of traversable cells row by row, joining runs that overlap a run of the previous row
+        :return: None
+        """
+        len_x, labels, parent, find = self.len_x, self.labels, self._parent, self._find
+        finditer = _FREE_RUN.finditer
+        # runs of the previous row as parallel lists, ending in a sentinel run past the row end
+        previous_starts, previous_ends, previous_labels = [len_x], [len_x], [0]
+        for offset in range(0, len_x * self.len_y, len_x):
+            starts, ends, run_labels = [], [], []
+            position = 0
+            for match in finditer(self.traversable, offset, offset + len_x):
+                start, end = match.span()
+                start -= offset
+                end -= offset
+                # skip previous runs left of this one, the last one checked may reach into the next run
+                while previous_ends[position] <= start:
+                    position += 1
+                label = 0
+                overlap = position
+                while previous_starts[overlap] < end:
+                    root = previous_labels[overlap]
+                    if parent[root] != root:
+                        root = find(root)
+                    if not label:
+                        label = root
+                    elif root != label:
+                        parent[root] = label
+                    overlap += 1
+                if not label:
+                    label = len(parent)
+                    parent.append(label)
+                labels[offset + start:offset + end] = array('i', [label]) * (end - start)
+                starts.append(start)
+                ends.append(end)
+                run_labels.append(label)
+            starts.append(len_x)
+            ends.append(len_x)
+            run_labels.append(0)
+            previous_starts, previous_ends, previous_labels = starts, ends, run_labels
+        # point every label at its root, lookups take one step until the next edit
+        for label in range(len(parent)):
+            parent[label] = find(label)
+
+    def _find(self, label):
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def component(self, x, y):
+        """
+        :return: int id of the component of cell (x, y), None for obstacles
+        """
+        label = self.labels[y * self.len_x + x]
+        return self._find(label) if label else None
+
+    def connected(self, start, end):
+        """
+        :param (int,int) start:   [(x-coordinate, y-coordinate)]
+        :param (int,int) end:   [(x-coordinate, y-coordinate)]
+        :return: bool, False when either cell is an obstacle
+        """
+        component = self.component(*start)
+        return component is not None and component == self.component(*end)
+
+    def remove_obstacle(self, x, y):
+        """
+        Make cell (x, y) traversable, it joins the components next to it
+        :return: None
+        """
+        index = y * self.len_x + x
+        if self.traversable[index]:
+            return None
+        self.traversable[index] = 1
+        roots = {self._find(self.labels[neighbour]) for neighbour in self._neighbours(index)}
+        if not roots:
+            label = len(self._parent)
+            self._parent.append(label)
+        else:
+            label = roots.pop()
+            for root in roots:
+                self._parent[root] = label
+        self.labels[index] = label
+
+    def add_obstacle(self, x, y):
+        """
+        Make cell (x, y) an obstacle. When its neighbours are not joined around it, they are flooded from in turns;
+        pieces that run out of cells before meeting the rest get new labels, so the work is bounded by the
+        cut off pieces, not by the whole component.
+        :return: None
+        """
+        index = y * self.len_x + x
+        if not self.traversable[index]:
+            return None
+        self.traversable[index] = 0
+        self.labels[index] = 0
+        sources = self._separated_neighbours(x, y)
+        if len(sources) > 1:
+            self._split(sources)
+
+    def _neighbours(self, index):
+        """
+        Traversable orthogonal neighbours
+        :return: list of int
+        """
+        len_x = self.len_x
+        y, x = divmod(index, len_x)
+        traversable = self.traversable
+        neighbours = []
+        if x > 0 and traversable[index - 1]:
+            neighbours.append(index - 1)
+        if x < len_x - 1 and traversable[index + 1]:
+            neighbours.append(index + 1)
+        if y > 0 and traversable[index - len_x]:
+            neighbours.append(index - len_x)
+        if y < self.len_y - 1 and traversable[index + len_x]:
+            neighbours.append(index + len_x)
+        return neighbours
+
+    def _separated_neighbours(self, x, y):
+        """
+        One orthogonal neighbour of cell (x, y) per run of traversable cells on the ring around it,
+        neighbours on the same run stay joined through the ring
+        :return: list of int
+        """
+        ring = []
+        for x_diff, y_diff in _RING:
+            ring_x, ring_y = x + x_diff, y + y_diff
+            inside = 0 <= ring_x < self.len_x and 0 <= ring_y < self.len_y
+            ring.append(ring_y * self.len_x + ring_x if inside and self.traversable[ring_y * self.len_x + ring_x]
+                        else None)
+        if None not in ring:
+            return ring[1:2]
+        # walk the ring from an obstacle, so no run wraps around the end; orthogonal neighbours have odd positions
+        first = ring.index(None)
+        sources, run_has_source = [], False
+        for position in range(first, first + 8):
+            cell = ring[position % 8]
+            if cell is None:
+                run_has_source = False
+            elif position % 2 and not run_has_source:
+                sources.append(cell)
+                run_has_source = True
+        return sources
+
+    def _split(self, sources):
+        """
+        Flood from every source one cell at a time, floods that meet are joined. Once a single group of floods is
+        still growing, every finished group is a separate piece and is relabelled.
+        :param sources:     Traversable cells that were in one component
+        :return: None
+        """
+        owner = {source: position for position, source in enumerate(sources)}
+        group = list(range(len(sources)))  # union-find over floods
+        queues = [deque([source]) for source in sources]
+
+        def root(flood):
+            while group[flood] != flood:
+                group[flood] = group[group[flood]]
+                flood = group[flood]
+            return flood
+
+        while len({root(flood) for flood, queue in enumerate(queues) if queue}) > 1:
+            for flood, queue in enumerate(queues):
+                if not queue:
+                    continue
+                for neighbour in self._neighbours(queue.popleft()):
+                    other = owner.get(neighbour)
+                    if other is None:
+                        owner[neighbour] = flood
+                        queue.append(neighbour)
+                    elif root(other) != root(flood):
+                        group[root(other)] = root(flood)
+
+        growing = {root(flood) for flood, queue in enumerate(queues) if queue}
+        finished = {root(flood) for flood in range(len(sources))} - growing
+        if not growing:
+            # every flood finished, the first group keeps the old label
+            finished.discard(root(0))
+        if not finished:
+            return None
+        new_labels = {}
+        for flood in finished:
+            new_labels[flood] = len(self._parent)
+            self._parent.append(len(self._parent))
+        for cell, flood in owner.items():
+            label = new_labels.get(root(flood))
+            if label is not None:
+                self.labels[cell] = label
+        self.splits += len(finished)
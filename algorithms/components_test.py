@@ -0,0 +1,106 @@
+import random
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template, find_paths, solve_query
+from algorithms.components import ComponentIndex
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+
+# two rooms, the right one only reachable through the gap in the middle wall at (3, 3)
+BOARD = [[0, 0, 0, 1, 0, 0],
+         [0, 0, 0, 1, 0, 0],
+         [0, 0, 0, 1, 0, 0],
+         [0, 0, 0, 0, 0, 0]]
+
+
+def flood_components(board):
+    """
+    Components found by a search with Grid.neighbours, the 8-neighbour/corner rule of the algorithms
+    :return: dict index -> first index of its component
+    """
+    grid = board_template(board)
+    components = {}
+    for index in range(grid.len_x * grid.len_y):
+        if grid.traversable[index] and index not in components:
+            components[index] = index
+            stack = [index]
+            while stack:
+                for neighbour in grid.neighbours(stack.pop()):
+                    if neighbour not in components:
+                        components[neighbour] = index
+                        stack.append(neighbour)
+    return components
+
+
+class TestComponentIndex(unittest.TestCase):
+
+    def assertSameComponents(self, index, board):
+        expected = flood_components(board)
+        mapping = {}
+        for y, row in enumerate(board):
+            for x, value in enumerate(row):
+                component = index.component(x, y)
+                if value == 1:
+                    self.assertIsNone(component)
+                else:
+                    self.assertEqual(mapping.setdefault(expected[y * len(row) + x], component), component)
+        self.assertEqual(len(set(mapping.values())), len(mapping))
+
+    def test_connected(self):
+        index = ComponentIndex(BOARD)
+        self.assertTrue(index.connected((0, 0), (5, 0)))
+        self.assertFalse(index.connected((0, 0), (3, 0)))
+        index.add_obstacle(3, 3)
+        self.assertFalse(index.connected((0, 0), (5, 0)))
+        self.assertEqual(index.splits, 1)
+        index.remove_obstacle(3, 3)
+        self.assertTrue(index.connected((0, 0), (5, 0)))
+
+    def test_diagonal_rule(self):
+        # a diagonal between two obstacles is blocked, with one free side cell it is not needed
+        index = ComponentIndex([[0, 1],
+                                [1, 0]])
+        self.assertFalse(index.connected((0, 0), (1, 1)))
+        index.remove_obstacle(1, 0)
+        self.assertTrue(index.connected((0, 0), (1, 1)))
+
+    def test_random_edits(self):
+        rnd = random.Random(4)
+        for _ in range(60):
+            len_x, len_y, density = rnd.randint(1, 10), rnd.randint(1, 10), rnd.random()
+            board = [[1 if rnd.random() < density else 0 for _ in range(len_x)] for _ in range(len_y)]
+            index = ComponentIndex(board)
+            self.assertSameComponents(index, board)
+            for _ in range(20):
+                x, y = rnd.randrange(len_x), rnd.randrange(len_y)
+                if board[y][x]:
+                    board[y][x] = 0
+                    index.remove_obstacle(x, y)
+                else:
+                    board[y][x] = 1
+                    index.add_obstacle(x, y)
+                self.assertSameComponents(index, board)
+
+    def test_rejects_unreachable_queries(self):
+        board = [row[:] for row in BOARD]
+        board[3][3] = 1
+        index = ComponentIndex(board)
+        template = board_template(board)
+        for algorithm, node_type in [(AStar, AGridNode), (Dijkstra, DijkstraGridNode)]:
+            result = algorithm(start=(0, 0), end=(5, 0), board=template, node_type=node_type,
+                               components=index).solve()
+            self.assertEqual((result.path, result.nodes_expanded, result.cost), ([], 0, None))
+        self.assertEqual(solve_query(template, (0, 0), (5, 0), components=index), ([], None))
+        self.assertEqual(find_paths(template, [((0, 0), (5, 0)), ((0, 0), (2, 0))], components=index),
+                         [[], [(0, 0), (1, 0), (2, 0)]])
+
+        alg = AStar(start=(0, 0), end=(5, 0), board=template, node_type=AGridNode, components=index)
+        alg.algorithm_loop()
+        self.assertTrue(alg.alg_end)
+        # edits through the algorithm keep its index up to date
+        alg = Dijkstra(start=(0, 0), end=(5, 0), board=template, node_type=DijkstraGridNode, components=index)
+        alg.remove_obstacle(3, 3)
+        self.assertIsNotNone(alg.solve().cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
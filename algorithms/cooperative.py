@@ -0,0 +1,268 @@
+from array import array
+from heapq import heappush, heappop
+from math import inf
+
+from .costs import DEFAULT_COST_MODEL, COST_DIGITS
+from .grid import Grid
+
+
+class _GoalDistances(object):
+    """
+    Resumable reverse A* from one goal (RRA*), shared by every agent heading there and kept between plans.
+    It runs towards the first agent's start and is resumed whenever a cell that is not closed yet is asked for;
+    with a consistent heuristic closed cells hold exact distances, whatever cell the search was heading for.
+    """
+    __slots__ = ('planner', 'target_x', 'target_y', 'closed', 'costs', 'heap')
+
+    def __init__(self, planner, goal, target):
+        self.planner = planner
+        self.target_y, self.target_x = divmod(target, planner.grid.len_x)
+        self.closed = {}  # cell index -> exact distance to the goal
+        self.costs = {goal: 0}
+        self.heap = [(0, 0, goal)]
+
+    def distance(self, index):
+        """
+        :param int index:   Cell index
+        :return: cost of the cheapest path from the cell to the goal on the static board (inf if unreachable)
+        """
+        closed = self.closed
+        if index in closed:
+            return closed[index]
+        planner = self.planner
+        heap, costs, moves, weights = self.heap, self.costs, planner._moves, planner._weights
+        len_x, target_x, target_y = planner.grid.len_x, self.target_x, self.target_y
+        free_distance = planner.cost_model.free_distance
+        expanded = len(closed)
+        distance = inf
+        while heap:
+            _, _, cell = heappop(heap)
+            if cell in closed:
+                continue
+            distance = closed[cell] = costs[cell]
+            # reversed steps: moving from neighbour into cell costs the weight of cell
+            weight = weights[cell] if weights else 1
+            for neighbour, step in moves(cell):
+                if neighbour in closed:
+                    continue
+                candidate = distance + step * weight
+                if candidate < costs.get(neighbour, inf):
+                    costs[neighbour] = candidate
+                    y, x = divmod(neighbour, len_x)
+                    heuristic = free_distance(abs(x - target_x), abs(y - target_y))
+                    heappush(heap, (round(candidate + heuristic, COST_DIGITS), heuristic, neighbour))
+            if cell == index:
+                break
+        else:
+            distance = inf
+        planner.stats['reverse_expanded'] += len(closed) - expanded
+        return distance
+
+
+class CooperativePlanner(object):
+    def __init__(self, board, agents, window=16, replan=None, cost_model=None):
+        """
+        Windowed cooperative A* (WHCA*) for many agents on one board. Agents are planned one after another in
+        priority order by a space-time A* over (cell, time) that may also wait in place, and every plan is entered in
+        a reservation table so later agents avoid it. Plans cover `window` steps; the search is guided by the exact
+        distance to the goal, which a reverse search per goal computes on demand and keeps for every agent sharing
+        that goal. Every `replan` ticks all agents are planned again from where they stand, with the priority order
+        rotated so no agent always comes last.
+        Plans never put two agents on one cell at the same time or let two agents swap cells. An agent without a plan
+        (every way blocked by agents planned before it) stays in place and is counted in stats['blocked'], agents
+        planned before it may run into it.
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid
+        :param agents:  List of ((x, y) start, (x, y) goal)
+        :param int window:  Steps planned ahead
+        :param int replan:  Ticks between plans, half the window by default, at most the window
+        :param CostModel cost_model:    (optional) Step costs and terrain weights, waiting costs an orthogonal step
+                                        except at the goal
+        """
+        self.grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if replan is not None and replan < 1:
+            raise ValueError("replan must be at least 1")
+        self.window = window
+        self.replan = min(window, replan or max(1, window // 2))
+        self._weights = array('d', [weight for row in self.cost_model.weights for weight in row]) \
+            if self.cost_model.weights else None
+        self._size = self.grid.len_x * self.grid.len_y
+        self._neighbours = {}
+        self._goal_distances = {}
+        self.positions = []
+        self.goals = []
+        self.plans = []
+        self.reservations = {}  # time * cells + cell index -> agent, times count from the last plan
+        self.time = 0
+        self._step = None
+        self._rounds = 0
+        self.stats = {'plans': 0, 'searches': 0, 'expanded': 0, 'blocked': 0, 'reverse_expanded': 0}
+        for start, goal in agents:
+            self.add_agent(start, goal)
+
+    def _index(self, position):
+        x, y = position
+        if not (0 <= x < self.grid.len_x and 0 <= y < self.grid.len_y):
+            raise ValueError("({}, {}) is outside the board".format(x, y))
+        index = self.grid.index(x, y)
+        if not self.grid.traversable[index]:
+            raise ValueError("({}, {}) is an obstacle".format(x, y))
+        return index
+
+    def add_agent(self, start, goal):
+        """
+        Add an agent, all agents are planned again on the next tick
+        :param (int,int) start:   [(x-coordinate, y-coordinate)]
+        :param (int,int) goal:   [(x-coordinate, y-coordinate)]
+        :return: int agent id
+        """
+        start, goal = self._index(start), self._index(goal)
+        if start in self.positions:
+            raise ValueError("Another agent stands on {}".format(divmod(start, self.grid.len_x)[::-1]))
+        self.positions.append(start)
+        self.goals.append(goal)
+        self._step = None
+        return len(self.positions) - 1
+
+    def set_goal(self, agent, goal):
+        """
+        Send an agent somewhere else, all agents are planned again on the next tick
+        :return: None
+        """
+        self.goals[agent] = self._index(goal)
+        self._step = None
+
+    def _moves(self, index):
+        """
+        Neighbours of a cell with the cost of the step, without terrain weight
+        :return: list of (int, number)
+        """
+        moves = self._neighbours.get(index)
+        if moves is None:
+            len_x, orthogonal, diagonal = self.grid.len_x, self.cost_model.orthogonal, self.cost_model.diagonal
+            moves = self._neighbours[index] = [
+                (neighbour, diagonal if neighbour % len_x != index % len_x and neighbour // len_x != index // len_x
+                 else orthogonal) for neighbour in self.grid.neighbours(index)]
+        return moves
+
+    def distance(self, position, goal):
+        """
+        Cost of the cheapest path between two cells ignoring other agents, from the shared per-goal cache
+        :return: float (inf if unreachable)
+        """
+        start, goal = self._index(position), self._index(goal)
+        return self._distances_to(goal, start).distance(start)
+
+    def _distances_to(self, goal, start):
+        distances = self._goal_distances.get(goal)
+        if distances is None:
+            distances = self._goal_distances[goal] = _GoalDistances(self, goal, start)
+        return distances
+
+    def plan(self):
+        """
+        Plan every agent for the next window from its current position
+        :return: None
+        """
+        size, window = self._size, self.window
+        reservations = self.reservations
+        reservations.clear()
+        for agent, position in enumerate(self.positions):
+            reservations[position] = agent
+        count = len(self.positions)
+        offset = self._rounds % count if count else 0
+        self.plans = [None] * count
+        for agent in list(range(offset, count)) + list(range(offset)):
+            path = self._search(agent)
+            if path is None:
+                self.stats['blocked'] += 1
+                path = [self.positions[agent]] * (window + 1)
+            for time, index in enumerate(path):
+                reservations[time * size + index] = agent
+            self.plans[agent] = path
+        self._rounds += 1
+        self._step = 0
+        self.stats['plans'] += 1
+
+    def _search(self, agent):
+        """
+        Space-time A* for one agent against the reservation table
+        :return: list of window + 1 cell indices, None if every way is blocked
+        """
+        size, window, reservations = self._size, self.window, self.reservations
+        start, goal = self.positions[agent], self.goals[agent]
+        distances = self._distances_to(goal, start)
+        moves, weights, wait = self._moves, self._weights, self.cost_model.orthogonal
+        heuristic = distances.distance(start)
+        if heuristic == inf:
+            return None
+        self.stats['searches'] += 1
+        # keys are time * size + cell index, like the reservations
+        costs, parents, closed = {start: 0}, {start: None}, set()
+        heap = [(round(heuristic, COST_DIGITS), heuristic, start)]
+        while heap:
+            _, _, key = heappop(heap)
+            if key in closed:
+                continue
+            closed.add(key)
+            self.stats['expanded'] += 1
+            time, index = divmod(key, size)
+            if time == window or index == goal and not any(
+                    later * size + goal in reservations for later in range(time + 1, window + 1)):
+                path = []
+                while key is not None:
+                    path.append(key % size)
+                    key = parents[key]
+                path.reverse()
+                # arrived early, wait at the goal for the rest of the window
+                return path + [goal] * (window + 1 - len(path))
+
+            cost = costs[key]
+            following = (time + 1) * size
+            successors = [(neighbour, step * weights[neighbour]) for neighbour, step in moves(index)] if weights \
+                else moves(index)[:]
+            successors.append((index, 0 if index == goal else wait))
+            for neighbour, step in successors:
+                next_key = following + neighbour
+                if next_key in reservations or next_key in closed:
+                    continue
+                # two agents swapping cells would pass each other on the way
+                other = reservations.get(time * size + neighbour)
+                if other is not None and other != agent and reservations.get(following + index) == other:
+                    continue
+                candidate = cost + step
+                if candidate < costs.get(next_key, inf):
+                    heuristic = distances.distance(neighbour)
+                    if heuristic == inf:
+                        continue
+                    costs[next_key] = candidate
+                    parents[next_key] = key
+                    heappush(heap, (round(candidate + heuristic, COST_DIGITS), heuristic, next_key))
+        return None
+
+    def tick(self):
+        """
+        Move every agent one step along its plan, planning first when the last plan is `replan` ticks old
+        :return: list of (x, y) positions of the agents
+        """
+        if self._step is None or self._step >= self.replan:
+            self.plan()
+        self._step += 1
+        self.time += 1
+        self.positions = [plan[self._step] for plan in self.plans]
+        return self.agent_positions()
+
+    def agent_positions(self):
+        """
+        :return: list of (x, y) positions of the agents
+        """
+        len_x = self.grid.len_x
+        return [(index % len_x, index // len_x) for index in self.positions]
+
+    def arrived(self):
+        """
+        :return: number of agents standing on their goal
+        """
+        return sum(position == goal for position, goal in zip(self.positions, self.goals))
@@ -0,0 +1,95 @@
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template
+from algorithms.cooperative import CooperativePlanner
+from algorithms.costs import CostModel
+
+BOARD = [[0, 0, 0, 0, 0, 0],
+         [0, 1, 1, 1, 1, 0],
+         [0, 0, 0, 0, 0, 0],
+         [0, 1, 1, 0, 1, 1],
+         [0, 0, 0, 0, 0, 0]]
+
+
+def run(planner, ticks):
+    """
+    Tick the planner, checking no two agents share a cell or swap cells
+    :return: list of positions after every tick
+    """
+    history = [planner.agent_positions()]
+    for _ in range(ticks):
+        positions = planner.tick()
+        assert len(set(positions)) == len(positions), positions
+        before = history[-1]
+        for agent, (old, new) in enumerate(zip(before, positions)):
+            assert max(abs(old[0] - new[0]), abs(old[1] - new[1])) <= 1
+            for other in range(agent + 1, len(positions)):
+                assert not (before[other] == new and positions[other] == old), (agent, other)
+        history.append(positions)
+    return history
+
+
+class TestCooperativePlanner(unittest.TestCase):
+
+    def test_agents_pass_each_other(self):
+        agents = [((0, 0), (5, 4)), ((5, 4), (0, 0)), ((0, 4), (5, 0)), ((5, 0), (0, 4)), ((3, 2), (3, 4))]
+        planner = CooperativePlanner(BOARD, agents, window=8)
+        history = run(planner, 30)
+        self.assertEqual(history[-1], [goal for _, goal in agents])
+        self.assertEqual(planner.arrived(), len(agents))
+        self.assertEqual(planner.stats['plans'], 8)
+        self.assertEqual(planner.stats['blocked'], 0)
+
+    def test_windowed_replanning(self):
+        planner = CooperativePlanner(BOARD, [((0, 0), (5, 4))], window=4, replan=2)
+        run(planner, 10)
+        self.assertEqual(planner.stats['plans'], 5)
+        self.assertEqual(planner.agent_positions(), [(5, 4)])
+        planner.set_goal(0, (0, 4))
+        history = run(planner, 8)
+        self.assertEqual(history[-1], [(0, 4)])
+        planner.add_agent((0, 0), (5, 0))
+        self.assertEqual(run(planner, 6)[-1], [(0, 4), (5, 0)])
+
+    def test_shared_goal_distances(self):
+        cost_model = CostModel(weights=[[1, 1, 1, 1, 1, 3]] * 5)
+        planner = CooperativePlanner(BOARD, [((0, 0), (5, 2)), ((0, 4), (5, 2))], cost_model=cost_model)
+        # the reverse search is resumed for every cell it has not closed yet
+        for start in [(x, y) for y in range(5) for x in range(6) if not BOARD[y][x]]:
+            expected = AStar(start=start, end=(5, 2), board=board_template(BOARD), node_type=AGridNode,
+                             cost_model=cost_model).solve().cost
+            self.assertAlmostEqual(planner.distance(start, (5, 2)), expected)
+        self.assertEqual(len(planner._goal_distances), 1)
+        run(planner, 12)
+        self.assertEqual(planner.arrived(), 1)
+
+    def test_goal_distances_with_cheap_diagonals(self):
+        cost_model = CostModel(1, 0.8, 'chebyshev')
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 1, 1, 0, 1, 1, 0],
+                 [0, 0, 1, 0, 0, 1, 0],
+                 [1, 0, 0, 0, 1, 0, 0],
+                 [0, 0, 1, 0, 0, 0, 0]]
+        planner = CooperativePlanner(board, [((0, 0), (6, 4))], cost_model=cost_model)
+        for start in [(x, y) for y in range(5) for x in range(7) if not board[y][x]]:
+            expected = AStar(start=start, end=(6, 4), board=board_template(board), node_type=AGridNode,
+                             cost_model=cost_model).solve().cost
+            self.assertAlmostEqual(planner.distance(start, (6, 4)), expected)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            CooperativePlanner(BOARD, [((1, 1), (0, 0))])
+        with self.assertRaises(ValueError):
+            CooperativePlanner(BOARD, [((0, 0), (5, 4)), ((0, 0), (5, 0))])
+        with self.assertRaises(ValueError):
+            CooperativePlanner(BOARD, [((0, 0), (6, 0))])
+        for window, replan in [(0, None), (4, 0), (4, -1)]:
+            with self.assertRaises(ValueError):
+                CooperativePlanner(BOARD, [((0, 0), (5, 0))], window=window, replan=replan)
+        planner = CooperativePlanner([[0, 1, 0]], [((0, 0), (2, 0))])
+        self.assertEqual(run(planner, 3)[-1], [(0, 0)])
+        self.assertEqual(planner.stats['blocked'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+from functools import lru_cache
+from heapq import heappush, heappop
+from math import sqrt, inf
+
+SQRT_2 = sqrt(2)
+
+# priorities built from summed costs are rounded to this many digits, so float noise between equal-cost paths
+# (sums of orthogonal/diagonal steps in different orders) does not decide ties
+COST_DIGITS = 9
+
+
+def manhattan(x_distance, y_distance, orthogonal, diagonal):
+    return orthogonal * (x_distance + y_distance)
+
+
+def octile(x_distance, y_distance, orthogonal, diagonal):
+    diagonal = min(diagonal, 2 * orthogonal)
+    return orthogonal * max(x_distance, y_distance) + (diagonal - orthogonal) * min(x_distance, y_distance)
+
+
+def chebyshev(x_distance, y_distance, orthogonal, diagonal):
+    return min(orthogonal, diagonal) * max(x_distance, y_distance)
+
+
+def euclidean(x_distance, y_distance, orthogonal, diagonal):
+    return orthogonal * sqrt(x_distance * x_distance + y_distance * y_distance)
+
+
+HEURISTICS = {'manhattan': manhattan, 'octile': octile, 'chebyshev': chebyshev, 'euclidean': euclidean}
+
+# offsets checked by the admissibility test, heuristics are compared against exact free-board distances
+ADMISSIBILITY_RANGE = 32
+
+
+@lru_cache(maxsize=None)
+def free_board_distances(orthogonal, diagonal):
+    """
+    Exact cheapest costs from (0, 0) to every (x, y) with 0 <= x, y <= ADMISSIBILITY_RANGE on a free board, by
+    Dijkstra over the range and a margin around it. Unlike octile this also holds when a diagonal step is cheaper than
+    an orthogonal one, then zig-zagging diagonals beat straight runs.
+    :return: dict (x, y) -> cost
+    """
+    low, high = -2, ADMISSIBILITY_RANGE + 2
+    distances = {(0, 0): 0}
+    heap = [(0, 0, 0)]
+    while heap:
+        distance, x, y = heappop(heap)
+        if distance > distances[(x, y)]:
+            continue
+        for x_diff in (-1, 0, 1):
+            for y_diff in (-1, 0, 1):
+                cell = (x + x_diff, y + y_diff)
+                if not (x_diff or y_diff) or not (low <= cell[0] <= high and low <= cell[1] <= high):
+                    continue
+                candidate = distance + (diagonal if x_diff and y_diff else orthogonal)
+                if candidate < distances.get(cell, inf):
+                    distances[cell] = candidate
+                    heappush(heap, (candidate, cell[0], cell[1]))
+    return {(x, y): distances[(x, y)] for x in range(ADMISSIBILITY_RANGE + 1) for y in range(ADMISSIBILITY_RANGE + 1)}
+
+
+@lru_cache(maxsize=256)
+def _admissible(heuristic_function, orthogonal, diagonal):
+    """
+    Admissibility check of CostModel, memoized since every algorithm without a cost model of its own builds one
+    :return: bool
+    """
+    for (x_distance, y_distance), distance in free_board_distances(orthogonal, diagonal).items():
+        if heuristic_function(x_distance, y_distance, orthogonal, diagonal) > distance + 1e-9:
+            return False
+    return True
+
+
+class CostModel(object):
+    def __init__(self, orthogonal=1, diagonal=SQRT_2, heuristic='octile', weights=None, epsilon=1,
+                 allow_inadmissible=False):
+        """
+        Step costs and heuristic used by the algorithms.
+        :param orthogonal:  Cost of a horizontal/vertical step
+        :param diagonal:    Cost of a diagonal step
+        :param heuristic:   'manhattan', 'octile', 'chebyshev', 'euclidean' or function
+                            (x_distance, y_distance, orthogonal, diagonal) -> estimate
+        :param [[]] weights:    (optional) 2d terrain weights, a step into cell (x, y) costs weights[y][x] times more
+        :param epsilon:     Weighted A* factor (>= 1), the heuristic is multiplied by it
+        :param bool allow_inadmissible:    Accept a heuristic that may overestimate the real distance
+        """
+        if orthogonal <= 0 or diagonal <= 0:
+            raise ValueError("Step costs must be positive")
+        if epsilon < 1:
+            raise ValueError("epsilon must be >= 1")
+        self.orthogonal = orthogonal
+        self.diagonal = diagonal
+        self.heuristic_name = heuristic if isinstance(heuristic, str) else heuristic.__name__
+        self.heuristic_function = HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+        self.weights = weights
+        self.min_weight = min(min(row) for row in weights) if weights else 1
+        if self.min_weight <= 0:
+            raise ValueError("Terrain weights must be positive")
+        self.epsilon = epsilon
+        if not allow_inadmissible and not self.admissible():
+            raise ValueError("{} heuristic is not admissible for orthogonal={} diagonal={}".format(
+                self.heuristic_name, orthogonal, diagonal))
+
+    def admissible(self):
+        """
+        Check the heuristic never overestimates the cheapest free-board path
+        :return: bool
+        """
+        return _admissible(self.heuristic_function, self.orthogonal, self.diagonal)
+
+    def step_cost(self, current, destination):
+        """
+        Cost of moving between two adjacent nodes
+        :return: number
+        """
+        if current.x != destination.x and current.y != destination.y:
+            cost = self.diagonal
+        else:
+            cost = self.orthogonal
+        if self.weights:
+            cost *= self.weights[destination.y][destination.x]
+        return cost
+
+    def distance(self, current, destination):
+        """
+        Cheapest cost between two nodes on a free board (lower bound of any path between them)
+        :return: number
+        """
+        return self.free_distance(abs(destination.x - current.x), abs(destination.y - current.y))
+
+    def free_distance(self, x_distance, y_distance):
+        """
+        Cheapest cost of a free-board path over the given offsets, terrain weights at their lowest
+        :return: number
+        """
+        # with diagonals cheaper than orthogonal steps, zig-zagging diagonals beat straight runs
+        bound = octile if self.diagonal >= self.orthogonal else chebyshev
+        return self.min_weight * bound(x_distance, y_distance, self.orthogonal, self.diagonal)
+
+    def heuristic(self, current, destination):
+        """
+        Estimated cost between two nodes, epsilon included
+        :return: number
+        """
+        return self.epsilon * self.min_weight * self.heuristic_function(abs(destination.x - current.x),
+                                                                        abs(destination.y - current.y),
+                                                                        self.orthogonal, self.diagonal)
+
+    def __repr__(self):
+        return "CostModel({}, {}, {}, epsilon={})".format(self.orthogonal, self.diagonal, self.heuristic_name,
+                                                          self.epsilon)
+
+
+# shared by the algorithms built without a cost model, CostModel is not changed after construction
+DEFAULT_COST_MODEL = CostModel()
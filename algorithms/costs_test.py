@@ -0,0 +1,100 @@
+import random
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template
+from algorithms import costs
+from algorithms.costs import CostModel, SQRT_2
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.jump_point_search import JumpPointSearch
+from maze_generators.generators import random_obstacles
+
+
+def solve(algorithm, board, cost_model, node_type):
+    return algorithm(start=(0, 0), end=(len(board[0]) - 1, len(board) - 1), board=board_template(board),
+                     node_type=node_type, cost_model=cost_model).solve()
+
+
+class TestCostModel(unittest.TestCase):
+
+    def test_admissibility(self):
+        for heuristic in ['octile', 'chebyshev', 'euclidean']:
+            self.assertTrue(CostModel(heuristic=heuristic).admissible())
+        self.assertTrue(CostModel(1, 2, 'manhattan').admissible())
+        with self.assertRaises(ValueError):
+            CostModel(heuristic='manhattan')
+        with self.assertRaises(ValueError):
+            CostModel(1, 1.3, 'euclidean')
+        self.assertFalse(CostModel(heuristic=lambda x, y, o, d: 2 * max(x, y), allow_inadmissible=True).admissible())
+        # diagonals cheaper than orthogonal steps: zig-zags beat the octile distance
+        with self.assertRaises(ValueError):
+            CostModel(1, 0.5)
+        board = [[2, 0, 0, 0, 0, 3],
+                 [0, 0, 0, 0, 0, 0]]
+        cost_model = CostModel(1, 0.5, 'chebyshev')
+        alg = AStar(board=[row[:] for row in board], cost_model=cost_model)
+        cost = alg.solve().cost
+        self.assertEqual(cost, Dijkstra(board=[row[:] for row in board], cost_model=cost_model).solve().cost)
+        self.assertLessEqual(cost_model.distance(alg.start_node, alg.end_node), cost)
+
+    def test_shared_default(self):
+        self.assertIs(AStar(3, 3, start=(0, 0), end=(2, 2)).cost_model, costs.DEFAULT_COST_MODEL)
+        CostModel(heuristic='chebyshev')
+        hits = costs._admissible.cache_info().hits
+        CostModel(heuristic='chebyshev')
+        self.assertEqual(costs._admissible.cache_info().hits, hits + 1)
+
+    def test_step_cost(self):
+        board = AStar(3, 3, start=(0, 0), end=(2, 2)).BOARD
+        cost_model = CostModel(weights=[[1, 1, 1],
+                                        [1, 5, 1],
+                                        [1, 1, 0.5]])
+        self.assertEqual(cost_model.step_cost(board[0][0], board[0][1]), 1)
+        self.assertEqual(cost_model.step_cost(board[0][0], board[1][1]), 5 * SQRT_2)
+        self.assertEqual(cost_model.heuristic(board[0][0], board[2][2]), 0.5 * 2 * SQRT_2)
+
+    def test_heuristics_keep_optimal_cost(self):
+        for seed in range(10):
+            board = random_obstacles(20, 20, 0.3, seed)
+            board[0][0] = board[-1][-1] = 0
+            expected = solve(Dijkstra, board, None, DijkstraGridNode).cost
+            expanded = {}
+            for heuristic in ['octile', 'chebyshev', 'euclidean']:
+                result = solve(AStar, board, CostModel(heuristic=heuristic), AGridNode)
+                expanded[heuristic] = result.nodes_expanded
+                if expected is None:
+                    self.assertIsNone(result.cost)
+                else:
+                    self.assertAlmostEqual(result.cost, expected)
+            self.assertLessEqual(expanded['octile'], expanded['chebyshev'])
+
+    def test_weighted_a_star_bound(self):
+        for seed in range(10):
+            board = random_obstacles(30, 30, 0.25, seed)
+            board[0][0] = board[-1][-1] = 0
+            optimal = solve(AStar, board, None, AGridNode)
+            weighted = solve(AStar, board, CostModel(epsilon=2), AGridNode)
+            if optimal.cost is None:
+                continue
+            self.assertLessEqual(weighted.cost, 2 * optimal.cost)
+            self.assertLessEqual(weighted.nodes_expanded, optimal.nodes_expanded)
+
+    def test_terrain_weights(self):
+        rnd = random.Random(1)
+        board = random_obstacles(20, 20, 0.2, 1)
+        board[0][0] = board[-1][-1] = 0
+        cost_model = CostModel(weights=[[rnd.choice([1, 2, 4]) for _ in range(20)] for _ in range(20)])
+        expected = solve(Dijkstra, board, cost_model, DijkstraGridNode)
+        result = solve(AStar, board, cost_model, AGridNode)
+        self.assertAlmostEqual(result.cost, expected.cost)
+        path = [(node.x, node.y) for node in reversed(result.path)]
+        cost = sum((SQRT_2 if a[0] != b[0] and a[1] != b[1] else 1) * cost_model.weights[b[1]][b[0]]
+                   for a, b in zip(path, path[1:]))
+        self.assertAlmostEqual(cost, result.cost)
+
+    def test_jump_point_search_needs_uniform_costs(self):
+        with self.assertRaises(ValueError):
+            JumpPointSearch(cost_model=CostModel(weights=[[1] * 10 for _ in range(10)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
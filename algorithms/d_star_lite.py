@@ -0,0 +1,261 @@
+from itertools import count
+from math import inf
+
+from .base import BaseNode, BaseAlgorithm, SearchResult
+from .costs import COST_DIGITS
+from .grid import NEIGHBOUR_OFFSETS
+
+
+class DStarNode(BaseNode):
+    __slots__ = ('g', 'rhs', 'key')
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.g = inf
+        self.rhs = inf
+        self.key = None  # priority while queued, None otherwise
+
+    def __repr__(self):
+        return "DStarNode({},{})".format(self.x, self.y)
+
+    def __str__(self):
+        return "{:g}, {:g}".format(self.g, self.rhs)
+
+
+class DStarLite(BaseAlgorithm):
+    """
+    D* Lite: searches from the end node towards the start node and keeps its g/rhs values between searches,
+    so add_obstacle / remove_obstacle / move_start_node only repair the part of the search they affect.
+    """
+    _neighbour_methods = ('_adjacent',)
+
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=DStarNode,
+                 cost_model=None):
+        super().__init__(rows, cols, start, end, board, node_type, cost_model)
+        self.nodes_expanded = 0
+        self.paint = True
+        self.path = []
+        self._push_order = count()
+        self._reset_search()
+
+    def _reset_search(self):
+        """
+        Drop all search state and root a new search at the end node
+        :return: None
+        """
+        for row in self.BOARD:
+            for node in row:
+                node.g = node.rhs = inf
+                node.key = None
+        self.open_heap = []
+        self.km = 0
+        self.last_start = self.start_node
+        self.end_node.rhs = 0
+        self._queue(self.end_node)
+
+    def _heuristic(self, node):
+        return self._heuristic_cost(node, self.start_node)
+
+    def _calculate_key(self, node):
+        best = min(node.g, node.rhs)
+        return round(best + self._heuristic(node) + self.km, COST_DIGITS), round(best, COST_DIGITS)
+
+    def _queue(self, node):
+        node.key = self._calculate_key(node)
+        self._heappush(self.open_heap, (node.key, next(self._push_order), node))
+        self._paint(node, 5)
+
+    def _paint(self, node, state):
+        if self.paint and node.traversable and node != self.start_node and node != self.end_node:
+            self.board_array[node.y][node.x] = state
+
+    def _top_key(self):
+        """
+        Smallest valid key in the queue, stale heap entries are dropped
+        :return: (float, float)
+        """
+        while self.open_heap:
+            key, _, node = self.open_heap[0]
+            if node.key == key:
+                return key
+            self._heappop(self.open_heap)
+        return inf, inf
+
+    def _adjacent(self, node):
+        """
+        All in-board neighbours, traversable or not
+        :return: generator of nodes
+        """
+        for x_diff, y_diff in NEIGHBOUR_OFFSETS:
+            if 0 <= node.x + x_diff < self.len_x and 0 <= node.y + y_diff < self.len_y:
+                yield self.BOARD[node.y + y_diff][node.x + x_diff]
+
+    def _expansions(self):
+        return self.nodes_expanded
+
+    def _edge_cost(self, node, neighbour):
+        """
+        Cost of stepping between two adjacent nodes, inf when the step is not allowed
+        :return: float
+        """
+        if not node.traversable or not neighbour.traversable:
+            return inf
+        if node.x != neighbour.x and node.y != neighbour.y and \
+                not self.BOARD[neighbour.y][node.x].traversable and not self.BOARD[node.y][neighbour.x].traversable:
+            return inf
+        return self._step_cost(node, neighbour)
+
+    def _update_node(self, node):
+        """
+        Recompute rhs of node and (re)queue it if it became inconsistent
+        :return: None
+        """
+        if node != self.end_node:
+            node.rhs = min([self._edge_cost(node, neighbour) + neighbour.g for neighbour in self._adjacent(node)]
+                           or [inf])
+        node.key = None
+        if node.g != node.rhs:
+            self._queue(node)
+
+    def _search_done(self):
+        start = self.start_node
+        return self._top_key() >= self._calculate_key(start) and start.rhs == start.g
+
+    def _expand(self):
+        """
+        Process the node with the smallest key
+        :return: None
+        """
+        key, _, node = self._heappop(self.open_heap)
+        node.key = None
+        new_key = self._calculate_key(node)
+        if key < new_key:
+            self._queue(node)
+            return None
+
+        self.nodes_expanded += 1
+        self._paint(node, 6)
+        if node.g > node.rhs:
+            node.g = node.rhs
+            for neighbour in self._adjacent(node):
+                self._update_node(neighbour)
+        else:
+            node.g = inf
+            self._update_node(node)
+            for neighbour in self._adjacent(node):
+                self._update_node(neighbour)
+
+    def _finish(self, paint=True):
+        """
+        Link the nodes from start to end through their parent values and store the path
+        :return: None
+        """
+        self.alg_end = True
+        self.path_found = self.start_node.g < inf
+        self.start_node.parent = None
+        current = self.start_node
+        while self.path_found and current != self.end_node:
+            following = min(self._adjacent(current), key=lambda node: self._edge_cost(current, node) + node.g)
+            following.parent = current
+            current = following
+        self.path = self._backtrack_path(paint=paint)
+
+    def algorithm_loop(self):
+        """
+        Perform one D* Lite algorithm loop.
+        :return: None
+        """
+        if self.alg_end:
+            return None
+        if self._search_done():
+            self._finish()
+            return None
+        self._expand()
+
+    def solve(self):
+        """
+        Repair the search until the start node is consistent, without painting board_array
+        :return: SearchResult (nodes_expanded counts this call only)
+        """
+        expanded = self.nodes_expanded
+        self.paint = False
+        try:
+            while not self._search_done():
+                self._expand()
+        finally:
+            self.paint = True
+        self._finish(paint=False)
+        cost = self.start_node.g if self.path_found else None
+        return SearchResult(self.path, self.nodes_expanded - expanded, cost)
+
+    def _invalidate_path(self):
+        """
+        Mark the last path as outdated and clear it from board_array
+        :return: None
+        """
+        for node in self.path:
+            if self.board_array[node.y][node.x] == 4:
+                self._paint(node, 0)
+        self.path = []
+        self.alg_end = False
+        self.path_found = False
+
+    def _changed(self, x, y):
+        """
+        Repair g/rhs around a cell whose traversability changed
+        :return: None
+        """
+        self._invalidate_path()
+        node = self.BOARD[y][x]
+        self._update_node(node)
+        for neighbour in self._adjacent(node):
+            self._update_node(neighbour)
+
+    def add_obstacle(self, x, y):
+        """
+        Add obstacle in given (x,y) position
+        :return: None
+        """
+        super().add_obstacle(x, y)
+        self._changed(x, y)
+
+    def remove_obstacle(self, x, y):
+        """
+        Remove obstacle in given (x,y) position
+        :return: None
+        """
+        super().remove_obstacle(x, y)
+        self._changed(x, y)
+
+    def move_start_node(self, x, y):
+        """
+        Move start node to a given (x,y) position, keeps the search (key modifier km grows instead)
+        :return: None
+        """
+        self._invalidate_path()
+        self.board_array[self.start_node.y][self.start_node.x] = 0
+        self.board_array[y][x] = 2
+        self.start_node = self.BOARD[y][x]
+        self.km += self._heuristic_cost(self.last_start, self.start_node)
+        self.last_start = self.start_node
+
+    def move_end_node(self, x, y):
+        """
+        Move end node to a given (x,y) position, the search is rooted at the end node so it starts over
+        :return: None
+        """
+        self._invalidate_path()
+        self.board_array[self.end_node.y][self.end_node.x] = 0
+        self.board_array[y][x] = 3
+        self.end_node = self.BOARD[y][x]
+        self._reset_search()
+
+
+if __name__ == "__main__":
+    d = DStarLite(board=[[2, 0, 0],
+                         [0, 1, 1],
+                         [0, 1, 0],
+                         [0, 0, 3]])
+    print(d.solve())
+    d.add_obstacle(0, 2)
+    print(d.solve())
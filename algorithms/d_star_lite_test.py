@@ -0,0 +1,47 @@
+import unittest
+from algorithms.d_star_lite import DStarLite
+from algorithms.costs import SQRT_2
+
+
+class TestDStarLite(unittest.TestCase):
+
+    def test_path(self):
+        d = DStarLite(board=[[2, 0, 0, 0],
+                             [1, 1, 1, 0],
+                             [0, 0, 0, 3]])
+        while not d.alg_end:
+            d.algorithm_loop()
+        self.assertEqual(d.board_to_2d_list(), [[2, 4, 4, 0],
+                                                [1, 1, 1, 4],
+                                                [0, 0, 0, 3]])
+
+    def test_replan_after_obstacles(self):
+        d = DStarLite(board=[[2, 0, 0, 0],
+                             [0, 1, 1, 0],
+                             [0, 0, 0, 3]])
+        self.assertAlmostEqual(d.solve().cost, 3 + SQRT_2)
+        d.add_obstacle(1, 0)
+        d.add_obstacle(0, 1)
+        self.assertFalse(d.solve().path)
+        d.remove_obstacle(0, 1)
+        result = d.solve()
+        self.assertAlmostEqual(result.cost, 3 + SQRT_2)
+        self.assertEqual([(node.x, node.y) for node in result.path], [(3, 2), (2, 2), (1, 2), (0, 1), (0, 0)])
+
+    def test_repair_reuses_search(self):
+        d = DStarLite(30, 30, start=(0, 0), end=(29, 29))
+        first = d.solve()
+        d.add_obstacle(15, 20)
+        repair = d.solve()
+        self.assertEqual(repair.cost, first.cost)
+        self.assertLess(repair.nodes_expanded, first.nodes_expanded)
+
+    def test_move_start(self):
+        d = DStarLite(10, 10, start=(0, 0), end=(9, 9))
+        d.solve()
+        d.move_node(5, 0, d.start_node)
+        self.assertEqual(d.solve().path[-1], d.BOARD[0][5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
-from base import BaseNode, BaseAlgorithm
-from itertools import chain
+from heapq import heapify
 from sys import maxsize
 
+from .base import BaseNode, BaseAlgorithm, SearchResult
+from .grid import GridField, GridNode
+
 
 class DijkstraNode(BaseNode):
+    __slots__ = ('d',)
 
     def __init__(self, x, y):
         super().__init__(x, y)
@@ -16,27 +19,42 @@ class DijkstraNode(BaseNode):
         return "{}".format(self.d)
 
 
+class DijkstraGridNode(GridNode):
+    __slots__ = ()
+    d = GridField('d', float('inf'))
+
+    def __repr__(self):
+        return "DijkstraGridNode({},{})".format(self.x, self.y)
+
+    def __str__(self):
+        return "{:g}".format(self.d)
+
+
 class Dijkstra(BaseAlgorithm):
 
-    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=DijkstraNode):
-        super().__init__(rows, cols, start, end, board, node_type)
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=DijkstraNode,
+                 cost_model=None, components=None):
+        super().__init__(rows, cols, start, end, board, node_type, cost_model, components)
+        # open_heap holds (d, y, x, node) entries for discovered nodes only; stale ones are skipped on pop
+        self.open_heap = []
+        self.open_nodes = set()
+        self.closed_nodes = set()
         self.start_node.d = 0
-        self.open_nodes = list(chain.from_iterable([node for node in row if node.traversable] for row in self.BOARD))
+        self._push_open(self.start_node)
 
     def algorithm_loop(self):
         """
         Perform one Dijkstra algorithm loop.
         :return: None
         """
-        if not self.open_nodes:
+        if not self.open_nodes or self._unreachable():
+            self.path = self._backtrack_path()
             self.alg_end = True
             return None
 
-        current = min(self.open_nodes, key=lambda node: node.d)
+        current = self._pop_open()
         self.board_array[current.y][current.x] = 6
-
-        self.open_nodes.remove(current)
-        self.closed_nodes.append(current)
+        self.closed_nodes.add(current)
 
         if current == self.end_node:
             self.path_found = True
@@ -49,10 +67,75 @@ class Dijkstra(BaseAlgorithm):
             self._set_node_neighbours(current)
 
         for neighbour in current.neighbours:
-            if neighbour.d > current.d + self._calc_cost(current, neighbour):
-                neighbour.d = current.d + self._calc_cost(current, neighbour)
+            if neighbour in self.closed_nodes:
+                continue
+            d = current.d + self._step_cost(current, neighbour)
+            if neighbour.d > d:
+                neighbour.d = d
                 neighbour.parent = current
-                self.board_array[current.y][current.x] = 5
+                if neighbour not in self.open_nodes:
+                    self.board_array[neighbour.y][neighbour.x] = 5
+                self._push_open(neighbour)
+
+    def solve(self):
+        """
+        Run Dijkstra to the end in one loop, without painting board_array.
+        Continues a search started with algorithm_loop.
+        :return: SearchResult
+        """
+        if self._unreachable():
+            self.alg_end = True
+            self.path = []
+            return SearchResult(self.path, len(self.closed_nodes), None)
+        open_heap, open_nodes, closed_nodes = self.open_heap, self.open_nodes, self.closed_nodes
+        end_node, step_cost = self.end_node, self._step_cost
+        heappush, heappop = self._heappush, self._heappop
+
+        while open_nodes and not self.path_found:
+            d, _, _, current = heappop(open_heap)
+            if current not in open_nodes or d != current.d:
+                continue
+            open_nodes.remove(current)
+            closed_nodes.add(current)
+            if current == end_node:
+                self.path_found = True
+                break
+
+            if not current.neighbours:
+                self._set_node_neighbours(current)
+            for neighbour in current.neighbours:
+                if neighbour in closed_nodes:
+                    continue
+                neighbour_d = d + step_cost(current, neighbour)
+                if neighbour.d > neighbour_d:
+                    neighbour.d = neighbour_d
+                    neighbour.parent = current
+                    open_nodes.add(neighbour)
+                    heappush(open_heap, (neighbour.d, neighbour.y, neighbour.x, neighbour))
+
+        self.alg_end = True
+        self.path = self._backtrack_path(paint=False)
+        return SearchResult(self.path, len(closed_nodes), end_node.d if self.path_found else None)
+
+    def _push_open(self, node):
+        """
+        Add node to the frontier, or re-queue it with its lowered distance.
+        Ties on distance are broken in row-major order.
+        :return: None
+        """
+        self.open_nodes.add(node)
+        self._heappush(self.open_heap, (node.d, node.y, node.x, node))
+
+    def _pop_open(self):
+        """
+        Pop the frontier node with the lowest distance, skipping entries superseded by a cheaper re-queue.
+        :return: DijkstraNode
+        """
+        while True:
+            d, _, _, node = self._heappop(self.open_heap)
+            if node in self.open_nodes and d == node.d:
+                self.open_nodes.remove(node)
+                return node
 
     def move_start_node(self, x, y):
         """
@@ -61,9 +144,14 @@ class Dijkstra(BaseAlgorithm):
         """
         self.board_array[self.start_node.y][self.start_node.x] = 0
         self.board_array[y][x] = 2
+        self.open_nodes.discard(self.start_node)
+        self.open_heap = [entry for entry in self.open_heap if entry[-1] != self.start_node]
+        heapify(self.open_heap)
         self.start_node.d = maxsize
+
         self.start_node = self.BOARD[y][x]
         self.start_node.d = 0
+        self._push_open(self.start_node)
 
     def move_end_node(self, x, y):
         """
@@ -0,0 +1,59 @@
+import unittest
+from algorithms.dijkstra import Dijkstra
+from algorithms.costs import SQRT_2
+
+
+class TestDijkstra(unittest.TestCase):
+
+    def test_3x3_with_obstacles(self):
+        d = Dijkstra(board=[[2, 0, 0],
+                            [1, 1, 0],
+                            [0, 0, 3]])
+        while not d.alg_end:
+            d.algorithm_loop()
+        self.assertTrue(d.path_found)
+        self.assertEqual(d.board_to_2d_list(), [[2, 4, 0],
+                                                [1, 1, 4],
+                                                [0, 0, 3]])
+
+    def test_4x3_with_obstacles(self):
+        d = Dijkstra(board=[[2, 0, 0],
+                            [0, 1, 1],
+                            [0, 1, 0],
+                            [0, 0, 3]])
+        while not d.alg_end:
+            d.algorithm_loop()
+        self.assertEqual(d.board_to_2d_list(), [[2, 0, 0],
+                                                [4, 1, 1],
+                                                [4, 1, 0],
+                                                [0, 4, 3]])
+
+    def test_unreachable_end(self):
+        d = Dijkstra(board=[[2, 0, 1, 0],
+                            [0, 0, 1, 0],
+                            [1, 1, 1, 3]])
+        while not d.alg_end:
+            d.algorithm_loop()
+        self.assertFalse(d.path_found)
+
+    def test_frontier_holds_discovered_nodes_only(self):
+        d = Dijkstra(100, 100, start=(0, 0), end=(99, 99))
+        self.assertEqual(len(d.open_nodes), 1)
+        d.algorithm_loop()
+        self.assertEqual(len(d.open_nodes), 3)
+        self.assertEqual(len(d.closed_nodes), 1)
+
+    def test_solve(self):
+        board = [[2, 0, 0],
+                 [0, 1, 1],
+                 [0, 1, 0],
+                 [0, 0, 3]]
+        d = Dijkstra(board=[row[:] for row in board])
+        result = d.solve()
+        self.assertEqual([(node.x, node.y) for node in result.path], [(2, 3), (1, 3), (0, 2), (0, 1), (0, 0)])
+        self.assertAlmostEqual(result.cost, 3 + SQRT_2)
+        self.assertEqual(d.board_array, board)
+
+
+if __name__ == '__main__':
+    unittest.main()
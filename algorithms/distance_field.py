@@ -0,0 +1,140 @@
+import numpy as np
+
+from .costs import DEFAULT_COST_MODEL
+from .grid import NEIGHBOUR_OFFSETS
+
+
+class DistanceField(object):
+    def __init__(self, board, goal=None, cost_model=None):
+        """
+        Distance from every cell of the board to a single goal, computed with vectorized wavefront relaxation.
+        Uses the same 8-neighbour and corner rule as BaseAlgorithm._set_node_neighbours.
+        :param [[]] board:    2d Int Array [1-obstacle, 2-start node, 3-end node]
+        :param (int,int) goal:    (optional) Goal [(x-coordinate, y-coordinate)], end node of the board by default
+        :param CostModel cost_model:    (optional) Step costs and terrain weights, the heuristic is not used
+        """
+        cost_model = cost_model or DEFAULT_COST_MODEL
+        cells = np.asarray(board, dtype=np.uint8)
+        self.len_y, self.len_x = cells.shape
+        if goal is None:
+            ends = np.argwhere(cells == 3)
+            if not len(ends):
+                raise AttributeError("No end node specified!")
+            goal = (int(ends[0][1]), int(ends[0][0]))
+        self.goal = goal
+
+        # padding with an obstacle border removes all bounds checks, cell (x, y) is at (y + 1) * width + x + 1
+        self._width = self.len_x + 2
+        traversable = np.zeros((self.len_y + 2, self._width), dtype=bool)
+        traversable[1:-1, 1:-1] = cells != 1
+        self._traversable = traversable.ravel()
+        self._moves = [(x_diff, y_diff, y_diff * self._width + x_diff,
+                        cost_model.diagonal if x_diff and y_diff else cost_model.orthogonal)
+                       for x_diff, y_diff in NEIGHBOUR_OFFSETS]
+        # a step into a cell costs its terrain weight times more
+        weights = np.ones(traversable.shape)
+        if cost_model.weights:
+            weights[1:-1, 1:-1] = cost_model.weights
+        self._weights = weights.ravel()
+
+        goal_index = self._index(np.array([goal]))[0]
+        if not self._traversable[goal_index]:
+            raise ValueError("Goal {} is an obstacle".format(goal))
+        self._distances = np.full(self._traversable.shape, np.inf)
+        self._distances[goal_index] = 0
+        self._relax(np.array([goal_index]))
+
+        self.field = self._distances.reshape(self.len_y + 2, self._width)[1:-1, 1:-1]
+
+    def _index(self, positions):
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        if positions.size and (positions[:, 0].min() < 0 or positions[:, 0].max() >= self.len_x or
+                               positions[:, 1].min() < 0 or positions[:, 1].max() >= self.len_y):
+            raise IndexError("position out of board")
+        return (positions[:, 1] + 1) * self._width + positions[:, 0] + 1
+
+    def _allowed(self, cells, x_diff, y_diff, offset):
+        """
+        Mask of cells that can step by (x_diff, y_diff)
+        """
+        traversable = self._traversable
+        allowed = traversable[cells + offset]
+        if x_diff and y_diff:
+            allowed &= traversable[cells + y_diff * self._width] | traversable[cells + x_diff]
+        return allowed
+
+    def _relax(self, frontier):
+        """
+        Label-correcting wavefront: relax the neighbours of every improved cell until nothing improves
+        :return: None
+        """
+        distances = self._distances
+        while frontier.size:
+            improved = []
+            for x_diff, y_diff, offset, cost in self._moves:
+                cells = frontier[self._allowed(frontier, x_diff, y_diff, offset)]
+                neighbours = cells + offset
+                candidates = distances[cells] + cost * self._weights[cells]
+                better = candidates < distances[neighbours]
+                distances[neighbours[better]] = candidates[better]
+                improved.append(neighbours[better])
+            frontier = np.unique(np.concatenate(improved))
+
+    def distance(self, start):
+        """
+        Distance from (x, y) to the goal
+        :return: float (inf if unreachable)
+        """
+        return float(self.distances([start])[0])
+
+    def distances(self, starts):
+        """
+        Distances from many (x, y) positions to the goal
+        :param starts:  Sequence of (x, y) / array of shape (n, 2)
+        :return: numpy array
+        """
+        return self._distances[self._index(starts)]
+
+    def path(self, start):
+        """
+        Path from (x, y) to the goal, found by descending the field
+        :return: list of (x, y) (empty if unreachable)
+        """
+        return self.paths([start])[0]
+
+    def paths(self, starts):
+        """
+        Paths from many (x, y) positions to the goal, all walkers descend the field in lockstep
+        :param starts:  Sequence of (x, y) / array of shape (n, 2)
+        :return: list of lists of (x, y), empty when the start is unreachable
+        """
+        cells = self._index(starts)
+        distances = self._distances
+        width = self._width
+        routes = [[cell] if np.isfinite(distances[cell]) else [] for cell in cells.tolist()]
+        walking = np.flatnonzero(np.isfinite(distances[cells]) & (distances[cells] > 0))
+        cells = cells[walking]
+        while walking.size:
+            best_cells = cells.copy()
+            best_costs = np.full(cells.shape, np.inf)
+            for x_diff, y_diff, offset, cost in self._moves:
+                allowed = self._allowed(cells, x_diff, y_diff, offset)
+                total = np.where(allowed, distances[cells + offset] + cost * self._weights[cells + offset], np.inf)
+                better = total < best_costs
+                best_costs[better] = total[better]
+                best_cells[better] = cells[better] + offset
+            for walker, cell in zip(walking.tolist(), best_cells.tolist()):
+                routes[walker].append(cell)
+            moving = distances[best_cells] > 0
+            walking = walking[moving]
+            cells = best_cells[moving]
+        return [[(cell % width - 1, cell // width - 1) for cell in route] for route in routes]
+
+
+if __name__ == "__main__":
+    field = DistanceField([[2, 0, 0],
+                           [0, 1, 1],
+                           [0, 1, 0],
+                           [0, 0, 3]])
+    print(field.field)
+    print(field.path((0, 0)))
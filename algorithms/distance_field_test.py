@@ -0,0 +1,80 @@
+import random
+import unittest
+from algorithms.costs import CostModel, SQRT_2
+from algorithms.batch import board_template
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from maze_generators.generators import random_obstacles
+
+try:
+    import numpy
+    from algorithms.distance_field import DistanceField
+except ImportError:
+    numpy = None
+
+
+def random_board(len_x, len_y, density, seed):
+    board = [list(row) for row in random_obstacles(len_x, len_y, density, seed)]
+    board[0][0] = 2
+    board[len_y - 1][len_x - 1] = 3
+    return board
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestDistanceField(unittest.TestCase):
+
+    def test_field(self):
+        field = DistanceField([[2, 0, 0],
+                               [0, 1, 1],
+                               [0, 1, 0],
+                               [0, 0, 3]], cost_model=CostModel(1, 2, 'manhattan'))
+        self.assertEqual(field.field.tolist(), [[5, 6, 7],
+                                                [4, float('inf'), float('inf')],
+                                                [3, float('inf'), 1],
+                                                [2, 1, 0]])
+        self.assertEqual(field.path((0, 0)), [(0, 0), (0, 1), (0, 2), (1, 3), (2, 3)])
+
+    def test_matches_dijkstra(self):
+        for seed in range(30):
+            board = random_board(12, 9, 0.35, seed)
+            field = DistanceField(board)
+            d = Dijkstra(board=[row[:] for row in board])
+            while not d.alg_end:
+                d.algorithm_loop()
+            if d.path_found:
+                self.assertAlmostEqual(field.distance((0, 0)), d.end_node.d)
+                path = field.path((0, 0))
+                cost = sum(SQRT_2 if a[0] != b[0] and a[1] != b[1] else 1 for a, b in zip(path, path[1:]))
+                self.assertAlmostEqual(cost, d.end_node.d)
+            else:
+                self.assertEqual(field.distance((0, 0)), float('inf'))
+                self.assertEqual(field.path((0, 0)), [])
+
+    def test_terrain_weights(self):
+        rnd = random.Random(5)
+        board = random_board(15, 10, 0.2, 5)
+        cost_model = CostModel(weights=[[rnd.choice([1, 1, 3]) for _ in range(15)] for _ in range(10)])
+        field = DistanceField(board, goal=(0, 0), cost_model=cost_model)
+        for _ in range(5):
+            end = (rnd.randrange(15), rnd.randrange(10))
+            if board[end[1]][end[0]] == 1:
+                continue
+            result = Dijkstra(start=end, end=(0, 0), board=board_template(board), node_type=DijkstraGridNode,
+                              cost_model=cost_model).solve()
+            self.assertAlmostEqual(field.distance(end), result.cost if result.path else float('inf'))
+
+    def test_batched_paths(self):
+        board = random_board(30, 30, 0.25, 3)
+        field = DistanceField(board, cost_model=CostModel(2, 3))
+        starts = [(x, y) for y in range(30) for x in range(30)]
+        distances = field.distances(starts)
+        for start, distance, path in zip(starts, distances, field.paths(starts)):
+            if distance == float('inf'):
+                self.assertEqual(path, [])
+                continue
+            self.assertEqual((path[0], path[-1]), (start, (29, 29)))
+            cost = sum(3 if a[0] != b[0] and a[1] != b[1] else 2 for a, b in zip(path, path[1:]))
+            self.assertEqual(cost, distance)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,397 @@
+import mmap
+from array import array
+
+# (x_diff, y_diff) of the 8 neighbours, in the order neighbours are expanded
+NEIGHBOUR_OFFSETS = ((1, 1), (1, 0), (1, -1), (0, 1), (0, -1), (-1, 1), (-1, 0), (-1, -1))
+
+# bytes.translate tables mapping board_array codes to traversability / cleared visualisation state
+_TRAVERSABLE_TABLE = bytes(0 if code == 1 else 1 for code in range(256))
+_STATE_TABLE = bytes(0 if code in [4, 5, 6] else code for code in range(256))
+
+
+class GridField(object):
+    """
+    Per-cell value of a GridNode, stored in a flat typed array of the grid.
+    """
+
+    def __init__(self, typecode, default):
+        """
+        :param str typecode:    array typecode used for storage
+        :param default:     Initial value of every cell
+        """
+        self.typecode = typecode
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            return self
+        return node.grid.fields[self.name][node.index]
+
+    def __set__(self, node, value):
+        node.grid.fields[self.name][node.index] = value
+
+
+class GridNode(object):
+    """
+    Lightweight view of a single Grid cell. Views are created on demand and compare equal by position,
+    so algorithms written against BaseNode keep working. Subclasses add GridField costs.
+    """
+    __slots__ = ('grid', 'index', 'neighbours')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+        self.neighbours = None
+
+    @classmethod
+    def grid_fields(cls):
+        """
+        All GridField descriptors declared on the node type
+        :return: dict
+        """
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            fields.update({name: value for name, value in vars(klass).items() if isinstance(value, GridField)})
+        return fields
+
+    @property
+    def x(self):
+        return self.index % self.grid.len_x
+
+    @property
+    def y(self):
+        return self.index // self.grid.len_x
+
+    @property
+    def traversable(self):
+        return bool(self.grid.traversable[self.index])
+
+    @traversable.setter
+    def traversable(self, value):
+        self.grid.set_traversable(self.index, 1 if value else 0)
+
+    @property
+    def parent(self):
+        # stored as index + 1 so a zero-filled array means no parents
+        parent = self.grid.parent[self.index]
+        return self.grid.node(parent - 1) if parent else None
+
+    @parent.setter
+    def parent(self, node):
+        self.grid.parent[self.index] = node.index + 1 if node is not None else 0
+
+    def __eq__(self, other):
+        return isinstance(other, GridNode) and self.index == other.index and self.grid is other.grid
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self.index
+
+    def __repr__(self):
+        return "GridNode({},{})".format(self.x, self.y)
+
+
+class GridRow(object):
+    __slots__ = ('grid', 'offset')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.offset = y * grid.len_x
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.grid.len_x:
+            raise IndexError("grid row index out of range")
+        return self.grid.node(self.offset + x)
+
+    def __len__(self):
+        return self.grid.len_x
+
+    def __iter__(self):
+        return (self[x] for x in range(self.grid.len_x))
+
+
+class _StateRow(object):
+    """
+    board_array row of grids whose state is not a bytearray (MappedGrid, ScratchGrid), obstacles read as 1 without
+    being copied into the state
+    """
+    __slots__ = ('grid', 'offset')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.offset = y * grid.len_x
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [self[i] for i in range(*x.indices(self.grid.len_x))]
+        if not 0 <= x < self.grid.len_x:
+            raise IndexError("grid row index out of range")
+        index = self.offset + x
+        value = self.grid.state[index]
+        return value if value or self.grid.traversable[index] else 1
+
+    def __setitem__(self, x, value):
+        if not 0 <= x < self.grid.len_x:
+            raise IndexError("grid row index out of range")
+        self.grid.state[self.offset + x] = value
+
+    def __len__(self):
+        return self.grid.len_x
+
+    def __iter__(self):
+        return (self[x] for x in range(self.grid.len_x))
+
+
+class Grid(object):
+    def __init__(self, len_x, len_y, node_type=GridNode):
+        """
+        Board stored in flat typed arrays, cell (x, y) lives at index y * len_x + x.
+        Replaces the list of lists of node objects, BOARD[y][x] returns a node_type view.
+        A cell takes 6 bytes (traversable, state, parent) plus the GridFields of node_type: 14 for DijkstraGridNode,
+        26 for AGridNode and BidirectionalGridNode, against about 110 for an ANode object and its board slots.
+        :param int len_x:   Number of columns
+        :param int len_y:   Number of rows
+        :param type node_type:  GridNode subclass, its GridFields decide which cost arrays are allocated
+        """
+        size = len_x * len_y
+        self.len_x = len_x
+        self.len_y = len_y
+        self.node_type = node_type
+        self.traversable = bytearray(b'\x01') * size
+        self.state = bytearray(size)
+        self.parent, self.fields = self._search_arrays(node_type)
+        self._state_view = memoryview(self.state)
+        self._offsets = tuple((x_diff, y_diff, y_diff * len_x + x_diff) for x_diff, y_diff in NEIGHBOUR_OFFSETS)
+        self._scratch_grids = {}  # node_type -> [ScratchGrid] released by their last search
+
+    @classmethod
+    def from_board(cls, board, node_type=GridNode):
+        """
+        Build grid from 2d Int Array [1-obstacle, 2-start node, 3-end node], visualisation states are cleared
+        :param [[]] board:  List of rows (lists of ints or bytes-like rows)
+        :param type node_type:  GridNode subclass
+        :return: Grid
+        """
+        grid = cls(len(board[0]), len(board), node_type)
+        state = bytearray()
+        for row in board:
+            state.extend(row)
+        state = state.translate(_STATE_TABLE)
+        grid.state[:] = state
+        grid.traversable[:] = state.translate(_TRAVERSABLE_TABLE)
+        return grid
+
+    def copy(self, node_type=None):
+        """
+        New grid with the same obstacles and state, cost arrays start from their defaults
+        :param type node_type:  (optional) GridNode subclass of the copy
+        :return: Grid
+        """
+        grid = Grid(self.len_x, self.len_y, node_type or self.node_type)
+        grid.traversable[:] = self.traversable
+        grid.state[:] = self.state
+        return grid
+
+    def _search_arrays(self, node_type):
+        """
+        Parent links and the GridField cost arrays of node_type, for every cell
+        :return: (parent array, {field name: array})
+        """
+        size = self.len_x * self.len_y
+        return array('i', [0]) * size, {name: array(field.typecode, [field.default]) * size
+                                        for name, field in node_type.grid_fields().items()}
+
+    def scratch(self, node_type=None):
+        """
+        Grid for one search over this board, without copying it. Give it back with release() once the search is done.
+        :param type node_type:  (optional) GridNode subclass of the search
+        :return: ScratchGrid
+        """
+        node_type = node_type or self.node_type
+        grids = self._scratch_grids.setdefault(node_type, [])
+        try:
+            return grids.pop()
+        except IndexError:
+            return ScratchGrid(self, node_type)
+
+    def node(self, index):
+        return self.node_type(self, index)
+
+    def index(self, x, y):
+        return y * self.len_x + x
+
+    def set_traversable(self, index, value):
+        """
+        Make a cell traversable (1) or an obstacle (0). Edits go through here rather than into traversable directly,
+        so grids that can not copy their cells cheaply (MappedGrid) can carry them over to copies.
+        :return: None
+        """
+        self.traversable[index] = value
+
+    def find(self, code):
+        """
+        Index of the first cell with given board_array code
+        :return: int (-1 if not found)
+        """
+        return self.state.find(code)
+
+    def rows(self):
+        """
+        board_array compatible rows, writable views into the state array
+        :return: list of memoryview
+        """
+        return [self._state_view[y * self.len_x:(y + 1) * self.len_x] for y in range(self.len_y)]
+
+    def neighbours(self, index):
+        """
+        Yield indexes of traversable neighbours,
+        a diagonal is blocked only when both cells next to it are obstacles
+        :return: generator of int
+        """
+        len_x = self.len_x
+        y, x = divmod(index, len_x)
+        traversable = self.traversable
+        for x_diff, y_diff, offset in self._offsets:
+            if not (0 <= x + x_diff < len_x and 0 <= y + y_diff < self.len_y):
+                continue
+            neighbour = index + offset
+            if not traversable[neighbour]:
+                continue
+            if x_diff and y_diff and not traversable[index + offset - x_diff] and \
+                    not traversable[index + x_diff]:
+                continue
+            yield neighbour
+
+    def memory_size(self):
+        """
+        Bytes used by the per-cell arrays, 6 per cell plus the GridFields of the node type
+        :return: int
+        """
+        arrays = [self.traversable, self.state, self.parent] + list(self.fields.values())
+        return sum(len(values) * getattr(values, 'itemsize', 1) for values in arrays)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_state_view']
+        del state['_scratch_grids']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._state_view = memoryview(self.state)
+        self._scratch_grids = {}
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.len_y:
+            raise IndexError("grid index out of range")
+        return GridRow(self, y)
+
+    def __len__(self):
+        return self.len_y
+
+    def __iter__(self):
+        return (self[y] for y in range(self.len_y))
+
+
+class _ScratchState(object):
+    """
+    State of a ScratchGrid, the cells a search wrote over the state of its board.
+    Marks of the board are looked up once, boards shared by searches (board_template) carry none.
+    """
+    __slots__ = ('board', 'cells', 'board_marks')
+
+    def __init__(self, board):
+        self.board = board
+        self.cells = {}
+        self.board_marks = {}
+
+    def __getitem__(self, index):
+        value = self.cells.get(index)
+        return self.board[index] if value is None else value
+
+    def __setitem__(self, index, value):
+        self.cells[index] = value
+
+    def __len__(self):
+        return len(self.board)
+
+    def find(self, code):
+        indexes = [index for index, value in self.cells.items() if value == code]
+        if code not in self.board_marks:
+            self.board_marks[code] = self.board.find(code)
+        index = self.board_marks[code]
+        if index >= 0 and index not in self.cells:
+            indexes.append(index)
+        return min(indexes) if indexes else -1
+
+
+class ScratchGrid(Grid):
+    def __init__(self, board, node_type):
+        """
+        Search grid made by Grid.scratch(). Obstacles are read from the board, writes to the state are kept over it.
+        Parents and cost fields are allocated once, like the board allocates its own (lazily for a MappedGrid), and
+        on release() reset only in the cells the search viewed, so a search costs what it explores rather than the
+        size of the board.
+        :param Grid board:  Board of the searches
+        :param type node_type:  GridNode subclass
+        """
+        self.board = board
+        self.len_x = board.len_x
+        self.len_y = board.len_y
+        self.node_type = node_type
+        self.traversable = board.traversable
+        self.state = _ScratchState(board.state)
+        self.parent, self.fields = board._search_arrays(node_type)
+        self.defaults = [(self.fields[name], field.default) for name, field in node_type.grid_fields().items()]
+        self._offsets = board._offsets
+        self._scratch_grids = {}
+        self._rows = [_StateRow(self, y) for y in range(self.len_y)]
+        # 1 for cells viewed since the last release, an anonymous map so untouched pages are never allocated
+        self.seen = mmap.mmap(-1, max(self.len_x * self.len_y, 1))
+        self.viewed = array('i')
+
+    def node(self, index):
+        # every parent and cost write goes through a view, so the viewed cells are the ones to reset
+        if not self.seen[index]:
+            self.seen[index] = 1
+            self.viewed.append(index)
+        return self.node_type(self, index)
+
+    def release(self):
+        """
+        Reset the cells the search viewed and hand the grid back to its board for the next search
+        :return: None
+        """
+        parent, seen = self.parent, self.seen
+        for index in self.viewed:
+            seen[index] = 0
+            parent[index] = 0
+            for values, default in self.defaults:
+                values[index] = default
+        del self.viewed[:]
+        self.state.cells.clear()
+        self.board._scratch_grids[self.node_type].append(self)
+
+    def copy(self, node_type=None):
+        grid = self.board.copy(node_type or self.node_type)
+        for index, value in self.state.cells.items():
+            grid.state[index] = value
+        return grid
+
+    def set_traversable(self, index, value):
+        raise TypeError("ScratchGrid shares the obstacles of its board, edit the board instead")
+
+    def find(self, code):
+        return self.state.find(code)
+
+    def rows(self):
+        return list(self._rows)
+
+    def __reduce__(self):
+        raise TypeError("ScratchGrid can not be pickled, pickle its board")
@@ -0,0 +1,82 @@
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalGridNode
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.grid import Grid, GridNode
+
+
+class TestGrid(unittest.TestCase):
+
+    def test_from_board(self):
+        grid = Grid.from_board([[2, 0, 5],
+                                [1, 6, 3]])
+        self.assertEqual(list(grid.traversable), [1, 1, 1, 0, 1, 1])
+        self.assertEqual(list(grid.state), [2, 0, 0, 1, 0, 3])
+        self.assertEqual(grid[1][2], GridNode(grid, 5))
+        self.assertEqual((grid[1][2].x, grid[1][2].y), (2, 1))
+
+    def test_neighbours_corner_rule(self):
+        grid = Grid.from_board([[0, 1, 0],
+                                [1, 0, 0],
+                                [0, 0, 0]])
+        self.assertEqual(sorted(grid.neighbours(0)), [])
+        self.assertEqual(sorted(grid.neighbours(4)), [2, 5, 6, 7, 8])
+
+    def test_a_star_grid_path(self):
+        a = AStar(board=[[2, 0, 0],
+                         [1, 1, 0],
+                         [0, 0, 3]], node_type=AGridNode)
+        while not a.path_found:
+            a.algorithm_loop()
+        self.assertEqual(a.board_to_2d_list(), [[2, 4, 0],
+                                                [1, 1, 4],
+                                                [0, 0, 3]])
+
+    def test_dijkstra_grid_path(self):
+        d = Dijkstra(board=[[2, 0, 0, 0],
+                            [1, 1, 1, 0],
+                            [0, 0, 0, 3]], node_type=DijkstraGridNode)
+        while not d.alg_end:
+            d.algorithm_loop()
+        self.assertEqual(d.board_to_2d_list(), [[2, 4, 4, 0],
+                                                [1, 1, 1, 4],
+                                                [0, 0, 0, 3]])
+
+    def test_board_array_is_grid_state(self):
+        a = AStar(3, 3, start=(0, 0), end=(2, 2), node_type=AGridNode)
+        a.add_obstacle(1, 1)
+        self.assertFalse(a.BOARD[1][1].traversable)
+        self.assertEqual(a.grid.state[4], 1)
+
+    def test_scratch_grids_are_reused_and_reset(self):
+        board = board_template([[0, 0, 0, 0],
+                                [1, 1, 1, 0],
+                                [0, 0, 0, 0],
+                                [0, 1, 1, 1]])
+        for algorithm, node_type in [(AStar, AGridNode), (Dijkstra, DijkstraGridNode),
+                                     (BidirectionalAStar, BidirectionalGridNode)]:
+            scratch = board.scratch(node_type)
+            scratch.release()
+            for start, end in [((0, 0), (0, 3)), ((3, 0), (0, 2)), ((0, 0), (0, 3))]:
+                expected = algorithm(start=start, end=end, board=board, node_type=node_type).solve()
+                self.assertIs(board.scratch(node_type), scratch)
+                result = algorithm(start=start, end=end, board=scratch, node_type=node_type).solve()
+                self.assertEqual([(node.x, node.y) for node in result.path],
+                                 [(node.x, node.y) for node in expected.path])
+                self.assertEqual(result.cost, expected.cost)
+                # every cell is recorded once, however often the search viewed it
+                self.assertEqual(len(scratch.viewed), len(set(scratch.viewed)))
+                scratch.release()
+                self.assertEqual(bytes(scratch.seen[:16]), bytes(16))
+                self.assertEqual(list(scratch.parent), [0] * 16)
+                fresh = Grid(4, 4, node_type)
+                self.assertEqual({name: list(values) for name, values in scratch.fields.items()},
+                                 {name: list(values) for name, values in fresh.fields.items()})
+            self.assertEqual(bytes(board.state), bytes([0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1]))
+        with self.assertRaises(TypeError):
+            board.scratch().set_traversable(0, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
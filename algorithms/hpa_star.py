@@ -0,0 +1,356 @@
+from heapq import heappush, heappop
+from math import inf
+
+from .batch import board_template
+from .costs import DEFAULT_COST_MODEL
+from .grid import Grid, NEIGHBOUR_OFFSETS
+
+# entrances at least this wide get a transition at both ends instead of a single one in the middle
+WIDE_ENTRANCE = 6
+
+
+class _ClusterGraph(dict):
+    def __init__(self, hpa, bounds, reverse):
+        """
+        Lazy adjacency of one cluster: cell -> list of (neighbour, cost), diagonals follow the corner rule
+        """
+        super().__init__()
+        self.hpa = hpa
+        self.bounds = bounds
+        self.reverse = reverse
+
+    def __missing__(self, cell):
+        min_x, min_y, max_x, max_y = self.bounds
+        len_x = self.hpa.len_x
+        traversable = self.hpa.board.traversable
+        weights = self.hpa._weights
+        y, x = divmod(cell, len_x)
+        steps = []
+        for x_diff, y_diff, cost in self.hpa._moves:
+            if not (min_x <= x + x_diff < max_x and min_y <= y + y_diff < max_y):
+                continue
+            neighbour = cell + y_diff * len_x + x_diff
+            if not traversable[neighbour]:
+                continue
+            if x_diff and y_diff and not traversable[cell + x_diff] and not traversable[cell + y_diff * len_x]:
+                continue
+            steps.append((neighbour, cost * weights[cell if self.reverse else neighbour] if weights else cost))
+        self[cell] = steps
+        return steps
+
+
+class HPAStar(object):
+    def __init__(self, board, cluster_size=16, cost_model=None):
+        """
+        Hierarchical path-finding A*: the board is split into square clusters, the cells where neighbouring clusters
+        connect become entrance nodes of an abstract graph, and the entrance nodes of every cluster are linked with
+        their in-cluster distances. A query searches the abstract graph and then refines each abstract edge with
+        a search inside a single cluster. Paths only cross clusters at entrance nodes, so they are near-optimal.
+        add_obstacle / remove_obstacle only rebuild the clusters the edited cell borders.
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid from board_template
+        :param int cluster_size:    Width/height of a cluster
+        :param CostModel cost_model:    (optional) Step costs and terrain weights, the heuristic is not used
+        """
+        self.board = board.copy() if isinstance(board, Grid) else board_template(board)
+        self.cluster_size = cluster_size
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.len_x = self.board.len_x
+        self.len_y = self.board.len_y
+        self.clusters_x = -(-self.len_x // cluster_size)
+        self.clusters_y = -(-self.len_y // cluster_size)
+        self.nodes_expanded = 0
+        self.abstract_expanded = 0
+        self._weights = [weight for row in self.cost_model.weights for weight in row] \
+            if self.cost_model.weights else None
+        self._moves = [(x_diff, y_diff, self.cost_model.diagonal if x_diff and y_diff else self.cost_model.orthogonal)
+                       for x_diff, y_diff in NEIGHBOUR_OFFSETS]
+        self._borders = {}  # (cluster, right/lower cluster) -> list of (cell, cell) transitions
+        self._inter = {}  # entrance cell -> {entrance cell of the neighbouring cluster: step cost}
+        self._intra = {}  # cluster -> {entrance cell: {entrance cell of the same cluster: in-cluster distance}}
+
+        for cluster_y in range(self.clusters_y):
+            for cluster_x in range(self.clusters_x):
+                if cluster_x + 1 < self.clusters_x:
+                    self._build_border((cluster_x, cluster_y), (cluster_x + 1, cluster_y))
+                if cluster_y + 1 < self.clusters_y:
+                    self._build_border((cluster_x, cluster_y), (cluster_x, cluster_y + 1))
+        for cluster_y in range(self.clusters_y):
+            for cluster_x in range(self.clusters_x):
+                self._build_cluster((cluster_x, cluster_y))
+
+    def find_path(self, start, end):
+        """
+        Path from start to end
+        :param (int,int) start:   Start [(x-coordinate, y-coordinate)]
+        :param (int,int) end:   End [(x-coordinate, y-coordinate)]
+        :return: list of (x, y) from start to end, empty if end is unreachable
+        """
+        return self.solve(start, end)[0]
+
+    def solve(self, start, end):
+        """
+        Search the abstract graph from start to end and refine the route into board cells.
+        Afterwards nodes_expanded counts the cells and entrance nodes every search of the query expanded: linking
+        start and end to their clusters, the abstract search and the refinement. abstract_expanded counts the
+        entrance nodes of the abstract search alone.
+        :return: (list of (x, y) from start to end, empty if end is unreachable; path cost or None)
+        """
+        start_cell, end_cell = self.board.index(*start), self.board.index(*end)
+        self.nodes_expanded = self.abstract_expanded = 0
+        if not self.board.traversable[start_cell] or not self.board.traversable[end_cell]:
+            return [], None
+        if start_cell == end_cell:
+            return [tuple(start)], 0
+
+        start_cluster, end_cluster = self._cluster(start_cell), self._cluster(end_cell)
+        distances, _, expanded = self._cluster_search(start_cell, self._cluster_graph(start_cluster))
+        self.nodes_expanded += expanded
+        start_edges = {node: distances[node] for node in self._intra[start_cluster] if node in distances}
+        if start_cluster == end_cluster and end_cell in distances:
+            start_edges[end_cell] = distances[end_cell]
+        distances, _, expanded = self._cluster_search(end_cell, self._cluster_graph(end_cluster, reverse=True))
+        self.nodes_expanded += expanded
+        end_edges = {node: distances[node] for node in self._intra[end_cluster] if node in distances}
+
+        route, cost = self._abstract_search(start_cell, end_cell, start_edges, end_edges)
+        self.nodes_expanded += self.abstract_expanded
+        if route is None:
+            return [], None
+        path = [start_cell]
+        for cell, following in zip(route, route[1:]):
+            if self._cluster(cell) == self._cluster(following):
+                path.extend(self._refine(cell, following))
+            else:
+                path.append(following)
+        return [divmod(cell, self.len_x)[::-1] for cell in path], cost
+
+    def add_obstacle(self, x, y):
+        """
+        Add obstacle in given (x,y) position, rebuilds the clusters around it
+        :return: None
+        """
+        self._set_traversable(x, y, 0)
+
+    def remove_obstacle(self, x, y):
+        """
+        Remove obstacle in given (x,y) position, rebuilds the clusters around it
+        :return: None
+        """
+        self._set_traversable(x, y, 1)
+
+    def stats(self):
+        """
+        Size of the abstract graph
+        :return: dict
+        """
+        return {'clusters': self.clusters_x * self.clusters_y,
+                'entrances': sum(len(nodes) for nodes in self._intra.values()),
+                'intra_edges': sum(len(edges) for nodes in self._intra.values() for edges in nodes.values()),
+                'inter_edges': sum(len(edges) for edges in self._inter.values())}
+
+    def _cluster(self, cell):
+        y, x = divmod(cell, self.len_x)
+        return x // self.cluster_size, y // self.cluster_size
+
+    def _bounds(self, cluster):
+        """
+        :return: (min x, min y, max x + 1, max y + 1) of the cluster
+        """
+        min_x, min_y = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return min_x, min_y, min(min_x + self.cluster_size, self.len_x), min(min_y + self.cluster_size, self.len_y)
+
+    def _set_traversable(self, x, y, traversable):
+        index = self.board.index(x, y)
+        self.board.set_traversable(index, traversable)
+        self.board.state[index] = 0 if traversable else 1
+
+        cluster = (x // self.cluster_size, y // self.cluster_size)
+        min_x, min_y, max_x, max_y = self._bounds(cluster)
+        affected = [cluster]
+        for x_diff, y_diff, on_border in [(-1, 0, x == min_x), (1, 0, x == max_x - 1),
+                                          (0, -1, y == min_y), (0, 1, y == max_y - 1)]:
+            neighbour = (cluster[0] + x_diff, cluster[1] + y_diff)
+            if on_border and 0 <= neighbour[0] < self.clusters_x and 0 <= neighbour[1] < self.clusters_y:
+                self._build_border(*sorted([cluster, neighbour], key=lambda item: (item[1], item[0])))
+                affected.append(neighbour)
+        for affected_cluster in affected:
+            self._build_cluster(affected_cluster)
+
+    def _entered_cost(self, cost, cell):
+        return cost * self._weights[cell] if self._weights else cost
+
+    def _build_border(self, cluster, following):
+        """
+        Find the entrances between a cluster and its right/lower neighbour and link their transitions
+        :return: None
+        """
+        for cell, other in self._borders.get((cluster, following), []):
+            del self._inter[cell][other]
+            del self._inter[other][cell]
+            for key in [cell, other]:
+                if not self._inter[key]:
+                    del self._inter[key]
+
+        min_x, min_y, max_x, max_y = self._bounds(cluster)
+        if following[0] != cluster[0]:
+            pairs = [(self.board.index(max_x - 1, y), self.board.index(max_x, y)) for y in range(min_y, max_y)]
+        else:
+            pairs = [(self.board.index(x, max_y - 1), self.board.index(x, max_y)) for x in range(min_x, max_x)]
+
+        traversable = self.board.traversable
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair and traversable[pair[0]] and traversable[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions.extend([run[0], run[-1]])
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        orthogonal = self.cost_model.orthogonal
+        for cell, other in transitions:
+            self._inter.setdefault(cell, {})[other] = self._entered_cost(orthogonal, other)
+            self._inter.setdefault(other, {})[cell] = self._entered_cost(orthogonal, cell)
+        self._borders[(cluster, following)] = transitions
+
+    def _build_cluster(self, cluster):
+        """
+        Collect the entrance nodes of a cluster and link every pair with their in-cluster distance
+        :return: None
+        """
+        cluster_x, cluster_y = cluster
+        nodes = set()
+        for key, side in [(((cluster_x - 1, cluster_y), cluster), 1), ((cluster, (cluster_x + 1, cluster_y)), 0),
+                          (((cluster_x, cluster_y - 1), cluster), 1), ((cluster, (cluster_x, cluster_y + 1)), 0)]:
+            nodes.update(transition[side] for transition in self._borders.get(key, []))
+
+        edges = {}
+        graph = self._cluster_graph(cluster)
+        for node in nodes:
+            distances, _, _ = self._cluster_search(node, graph)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self._intra[cluster] = edges
+
+    def _cluster_graph(self, cluster, reverse=False):
+        """
+        Steps between the traversable cells of a cluster, computed for a cell the first time it is looked up
+        :param bool reverse:    Step costs into the cell instead of out of it (differs only with terrain weights)
+        :return: _ClusterGraph
+        """
+        return _ClusterGraph(self, self._bounds(cluster), reverse)
+
+    @staticmethod
+    def _cluster_search(source, graph, target=None, heuristic=None):
+        """
+        Dijkstra from source over a cluster graph, A* when a target and its heuristic are given
+        :param int source:  Cell index
+        :param target:  (optional) Cell index to stop at
+        :param heuristic:   (optional) Function cell -> lower bound of the distance to target
+        :return: (dict cell -> distance, dict cell -> parent cell, number of cells expanded)
+        """
+        distances = {source: 0}
+        parents = {source: None}
+        closed = set()
+        heap = [(0, source)]
+        while heap:
+            _, cell = heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if cell == target:
+                break
+            distance = distances[cell]
+            for neighbour, cost in graph[cell]:
+                if neighbour not in closed and distance + cost < distances.get(neighbour, inf):
+                    distances[neighbour] = distance + cost
+                    parents[neighbour] = cell
+                    heappush(heap, (distance + cost + heuristic(neighbour) if heuristic else distance + cost,
+                                    neighbour))
+        return distances, parents, len(closed)
+
+    def _distance_to(self, target):
+        """
+        Free-board distance to target (CostModel.free_distance), a lower bound of the path cost
+        :return: function cell -> distance
+        """
+        len_x = self.len_x
+        model = self.cost_model
+        target_y, target_x = divmod(target, len_x)
+        # both bounds are linear in the long and short side: orthogonal * long side + diagonal_extra * short side
+        orthogonal = model.free_distance(1, 0)
+        diagonal_extra = model.free_distance(1, 1) - orthogonal
+
+        def distance(cell):
+            y, x = divmod(cell, len_x)
+            x_distance, y_distance = abs(target_x - x), abs(target_y - y)
+            if x_distance > y_distance:
+                return orthogonal * x_distance + diagonal_extra * y_distance
+            return orthogonal * y_distance + diagonal_extra * x_distance
+
+        return distance
+
+    def _abstract_search(self, start_cell, end_cell, start_edges, end_edges):
+        """
+        A* over the entrance nodes, with start linked to the entrances of its cluster and those of the end cluster
+        linked to end
+        :return: (list of cells from start to end, cost) or (None, None)
+        """
+        heuristic = self._distance_to(end_cell)
+        costs = {start_cell: 0}
+        parents = {start_cell: None}
+        closed = set()
+        heap = [(heuristic(start_cell), start_cell)]
+        while heap:
+            _, cell = heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            self.abstract_expanded += 1
+            if cell == end_cell:
+                route = []
+                while cell is not None:
+                    route.append(cell)
+                    cell = parents[cell]
+                return route[::-1], costs[end_cell]
+
+            edges = [self._intra[self._cluster(cell)].get(cell, {}), self._inter.get(cell, {})]
+            if cell == start_cell:
+                edges.append(start_edges)
+            if cell in end_edges:
+                edges.append({end_cell: end_edges[cell]})
+            for cell_edges in edges:
+                for other, cost in cell_edges.items():
+                    if other in closed:
+                        continue
+                    cost += costs[cell]
+                    if cost < costs.get(other, inf):
+                        costs[other] = cost
+                        parents[other] = cell
+                        heappush(heap, (cost + heuristic(other), other))
+        return None, None
+
+    def _refine(self, cell, following):
+        """
+        Cells of the in-cluster path between two nodes of one cluster
+        :return: list of cells after cell, up to and including following
+        """
+        _, parents, expanded = self._cluster_search(cell, self._cluster_graph(self._cluster(cell)), following,
+                                                    self._distance_to(following))
+        self.nodes_expanded += expanded
+        path = []
+        while following != cell:
+            path.append(following)
+            following = parents[following]
+        return path[::-1]
+
+
+if __name__ == "__main__":
+    hpa = HPAStar([[0, 0, 0, 0, 0, 0],
+                   [0, 1, 1, 1, 1, 0],
+                   [0, 0, 0, 0, 1, 0],
+                   [1, 1, 1, 0, 1, 0],
+                   [0, 0, 0, 0, 0, 0]], cluster_size=3)
+    print(hpa.solve((0, 0), (0, 4)))
@@ -0,0 +1,85 @@
+import random
+import unittest
+from algorithms.batch import solve_query
+from algorithms.costs import CostModel
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.hpa_star import HPAStar
+from maze_generators.generators import random_obstacles
+
+
+class TestHPAStar(unittest.TestCase):
+
+    def test_path(self):
+        hpa = HPAStar([[0, 0, 0, 0, 0, 0],
+                       [0, 1, 1, 1, 1, 0],
+                       [0, 0, 0, 0, 1, 0],
+                       [1, 1, 1, 0, 1, 0],
+                       [0, 0, 0, 0, 0, 0]], cluster_size=3)
+        path, cost = hpa.solve((0, 0), (0, 4))
+        self.assertEqual((path[0], path[-1]), ((0, 0), (0, 4)))
+        self.assertEqual(len(path), 10)
+        # refinement expands at least the cells of the path, beyond the entrance nodes of the abstract search
+        self.assertGreater(hpa.abstract_expanded, 0)
+        self.assertGreaterEqual(hpa.nodes_expanded, hpa.abstract_expanded + len(path) - 1)
+        self.assertEqual(hpa.find_path((0, 0), (2, 3)), [])
+
+    def test_near_optimal(self):
+        for seed in range(10):
+            board = random_obstacles(30, 30, 0.25, seed)
+            hpa = HPAStar(board, cluster_size=6)
+            rnd = random.Random(seed)
+            for _ in range(10):
+                start, end = (rnd.randrange(30), rnd.randrange(30)), (rnd.randrange(30), rnd.randrange(30))
+                if board[start[1]][start[0]] or board[end[1]][end[0]]:
+                    continue
+                path, cost = hpa.solve(start, end)
+                _, optimal = solve_query(hpa.board, start, end, Dijkstra, DijkstraGridNode)
+                if optimal is None:
+                    self.assertEqual(path, [])
+                    continue
+                self.assertEqual((path[0], path[-1]), (start, end))
+                self.assertGreaterEqual(cost, optimal - 1e-9)
+                self.assertLessEqual(cost, 1.5 * optimal + 2)
+
+    def test_cheap_diagonals(self):
+        # the refined path has to be as cheap as the in-cluster distance the abstract search used
+        cost_model = CostModel(1, 0.8, 'chebyshev')
+        for seed in range(10):
+            board = random_obstacles(12, 12, 0.25, seed)
+            hpa = HPAStar(board, cluster_size=12, cost_model=cost_model)
+            rnd = random.Random(seed)
+            for _ in range(10):
+                start, end = (rnd.randrange(12), rnd.randrange(12)), (rnd.randrange(12), rnd.randrange(12))
+                if board[start[1]][start[0]] or board[end[1]][end[0]]:
+                    continue
+                path, cost = hpa.solve(start, end)
+                walked = sum(0.8 if x != next_x and y != next_y else 1
+                             for (x, y), (next_x, next_y) in zip(path, path[1:]))
+                self.assertAlmostEqual(walked, cost or 0)
+
+    def test_edits_rebuild_affected_clusters(self):
+        board = random_obstacles(24, 24, 0.2, 1)
+        hpa = HPAStar(board, cluster_size=6)
+        rnd = random.Random(1)
+        for _ in range(30):
+            x, y = rnd.randrange(24), rnd.randrange(24)
+            if hpa.board.traversable[hpa.board.index(x, y)]:
+                hpa.add_obstacle(x, y)
+            else:
+                hpa.remove_obstacle(x, y)
+        rebuilt = HPAStar(hpa.board, cluster_size=6)
+        self.assertEqual(hpa._borders, rebuilt._borders)
+        self.assertEqual(hpa._inter, rebuilt._inter)
+        self.assertEqual(hpa._intra, rebuilt._intra)
+
+    def test_wall_cuts_board(self):
+        hpa = HPAStar([[0] * 8 for _ in range(8)], cluster_size=4)
+        for y in range(8):
+            hpa.add_obstacle(4, y)
+        self.assertEqual(hpa.find_path((0, 0), (7, 7)), [])
+        hpa.remove_obstacle(4, 6)
+        self.assertEqual(hpa.find_path((0, 0), (7, 7))[-1], (7, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from heapq import heappush, heappop
+from types import GeneratorType
+
+# phases timed while instrumented, 'other' (cost evaluation, set bookkeeping) is what search time leaves over
+PHASES = ['search', 'neighbours', 'queue', 'backtrack']
+
+
+class Metrics(object):
+    def __init__(self):
+        """
+        Counters and phase timings of an instrumented algorithm, summed over its searches.
+        neighbour_generations counts calls of the algorithm's neighbour methods (_neighbour_methods): neighbour lists
+        built by _set_node_neighbours, jumps from one node for Jump Point Search, and every neighbourhood D* Lite
+        visits, including the ones it reads to update rhs values.
+        Timings include the small cost of timing each call, compare them with each other rather than with
+        uninstrumented runs.
+        """
+        self.searches = 0
+        self.nodes_expanded = 0
+        self.neighbour_generations = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.open_peak = 0  # largest open heap, stale entries included
+        self.timings = dict.fromkeys(PHASES, 0.0)
+
+    def as_dict(self):
+        """
+        :return: dict of counters and timings (seconds), with the 'other' search time
+        """
+        timings = dict(self.timings)
+        timings['other'] = max(0.0, timings['search'] - timings['neighbours'] - timings['queue'] - timings['backtrack'])
+        return {'searches': self.searches, 'nodes_expanded': self.nodes_expanded,
+                'neighbour_generations': self.neighbour_generations, 'heap_pushes': self.heap_pushes,
+                'heap_pops': self.heap_pops, 'open_peak': self.open_peak, 'timings': timings}
+
+    def __repr__(self):
+        return "Metrics({})".format(self.as_dict())
+
+
+def attach(alg, callback=None):
+    """
+    Instrument one algorithm instance by shadowing its hook methods with counting, timed wrappers.
+    Other instances and the class keep the plain methods, so nothing is paid while instrumentation is off.
+    :param BaseAlgorithm alg:   Algorithm to instrument
+    :param callback:    (optional) Called with the Metrics after every solve() and when algorithm_loop ends a search
+    :return: Metrics
+    """
+    detach(alg)
+    metrics = Metrics()
+    timings = metrics.timings
+    clock = time.perf_counter
+    backtrack_path, solve, algorithm_loop = alg._backtrack_path, alg.solve, alg.algorithm_loop
+
+    def neighbour_method(method):
+        def generate_neighbours(node):
+            start = clock()
+            neighbours = method(node)
+            if isinstance(neighbours, GeneratorType):
+                neighbours = list(neighbours)
+            timings['neighbours'] += clock() - start
+            metrics.neighbour_generations += 1
+            return neighbours
+        return generate_neighbours
+
+    def _heappush(heap, item):
+        start = clock()
+        heappush(heap, item)
+        timings['queue'] += clock() - start
+        metrics.heap_pushes += 1
+        if len(heap) > metrics.open_peak:
+            metrics.open_peak = len(heap)
+
+    def _heappop(heap):
+        start = clock()
+        item = heappop(heap)
+        timings['queue'] += clock() - start
+        metrics.heap_pops += 1
+        return item
+
+    def _backtrack_path(*args, **kwargs):
+        start = clock()
+        path = backtrack_path(*args, **kwargs)
+        timings['backtrack'] += clock() - start
+        return path
+
+    def instrumented_solve():
+        start = clock()
+        result = solve()
+        timings['search'] += clock() - start
+        metrics.searches += 1
+        metrics.nodes_expanded += result.nodes_expanded
+        if callback:
+            callback(metrics)
+        return result
+
+    def instrumented_algorithm_loop():
+        if alg.alg_end:
+            return algorithm_loop()
+        expansions, start = alg._expansions(), clock()
+        algorithm_loop()
+        timings['search'] += clock() - start
+        metrics.nodes_expanded += alg._expansions() - expansions
+        if alg.alg_end:
+            metrics.searches += 1
+            if callback:
+                callback(metrics)
+
+    alg.__dict__.update({name: neighbour_method(getattr(alg, name)) for name in alg._neighbour_methods})
+    alg.__dict__.update(_heappush=_heappush, _heappop=_heappop, _backtrack_path=_backtrack_path,
+                        solve=instrumented_solve, algorithm_loop=instrumented_algorithm_loop, metrics=metrics)
+    return metrics
+
+
+def detach(alg):
+    """
+    Remove the instrumentation wrappers of attach
+    :return: Metrics or None if alg was not instrumented
+    """
+    for name in alg._neighbour_methods + ('_heappush', '_heappop', '_backtrack_path', 'solve', 'algorithm_loop'):
+        alg.__dict__.pop(name, None)
+    return alg.__dict__.pop('metrics', None)
+
+
+def profile_query(algorithm, stream=None, sort='cumulative', limit=25, **kwargs):
+    """
+    Build and solve one query under cProfile
+    :param type algorithm:  BaseAlgorithm subclass
+    :param stream:  (optional) File the top functions are printed to
+    :param str sort:    pstats sort key
+    :param int limit:   Number of functions printed
+    :param kwargs:  Arguments of the algorithm (board, start, end, node_type, ...)
+    :return: (SearchResult, pstats.Stats)
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = algorithm(**kwargs).solve()
+    finally:
+        profiler.disable()
+    stats = pstats.Stats(profiler, stream=stream or sys.stdout)
+    if stream is not None:
+        stats.sort_stats(sort).print_stats(limit)
+    return result, stats
+
+
+def sample_query(algorithm, interval=0.001, **kwargs):
+    """
+    Build and solve one query while a thread samples the innermost frame every interval.
+    Unlike cProfile the search runs at almost full speed, so relative times stay realistic.
+    :param type algorithm:  BaseAlgorithm subclass
+    :param float interval:  Seconds between samples
+    :param kwargs:  Arguments of the algorithm (board, start, end, node_type, ...)
+    :return: (SearchResult, Counter of "function (file:line)" -> samples)
+    """
+    samples = Counter()
+    thread_id = threading.get_ident()
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                code = frame.f_code
+                samples["{} ({}:{})".format(code.co_name, code.co_filename.rsplit('/', 1)[-1], frame.f_lineno)] += 1
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        result = algorithm(**kwargs).solve()
+    finally:
+        done.set()
+        thread.join()
+    return result, samples
@@ -0,0 +1,74 @@
+import io
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.bidirectional import BidirectionalAStar
+from algorithms.d_star_lite import DStarLite
+from algorithms.dijkstra import Dijkstra
+from algorithms.jump_point_search import JumpPointSearch
+from algorithms.instrumentation import profile_query, sample_query
+
+BOARD = [[2, 0, 0, 0],
+         [1, 1, 1, 0],
+         [0, 0, 0, 0],
+         [3, 1, 1, 1]]
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_metrics(self):
+        for algorithm in [AStar, Dijkstra, DStarLite]:
+            reports = []
+            alg = algorithm(board=[row[:] for row in BOARD])
+            metrics = alg.instrument(reports.append)
+            result = alg.solve()
+            self.assertEqual(reports, [metrics])
+            self.assertEqual(metrics.searches, 1)
+            self.assertEqual(metrics.nodes_expanded, result.nodes_expanded)
+            self.assertGreater(metrics.heap_pushes, 0)
+            self.assertGreater(metrics.heap_pops, 0)
+            self.assertGreater(metrics.open_peak, 0)
+            self.assertGreater(metrics.timings['search'], 0)
+            self.assertGreaterEqual(metrics.as_dict()['timings']['other'], 0)
+
+    def test_algorithm_loop(self):
+        alg = AStar(board=[row[:] for row in BOARD], node_type=AGridNode)
+        metrics = alg.instrument()
+        while not alg.alg_end:
+            alg.algorithm_loop()
+        expected = AStar(board=[row[:] for row in BOARD], node_type=AGridNode).solve().nodes_expanded
+        self.assertEqual(metrics.searches, 1)
+        self.assertEqual(metrics.neighbour_generations, expected - 1)
+
+    def test_steps_match_solve(self):
+        for algorithm in [AStar, Dijkstra, DStarLite, BidirectionalAStar, JumpPointSearch]:
+            stepped = algorithm(board=[row[:] for row in BOARD])
+            metrics = stepped.instrument()
+            while not stepped.alg_end:
+                stepped.algorithm_loop()
+            solved_alg = algorithm(board=[row[:] for row in BOARD])
+            solved = solved_alg.instrument()
+            solved_alg.solve()
+            self.assertEqual(metrics.nodes_expanded, solved.nodes_expanded, algorithm.__name__)
+            self.assertGreater(metrics.neighbour_generations, 0, algorithm.__name__)
+            self.assertGreater(solved.neighbour_generations, 0, algorithm.__name__)
+
+    def test_off_by_default(self):
+        alg = AStar(board=[row[:] for row in BOARD])
+        self.assertIsNone(alg.stop_instrumenting())
+        metrics = alg.instrument()
+        self.assertIs(alg.stop_instrumenting(), metrics)
+        self.assertEqual(set(vars(alg)) & {'solve', 'algorithm_loop', '_heappush', '_heappop', 'metrics'}, set())
+        alg.solve()
+        self.assertEqual(metrics.searches, 0)
+
+    def test_profilers(self):
+        stream = io.StringIO()
+        result, stats = profile_query(AStar, stream=stream, board=[row[:] for row in BOARD])
+        self.assertEqual(len(result.path), 7)
+        self.assertIn('solve', stream.getvalue())
+        result, samples = sample_query(Dijkstra, board=[row[:] for row in BOARD])
+        self.assertEqual(len(result.path), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
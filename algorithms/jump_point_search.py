@@ -0,0 +1,145 @@
+from .a_star import AStar, ANode
+
+
+def _direction(a, b):
+    return (b > a) - (b < a)
+
+
+class JumpPointSearch(AStar):
+    """
+    Jump Point Search: A* on a uniform-cost 8-connected board that only opens jump points.
+    Straight and diagonal runs without forced neighbours are skipped over, diagonal moves follow
+    the corner rule of BaseAlgorithm._set_node_neighbours (blocked only when both side cells are obstacles).
+    """
+    _neighbour_methods = ('_successors',)
+
+    def __init__(self, rows=10, cols=10, start=(0, 0), end=(9, 9), board=False, node_type=ANode,
+                 cost_model=None, components=None):
+        if cost_model and (cost_model.weights or not
+                           cost_model.orthogonal <= cost_model.diagonal <= 2 * cost_model.orthogonal):
+            raise ValueError("Jump Point Search needs uniform step costs without terrain weights "
+                             "and a diagonal step no cheaper than one and no dearer than two orthogonal ones")
+        super().__init__(rows, cols, start, end, board, node_type, cost_model, components)
+
+    def _step_cost(self, current, destination):
+        """
+        Cost of the straight or diagonal run between two jump points
+        :return: number
+        """
+        x_distance, y_distance = abs(destination.x - current.x), abs(destination.y - current.y)
+        if x_distance and y_distance:
+            return self.cost_model.diagonal * x_distance
+        return self.cost_model.orthogonal * (x_distance + y_distance)
+
+    def _walkable(self, x, y):
+        return 0 <= x < self.len_x and 0 <= y < self.len_y and self.BOARD[y][x].traversable
+
+    def _successors(self, node):
+        """
+        Jump points reachable from an expanded node, in the direction of the pruned neighbours
+        :return: list of nodes
+        """
+        jump_points = []
+        for x_diff, y_diff in self._pruned_directions(node):
+            jump_point = self._jump(node.x, node.y, x_diff, y_diff)
+            if jump_point:
+                jump_points.append(self.BOARD[jump_point[1]][jump_point[0]])
+        return jump_points
+
+    def _pruned_directions(self, node):
+        """
+        Directions of the natural and forced neighbours of node, given the direction it was reached from
+        :return: list of (x_diff, y_diff)
+        """
+        if node.parent is None:
+            return [(neighbour.x - node.x, neighbour.y - node.y) for neighbour in self._iter_node_neighbours(node)]
+
+        walkable = self._walkable
+        x, y = node.x, node.y
+        x_diff, y_diff = _direction(node.parent.x, x), _direction(node.parent.y, y)
+        directions = []
+        if x_diff and y_diff:
+            if walkable(x, y + y_diff):
+                directions.append((0, y_diff))
+            if walkable(x + x_diff, y):
+                directions.append((x_diff, 0))
+            if walkable(x, y + y_diff) or walkable(x + x_diff, y):
+                directions.append((x_diff, y_diff))
+            if not walkable(x - x_diff, y) and walkable(x, y + y_diff):
+                directions.append((-x_diff, y_diff))
+            if not walkable(x, y - y_diff) and walkable(x + x_diff, y):
+                directions.append((x_diff, -y_diff))
+        elif x_diff:
+            if walkable(x + x_diff, y):
+                directions.append((x_diff, 0))
+                if not walkable(x, y + 1):
+                    directions.append((x_diff, 1))
+                if not walkable(x, y - 1):
+                    directions.append((x_diff, -1))
+        else:
+            if walkable(x, y + y_diff):
+                directions.append((0, y_diff))
+                if not walkable(x + 1, y):
+                    directions.append((1, y_diff))
+                if not walkable(x - 1, y):
+                    directions.append((-1, y_diff))
+        return directions
+
+    def _jump(self, x, y, x_diff, y_diff):
+        """
+        Step from (x, y) in the given direction until a jump point (end node or cell with a forced neighbour)
+        :return: (x, y) of the jump point or None
+        """
+        walkable = self._walkable
+        end_x, end_y = self.end_node.x, self.end_node.y
+        while True:
+            if x_diff and y_diff and not walkable(x + x_diff, y) and not walkable(x, y + y_diff):
+                return None
+            x, y = x + x_diff, y + y_diff
+            if not walkable(x, y):
+                return None
+            if x == end_x and y == end_y:
+                return x, y
+
+            if x_diff and y_diff:
+                if (walkable(x - x_diff, y + y_diff) and not walkable(x - x_diff, y)) or \
+                        (walkable(x + x_diff, y - y_diff) and not walkable(x, y - y_diff)):
+                    return x, y
+                if self._jump(x, y, x_diff, 0) or self._jump(x, y, 0, y_diff):
+                    return x, y
+            elif x_diff:
+                if (walkable(x + x_diff, y + 1) and not walkable(x, y + 1)) or \
+                        (walkable(x + x_diff, y - 1) and not walkable(x, y - 1)):
+                    return x, y
+            else:
+                if (walkable(x + 1, y + y_diff) and not walkable(x + 1, y)) or \
+                        (walkable(x - 1, y + y_diff) and not walkable(x - 1, y)):
+                    return x, y
+
+    def _backtrack_path(self, current=None, paint=True):
+        """
+        Backtrack node (based on their parent value), cells skipped by jumps are linked in first
+        :param current: (optional) backtrack from specific node
+        :param bool paint: Mark the path on board_array
+        :return: list
+        """
+        if self.path_found:
+            node = current or self.end_node
+            while node.parent:
+                parent = node.parent
+                x_diff, y_diff = _direction(node.x, parent.x), _direction(node.y, parent.y)
+                while abs(node.x - parent.x) > 1 or abs(node.y - parent.y) > 1:
+                    between = self.BOARD[node.y + y_diff][node.x + x_diff]
+                    node.parent = between
+                    node = between
+                node.parent = parent
+                node = parent
+        return super()._backtrack_path(current, paint)
+
+
+if __name__ == "__main__":
+    j = JumpPointSearch(board=[[2, 0, 0, 0, 0],
+                               [0, 0, 0, 1, 0],
+                               [0, 0, 0, 1, 0],
+                               [0, 0, 0, 1, 3]])
+    print(j.solve())
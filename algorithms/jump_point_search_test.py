@@ -0,0 +1,63 @@
+import random
+import unittest
+from algorithms.a_star import AStar
+from algorithms.costs import CostModel
+from algorithms.jump_point_search import JumpPointSearch
+
+
+class TestJumpPointSearch(unittest.TestCase):
+
+    def test_path_links_every_cell(self):
+        j = JumpPointSearch(board=[[2, 0, 0, 0, 0],
+                                   [0, 0, 0, 1, 0],
+                                   [0, 0, 0, 1, 0],
+                                   [0, 0, 0, 1, 3]])
+        while not j.alg_end:
+            j.algorithm_loop()
+        self.assertEqual([(node.x, node.y) for node in j.path],
+                         [(4, 3), (4, 2), (4, 1), (3, 0), (2, 0), (1, 0), (0, 0)])
+        self.assertEqual(j.board_to_2d_list(), [[2, 4, 4, 4, 0],
+                                                [0, 0, 0, 1, 4],
+                                                [0, 0, 0, 1, 4],
+                                                [0, 0, 0, 1, 3]])
+
+    def test_same_cost_as_a_star(self):
+        board = [[2, 0, 0, 1, 0, 0],
+                 [0, 1, 0, 1, 0, 0],
+                 [0, 1, 0, 0, 0, 1],
+                 [0, 1, 1, 1, 0, 0],
+                 [0, 0, 0, 1, 0, 3]]
+        expected = AStar(board=[row[:] for row in board]).solve()
+        result = JumpPointSearch(board=[row[:] for row in board]).solve()
+        self.assertAlmostEqual(result.cost, expected.cost)
+        self.assertLessEqual(result.nodes_expanded, expected.nodes_expanded)
+
+    def test_same_cost_as_a_star_with_cost_model(self):
+        for seed in range(10):
+            rnd = random.Random(seed)
+            board = [[int(rnd.random() < 0.2) for _ in range(30)] for _ in range(30)]
+            board[0][0], board[-1][-1] = 2, 3
+            for cost_model in [CostModel(2, 3), CostModel(1, 1.2), CostModel(1, 2, 'manhattan')]:
+                expected = AStar(board=[row[:] for row in board], cost_model=cost_model).solve()
+                result = JumpPointSearch(board=[row[:] for row in board], cost_model=cost_model).solve()
+                self.assertAlmostEqual(result.cost, expected.cost)
+
+    def test_rejects_cheap_diagonals(self):
+        with self.assertRaises(ValueError):
+            JumpPointSearch(cost_model=CostModel(diagonal=0.8, heuristic='chebyshev'))
+
+    def test_unreachable(self):
+        result = JumpPointSearch(board=[[2, 1, 0],
+                                        [1, 1, 0],
+                                        [0, 0, 3]]).solve()
+        self.assertEqual(result.path, [])
+
+    def test_move_nodes(self):
+        j = JumpPointSearch(6, 6, start=(0, 0), end=(5, 5))
+        j.move_node(2, 0, j.start_node)
+        j.move_node(2, 5, j.end_node)
+        self.assertEqual(j.solve().cost, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
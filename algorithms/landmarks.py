@@ -0,0 +1,291 @@
+import random
+import struct
+import zlib
+from array import array
+from heapq import heappush, heappop
+from math import inf
+
+from .costs import CostModel, DEFAULT_COST_MODEL
+from .grid import Grid
+
+MAGIC = b'PFLM'
+VERSION = 1
+# magic, version, typecode, len_x, len_y, landmark count, quantum, fingerprint
+_HEADER = struct.Struct('<4sHcxIIIdI')
+_LIMITS = {'H': 0xFFFF, 'I': 0xFFFFFFFF}  # the largest value marks cells the landmark can not reach
+# finest quantum as a fraction of the cheapest step, the heuristic is scaled down by 1 / (1 + fraction)
+_FRACTIONS = {'H': 16, 'I': 1024}
+
+
+def _fingerprint(grid, cost_model):
+    """
+    Checksum of the obstacles and step costs the tables were computed for
+    :return: int
+    """
+    checksum = zlib.crc32(bytes(grid.traversable))
+    checksum = zlib.crc32(repr((cost_model.orthogonal, cost_model.diagonal)).encode(), checksum)
+    if cost_model.weights:
+        checksum = zlib.crc32(array('d', [weight for row in cost_model.weights for weight in row]).tobytes(),
+                              checksum)
+    return checksum
+
+
+class LandmarkTable(object):
+    def __init__(self, board, count=8, cost_model=None, landmarks=None, seed=0):
+        """
+        Distances from every cell to a few landmarks, for the ALT (A*, landmarks, triangle inequality) heuristic:
+        d(n, t) >= d(n, L) - d(t, L), and without terrain weights also d(t, L) - d(n, L).
+        Distances are rounded down to multiples of quantum and stored in uint16 arrays when they fit, uint32 otherwise.
+        Tables stay valid until the board or the step costs change, see matches().
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid
+        :param int count:   Number of landmarks, ignored when landmarks are given
+        :param CostModel cost_model:    (optional) Step costs and terrain weights, octile steps by default
+        :param landmarks:   (optional) List of (x, y) landmarks, picked by farthest point selection by default
+        :param int seed:    Random seed of the first farthest point sweep
+        """
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.len_x = grid.len_x
+        self.len_y = grid.len_y
+        self.fingerprint = _fingerprint(grid, self.cost_model)
+        self.symmetric = not self.cost_model.weights
+        self._traversable = grid.traversable
+        self._weights = array('d', [weight for row in self.cost_model.weights for weight in row]) \
+            if self.cost_model.weights else None
+        self._min_step = min(self.cost_model.orthogonal, self.cost_model.diagonal) * self.cost_model.min_weight
+
+        if landmarks is None:
+            sweeps = self._farthest_points(count, seed)
+        else:
+            sweeps = [(tuple(landmark), self._sweep(grid.index(*landmark))) for landmark in landmarks]
+        self.landmarks = [landmark for landmark, _ in sweeps]
+        longest = max([max((value for value in distances if value < inf), default=0) for _, distances in sweeps],
+                      default=0)
+        # uint16 unless a quantum would have to be longer than a step
+        self.typecode = 'H' if longest / (_LIMITS['H'] - 1) <= self._min_step else 'I'
+        self.quantum = max(self._min_step / _FRACTIONS[self.typecode], longest / (_LIMITS[self.typecode] - 1))
+        self.tables = [self._quantize(distances) for _, distances in sweeps]
+        self._set_scale()
+        del self._traversable, self._weights
+
+    def _set_scale(self):
+        # a quantized difference is off by less than one quantum, scaling by min_step / (min_step + quantum) keeps
+        # the bound admissible and consistent (it never drops by more than the step cost between neighbours)
+        self.scale = self.quantum * self._min_step / (self._min_step + self.quantum)
+        self.unreachable = _LIMITS[self.typecode]
+
+    def _sweep(self, landmark):
+        """
+        Dijkstra from the landmark over reversed steps, a step into a cell costs its terrain weight times more
+        :param int landmark:    Cell index
+        :return: array of distances from every cell to the landmark (inf if unreachable)
+        """
+        len_x, len_y = self.len_x, self.len_y
+        traversable, weights = self._traversable, self._weights
+        orthogonal, diagonal = self.cost_model.orthogonal, self.cost_model.diagonal
+        distances = array('d', [inf]) * (len_x * len_y)
+        if not traversable[landmark]:
+            raise ValueError("Landmark {} is an obstacle".format(divmod(landmark, len_x)[::-1]))
+        distances[landmark] = 0
+        heap = [(0, landmark)]
+        while heap:
+            distance, index = heappop(heap)
+            if distance > distances[index]:
+                continue
+            y, x = divmod(index, len_x)
+            step_weight = weights[index] if weights else 1
+            for x_diff in (-1, 0, 1):
+                if not 0 <= x + x_diff < len_x:
+                    continue
+                for y_diff in (-1, 0, 1):
+                    if not 0 <= y + y_diff < len_y or not (x_diff or y_diff):
+                        continue
+                    neighbour = index + y_diff * len_x + x_diff
+                    if not traversable[neighbour]:
+                        continue
+                    if x_diff and y_diff:
+                        if not traversable[index + x_diff] and not traversable[index + y_diff * len_x]:
+                            continue
+                        candidate = distance + diagonal * step_weight
+                    else:
+                        candidate = distance + orthogonal * step_weight
+                    if candidate < distances[neighbour]:
+                        distances[neighbour] = candidate
+                        heappush(heap, (candidate, neighbour))
+        return distances
+
+    def _farthest_points(self, count, seed):
+        """
+        Farthest point selection: start from the cell farthest from a random one, then add the cell farthest from
+        all landmarks so far. Cells no landmark reaches get a landmark of their own (the farthest cell from a random
+        one of them) while they hold at least 1 / count of the free cells, smaller pockets are left to the
+        geometric heuristic.
+        :return: list of ((x, y), distances)
+        """
+        rnd = random.Random(seed)
+        free = [index for index in range(self.len_x * self.len_y) if self._traversable[index]]
+        if not free or count < 1:
+            return []
+
+        def farthest_from(index):
+            distances = self._sweep(index)
+            return distances.index(max(value for value in distances if value < inf))
+
+        landmark = farthest_from(rnd.choice(free))
+        # obstacles and skipped pockets stay at -1 and are never picked
+        nearest = array('d', [-1.0]) * (self.len_x * self.len_y)
+        for index in free:
+            nearest[index] = inf
+        sweeps = []
+        while len(sweeps) < count:
+            distances = self._sweep(landmark)
+            sweeps.append((divmod(landmark, self.len_x)[::-1], distances))
+            nearest = array('d', map(min, nearest, distances))
+            unreached = [index for index in free if nearest[index] == inf]
+            if len(unreached) * count >= len(free):
+                landmark = farthest_from(rnd.choice(unreached))
+                continue
+            for index in unreached:
+                nearest[index] = -1.0
+            farthest = max(nearest)
+            if farthest <= 0:
+                break
+            landmark = nearest.index(farthest)
+        return sweeps
+
+    def _quantize(self, distances):
+        """
+        :return: array of distances in quanta, rounded down, unreachable cells hold the largest value
+        """
+        quantum, unreachable = self.quantum, _LIMITS[self.typecode]
+        return array(self.typecode, [int(distance / quantum) if distance < inf else unreachable
+                                     for distance in distances])
+
+    def lower_bound(self, start, end):
+        """
+        Lower bound of the cost from start to end
+        :param (int,int) start:   [(x-coordinate, y-coordinate)]
+        :param (int,int) end:   [(x-coordinate, y-coordinate)]
+        :return: float
+        """
+        return self.bounds_to(end)(start[1] * self.len_x + start[0])
+
+    def bounds_to(self, end):
+        """
+        Lower bound function for one destination, its landmark distances are looked up once
+        :param (int,int) end:   [(x-coordinate, y-coordinate)]
+        :return: function cell index -> float
+        """
+        end_index = end[1] * self.len_x + end[0]
+        unreachable, scale, symmetric = self.unreachable, self.scale, self.symmetric
+        pairs = [(table, table[end_index]) for table in self.tables if table[end_index] != unreachable]
+
+        def bound(index):
+            best = 0
+            for table, end_distance in pairs:
+                distance = table[index]
+                if distance == unreachable:
+                    continue
+                difference = distance - end_distance
+                if symmetric and difference < 0:
+                    difference = -difference
+                if difference > best:
+                    best = difference
+            return best * scale
+
+        return bound
+
+    def matches(self, board, cost_model=None):
+        """
+        Check the tables were computed for this board revision and step costs
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid
+        :return: bool
+        """
+        grid = board if isinstance(board, Grid) else Grid.from_board(board)
+        return (grid.len_x, grid.len_y) == (self.len_x, self.len_y) and \
+            _fingerprint(grid, cost_model or self.cost_model) == self.fingerprint
+
+    def memory_size(self):
+        """
+        Bytes used by the distance tables
+        :return: int
+        """
+        return sum(len(table) * table.itemsize for table in self.tables)
+
+    def save(self, path):
+        """
+        Write the tables to a file, load() reads them back for the same board
+        :return: None
+        """
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, self.typecode.encode(), self.len_x, self.len_y,
+                                    len(self.landmarks), self.quantum, self.fingerprint))
+            array('I', [coordinate for landmark in self.landmarks for coordinate in landmark]).tofile(file)
+            for table in self.tables:
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path, board, cost_model=None):
+        """
+        Read tables written by save()
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid the tables were computed for
+        :param CostModel cost_model:    (optional) Step costs the tables were computed with
+        :return: LandmarkTable
+        """
+        table = cls.__new__(cls)
+        table.cost_model = cost_model or DEFAULT_COST_MODEL
+        with open(path, 'rb') as file:
+            magic, version, typecode, table.len_x, table.len_y, count, table.quantum, table.fingerprint = \
+                _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("{} is not a landmark table file".format(path))
+            table.typecode = typecode.decode()
+            coordinates = array('I')
+            coordinates.fromfile(file, 2 * count)
+            table.landmarks = list(zip(coordinates[::2], coordinates[1::2]))
+            table.tables = []
+            for _ in range(count):
+                values = array(table.typecode)
+                values.fromfile(file, table.len_x * table.len_y)
+                table.tables.append(values)
+        if not table.matches(board):
+            raise ValueError("{} was computed for another board or other step costs".format(path))
+        table.symmetric = not table.cost_model.weights
+        table._min_step = min(table.cost_model.orthogonal, table.cost_model.diagonal) * table.cost_model.min_weight
+        table._set_scale()
+        return table
+
+
+class LandmarkCostModel(CostModel):
+    def __init__(self, landmarks, cost_model=None):
+        """
+        Step costs of cost_model (the one of the landmark table by default) with the larger of its heuristic and the
+        landmark lower bound, pass it as cost_model to AStar and the other heuristic searches.
+        Both are consistent, so is their maximum.
+        :param LandmarkTable landmarks:     Tables of the board searched
+        :param CostModel cost_model:    (optional) Step costs and geometric heuristic
+        """
+        self.__dict__.update(vars(cost_model or landmarks.cost_model))
+        self.landmarks = landmarks
+        self._destination = None
+        self._bound = None
+
+    def heuristic(self, current, destination):
+        """
+        Estimated cost between two nodes, epsilon included
+        :return: number
+        """
+        if self._destination != (destination.x, destination.y):
+            self._destination = (destination.x, destination.y)
+            self._bound = self.landmarks.bounds_to(self._destination)
+        estimate = self._bound(current.y * self.landmarks.len_x + current.x)
+        return max(super().heuristic(current, destination), self.epsilon * estimate)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_destination'] = state['_bound'] = None
+        return state
+
+    def __repr__(self):
+        return "LandmarkCostModel({} landmarks, {})".format(len(self.landmarks.landmarks),
+                                                            super().__repr__())
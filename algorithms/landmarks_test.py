@@ -0,0 +1,88 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template, find_paths
+from algorithms.costs import CostModel
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.landmarks import LandmarkTable, LandmarkCostModel
+from maze_generators.generators import recursive_backtracker
+
+
+def free_cells(grid):
+    return [divmod(index, grid.len_x)[::-1] for index in range(grid.len_x * grid.len_y) if grid.traversable[index]]
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = board_template(recursive_backtracker(31, 31, seed=2))
+        self.queries = [(random.Random(seed).choice(free_cells(self.grid)),
+                         random.Random(seed + 100).choice(free_cells(self.grid))) for seed in range(15)]
+
+    def assertOptimal(self, table, cost_model):
+        alt = LandmarkCostModel(table, cost_model)
+        expanded = [0, 0]
+        for start, end in self.queries:
+            expected = Dijkstra(start=start, end=end, board=self.grid, node_type=DijkstraGridNode,
+                                cost_model=cost_model).solve()
+            plain = AStar(start=start, end=end, board=self.grid, node_type=AGridNode, cost_model=cost_model).solve()
+            result = AStar(start=start, end=end, board=self.grid, node_type=AGridNode, cost_model=alt).solve()
+            self.assertAlmostEqual(result.cost, expected.cost)
+            self.assertLessEqual(table.lower_bound(start, end), expected.cost + 1e-9)
+            expanded[0] += plain.nodes_expanded
+            expanded[1] += result.nodes_expanded
+        self.assertLess(expanded[1], expanded[0])
+
+    def test_alt_heuristic(self):
+        table = LandmarkTable(self.grid, count=4)
+        self.assertEqual(len(table.landmarks), 4)
+        self.assertEqual(table.typecode, 'H')
+        self.assertEqual(table.memory_size(), 4 * 2 * 31 * 31)
+        self.assertOptimal(table, table.cost_model)
+
+    def test_terrain_weights(self):
+        rnd = random.Random(1)
+        cost_model = CostModel(weights=[[rnd.choice([1, 2, 5]) for _ in range(31)] for _ in range(31)])
+        table = LandmarkTable(self.grid, count=4, cost_model=cost_model)
+        self.assertFalse(table.symmetric)
+        self.assertOptimal(table, cost_model)
+
+    def test_unreachable_and_given_landmarks(self):
+        board = [[0, 0, 1, 0],
+                 [0, 0, 1, 0],
+                 [0, 0, 1, 0]]
+        table = LandmarkTable(board, count=3)
+        # farthest point selection puts a landmark in both parts
+        self.assertEqual({x < 2 for x, _ in table.landmarks}, {True, False})
+        table = LandmarkTable(board, landmarks=[(0, 0)])
+        self.assertEqual(table.lower_bound((3, 0), (0, 2)), 0)
+        self.assertGreater(table.lower_bound((0, 0), (1, 2)), 0)
+        self.assertRaises(ValueError, LandmarkTable, board, landmarks=[(2, 0)])
+
+    def test_save_and_load(self):
+        table = LandmarkTable(self.grid, count=3)
+        path = os.path.join(tempfile.mkdtemp(), 'maze.landmarks')
+        table.save(path)
+        loaded = LandmarkTable.load(path, self.grid)
+        self.assertEqual((loaded.landmarks, loaded.tables, loaded.quantum), (table.landmarks, table.tables,
+                                                                            table.quantum))
+        self.assertEqual(loaded.lower_bound((0, 0), (30, 30)), table.lower_bound((0, 0), (30, 30)))
+        changed = self.grid.copy()
+        changed.traversable[0] = 0
+        self.assertFalse(table.matches(changed))
+        self.assertRaises(ValueError, LandmarkTable.load, path, changed)
+        os.remove(path)
+
+    def test_batch(self):
+        alt = LandmarkCostModel(LandmarkTable(self.grid, count=2))
+        alt.heuristic(self.grid.node(0), self.grid.node(1))
+        self.assertIsNone(pickle.loads(pickle.dumps(alt))._bound)
+        self.assertEqual(find_paths(self.grid, self.queries[:3], cost_model=alt), find_paths(self.grid,
+                                                                                            self.queries[:3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
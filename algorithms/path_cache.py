@@ -0,0 +1,164 @@
+from array import array
+from collections import OrderedDict
+
+from .a_star import AStar, AGridNode
+from .batch import board_template, solve_query
+from .components import ComponentIndex
+from .costs import DEFAULT_COST_MODEL
+
+# rough per-entry bookkeeping cost (dict slots, tuples, reverse index sets) used for the memory bound
+ENTRY_OVERHEAD = 200
+INDEX_BYTES_PER_CELL = 80
+
+
+class _Entry(object):
+    __slots__ = ('path', 'cost', 'touched', 'size')
+
+    def __init__(self, path, cost, touched, size):
+        self.path = path
+        self.cost = cost
+        self.touched = touched
+        self.size = size
+
+
+class PathCache(object):
+    def __init__(self, board, algorithm=AStar, node_type=AGridNode, max_bytes=64 * 1024 * 1024, cost_model=None):
+        """
+        LRU cache of paths on one board, keyed by (start, end) at the current board revision.
+        add_obstacle / remove_obstacle bump the revision but only drop the entries the edit can affect,
+        every entry left in the cache is valid for the current revision. Misses between unconnected cells are
+        answered by a ComponentIndex of the board without a search.
+        :param [[]] board:    2d Int Array [1-obstacle] or a Grid (copied, start/end marks are ignored)
+        :param type algorithm:      BaseAlgorithm subclass used on a miss
+        :param type node_type:      GridNode subclass matching the algorithm
+        :param int max_bytes:       Approximate memory bound of the cached paths
+        :param CostModel cost_model:    (optional) Step costs and heuristic of the algorithm
+        """
+        self.board = board_template(board)
+        self.algorithm = algorithm
+        self.node_type = node_type
+        self.max_bytes = max_bytes
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.components = ComponentIndex(self.board)
+        self.revision = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._by_cell = {}  # cell index -> keys of entries whose path depends on that cell
+
+    def find_path(self, start, end):
+        """
+        Cached path from start to end
+        :param (int,int) start:   Start [(x-coordinate, y-coordinate)]
+        :param (int,int) end:   End [(x-coordinate, y-coordinate)]
+        :return: list of (x, y) from start to end, empty if end is unreachable
+        """
+        key = (tuple(start), tuple(end))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return [divmod(index, self.board.len_x)[::-1] for index in entry.path]
+
+        self.misses += 1
+        path, cost = solve_query(self.board, start, end, self.algorithm, self.node_type, self.cost_model,
+                                 self.components)
+        self._store(key, path, cost)
+        return path
+
+    def add_obstacle(self, x, y):
+        """
+        Add obstacle in given (x,y) position, drops the paths that go through or cut the corner of the cell
+        :return: None
+        """
+        self.revision += 1
+        index = self.board.index(x, y)
+        self.board.set_traversable(index, 0)
+        self.board.state[index] = 1
+        self.components.add_obstacle(x, y)
+        for key in list(self._by_cell.get(index, ())):
+            self._remove(key)
+            self.invalidations += 1
+
+    def remove_obstacle(self, x, y):
+        """
+        Remove obstacle in given (x,y) position, drops unreachable results and the paths a detour through
+        the cell could make shorter
+        :return: None
+        """
+        self.revision += 1
+        index = self.board.index(x, y)
+        self.board.set_traversable(index, 1)
+        self.board.state[index] = 0
+        self.components.remove_obstacle(x, y)
+        for (start, end), entry in list(self._entries.items()):
+            if entry.cost is None or self._detour_bound(start, (x, y), end) < entry.cost:
+                self._remove((start, end))
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._by_cell.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Counters for sizing the cache
+        :return: dict
+        """
+        return {'entries': len(self._entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'invalidations': self.invalidations, 'revision': self.revision}
+
+    def _detour_bound(self, start, cell, end):
+        """
+        Lower bound of the cost of a path from start to end that goes through cell, or uses a diagonal next to it.
+        A diagonal unblocked by removing an obstacle has both ends next to that cell, it saves at most
+        the bound of two orthogonal steps minus one diagonal step compared to going through the cell.
+        """
+        model = self.cost_model
+
+        def distance(a, b):
+            return model.free_distance(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+        saved = 2 * model.free_distance(1, 0) - model.min_weight * min(model.diagonal, 2 * model.orthogonal)
+        return distance(start, cell) + distance(cell, end) - saved
+
+    def _touched_cells(self, path):
+        """
+        Cells whose traversability the path depends on: the path itself and the corners of its diagonal steps
+        :return: set of int
+        """
+        board = self.board
+        touched = {board.index(x, y) for x, y in path}
+        for (x, y), (next_x, next_y) in zip(path, path[1:]):
+            if x != next_x and y != next_y:
+                touched.add(board.index(x, next_y))
+                touched.add(board.index(next_x, y))
+        return touched
+
+    def _store(self, key, path, cost):
+        touched = self._touched_cells(path) if path else {self.board.index(*key[0]), self.board.index(*key[1])}
+        stored_path = array('i', [self.board.index(x, y) for x, y in path])
+        size = ENTRY_OVERHEAD + stored_path.itemsize * len(stored_path) + INDEX_BYTES_PER_CELL * len(touched)
+        if size > self.max_bytes:
+            return None
+        entry = _Entry(stored_path, cost, touched, size)
+        self._entries[key] = entry
+        self.size += size
+        for index in touched:
+            self._by_cell.setdefault(index, set()).add(key)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for index in entry.touched:
+            keys = self._by_cell[index]
+            keys.discard(key)
+            if not keys:
+                del self._by_cell[index]
@@ -0,0 +1,63 @@
+import unittest
+from algorithms.costs import CostModel
+from algorithms.path_cache import PathCache
+
+BOARD = [[0, 0, 0, 0, 0],
+         [0, 1, 1, 1, 0],
+         [0, 0, 0, 0, 0],
+         [0, 0, 0, 0, 0]]
+
+
+class TestPathCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = PathCache(BOARD)
+        path = cache.find_path((0, 0), (4, 0))
+        self.assertEqual(path, [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)])
+        self.assertEqual(cache.find_path((0, 0), (4, 0)), path)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_obstacle_keeps_unaffected_paths(self):
+        cache = PathCache(BOARD)
+        cache.find_path((0, 0), (4, 0))
+        cache.find_path((0, 3), (4, 3))
+        cache.add_obstacle(2, 0)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.find_path((0, 3), (4, 3)), [(0, 3), (1, 3), (2, 3), (3, 3), (4, 3)])
+        self.assertEqual(cache.find_path((0, 0), (4, 0))[3], (2, 2))
+        self.assertEqual((cache.hits, cache.invalidations, cache.revision), (1, 1, 1))
+
+    def test_removed_obstacle_drops_improvable_paths(self):
+        cache = PathCache(BOARD)
+        cache.find_path((2, 0), (2, 2))
+        cache.find_path((0, 3), (4, 3))
+        cache.remove_obstacle(2, 1)
+        self.assertEqual(cache.find_path((2, 0), (2, 2)), [(2, 0), (2, 1), (2, 2)])
+        self.assertEqual((cache.hits, cache.invalidations), (0, 1))
+        cache.find_path((0, 3), (4, 3))
+        self.assertEqual(cache.hits, 1)
+
+    def test_removed_obstacle_with_cheap_diagonals(self):
+        cache = PathCache([[1, 0, 1, 0, 0, 1, 1, 0],
+                           [1, 0, 0, 0, 0, 0, 1, 0],
+                           [0, 0, 0, 1, 0, 0, 1, 1],
+                           [0, 0, 0, 0, 0, 1, 0, 0],
+                           [0, 1, 1, 1, 0, 0, 0, 1]], cost_model=CostModel(1, 0.8, 'chebyshev'))
+        self.assertEqual(cache.find_path((1, 2), (6, 3)), [(1, 2), (2, 3), (3, 3), (4, 4), (5, 4), (6, 3)])
+        # unblocks the diagonal (5, 2) -> (6, 3), five diagonal steps beat three and two orthogonal ones
+        cache.remove_obstacle(6, 2)
+        self.assertEqual(cache.find_path((1, 2), (6, 3)), [(1, 2), (2, 1), (3, 0), (4, 1), (5, 2), (6, 3)])
+        self.assertEqual((cache.hits, cache.invalidations), (0, 1))
+
+    def test_lru_eviction(self):
+        cache = PathCache(BOARD, max_bytes=1000)
+        for x in range(5):
+            cache.find_path((0, 3), (x, 3))
+        self.assertGreater(cache.evictions, 0)
+        self.assertLessEqual(cache.size, 1000)
+        cache.find_path((0, 3), (4, 3))
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
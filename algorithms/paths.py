@@ -0,0 +1,173 @@
+from array import array
+from math import sqrt
+
+# paths here are flat arrays of coordinates [x0, y0, x1, y1, ...] from start to end, 8 bytes per cell instead of a
+# node object or an (x, y) tuple
+
+
+def as_array(path):
+    """
+    :param path:    Nodes or (x, y) pairs, in path order
+    :return: array('i') [x0, y0, x1, y1, ...]
+    """
+    coordinates = array('i')
+    for cell in path:
+        if isinstance(cell, tuple):
+            coordinates.extend(cell)
+        else:
+            coordinates.append(cell.x)
+            coordinates.append(cell.y)
+    return coordinates
+
+
+def as_pairs(coordinates):
+    """
+    :return: list of (x, y)
+    """
+    return list(zip(coordinates[::2], coordinates[1::2]))
+
+
+def backtrack(grid, end):
+    """
+    Follow the parent links of a searched Grid back from end, without creating node views
+    :param Grid grid:   Grid of the search
+    :param int end:     Cell index of the end node
+    :return: array('i') [x0, y0, ...] from start to end
+    """
+    parent, len_x = grid.parent, grid.len_x
+    indices = array('i', [end])
+    index = parent[end]
+    while index:
+        indices.append(index - 1)
+        index = parent[index - 1]
+    coordinates = array('i', bytes(8 * len(indices)))
+    position = 0
+    for index in reversed(indices):
+        coordinates[position + 1], coordinates[position] = divmod(index, len_x)
+        position += 2
+    return coordinates
+
+
+def waypoints(coordinates):
+    """
+    Run-length compression of a cell path: only the start, the end and the cells where the step direction changes
+    are kept, every straight run in between is dropped. expand() restores the cells.
+    :param coordinates:     array [x0, y0, ...] of a path of adjacent cells
+    :return: array('i') [x0, y0, ...]
+    """
+    if len(coordinates) <= 4:
+        return array('i', coordinates)
+    kept = array('i', coordinates[:2])
+    x, y = coordinates[2], coordinates[3]
+    x_diff, y_diff = x - coordinates[0], y - coordinates[1]
+    for position in range(4, len(coordinates), 2):
+        next_x, next_y = coordinates[position], coordinates[position + 1]
+        if next_x - x != x_diff or next_y - y != y_diff:
+            kept.append(x)
+            kept.append(y)
+            x_diff, y_diff = next_x - x, next_y - y
+        x, y = next_x, next_y
+    kept.append(x)
+    kept.append(y)
+    return kept
+
+
+def expand(points):
+    """
+    Cells of a path given by waypoints joined by straight horizontal, vertical or diagonal runs
+    :param points:  array [x0, y0, ...] from waypoints()
+    :return: array('i') [x0, y0, ...] of adjacent cells
+    """
+    coordinates = array('i', points[:2])
+    for position in range(2, len(points), 2):
+        x, y = coordinates[-2], coordinates[-1]
+        x_distance, y_distance = points[position] - x, points[position + 1] - y
+        steps = max(abs(x_distance), abs(y_distance))
+        if x_distance and y_distance and abs(x_distance) != abs(y_distance):
+            raise ValueError("({}, {}) -> ({}, {}) is not a straight run".format(x, y, points[position],
+                                                                               points[position + 1]))
+        x_diff, y_diff = (x_distance > 0) - (x_distance < 0), (y_distance > 0) - (y_distance < 0)
+        for _ in range(steps):
+            x += x_diff
+            y += y_diff
+            coordinates.append(x)
+            coordinates.append(y)
+    return coordinates
+
+
+def line_of_sight(grid, start, end):
+    """
+    Check the straight line between two cell centers only crosses traversable cells. Where it passes exactly through
+    a corner, one of the two cells beside the corner has to be traversable, like for a diagonal step.
+    :param Grid grid:   Board
+    :param (int,int) start:   [(x-coordinate, y-coordinate)]
+    :param (int,int) end:   [(x-coordinate, y-coordinate)]
+    :return: bool
+    """
+    (x, y), (end_x, end_y) = start, end
+    traversable, len_x = grid.traversable, grid.len_x
+    x_distance, y_distance = abs(end_x - x), abs(end_y - y)
+    x_step, y_step = (1 if end_x > x else -1), (1 if end_y > y else -1)
+    # walk the cells the line crosses; error > 0 means it leaves the current cell through a vertical side first
+    error = x_distance - y_distance
+    x_distance, y_distance = 2 * x_distance, 2 * y_distance
+    index = y * len_x + x
+    if not traversable[index]:
+        return False
+    for _ in range((x_distance + y_distance) // 2):
+        if error > 0:
+            x += x_step
+            index += x_step
+            error -= y_distance
+        elif error < 0:
+            y += y_step
+            index += y_step * len_x
+            error += x_distance
+        else:
+            if not traversable[index + x_step] and not traversable[index + y_step * len_x]:
+                return False
+            x += x_step
+            y += y_step
+            index += x_step + y_step * len_x
+            error += x_distance - y_distance
+        if not traversable[index]:
+            return False
+        if x == end_x and y == end_y:
+            break
+    return True
+
+
+def string_pull(grid, coordinates):
+    """
+    Any-angle path by post-smoothing: from the last kept point, skip every turning point that the following one can
+    be seen past. The result has at most as many points as waypoints() and is never longer for uniform step costs
+    (terrain weights are not taken into account).
+    :param Grid grid:   Board the path was searched on
+    :param coordinates:     array [x0, y0, ...] of a path of adjacent cells
+    :return: array('i') [x0, y0, ...] of points joined by straight segments
+    """
+    points = as_pairs(waypoints(coordinates))
+    if len(points) <= 2:
+        return as_array(points)
+    kept = [points[0]]
+    for position in range(1, len(points) - 1):
+        if not line_of_sight(grid, kept[-1], points[position + 1]):
+            kept.append(points[position])
+    kept.append(points[-1])
+    return as_array(kept)
+
+
+def length(coordinates):
+    """
+    Euclidean length of the segments between consecutive points
+    :return: float
+    """
+    return sum(sqrt((coordinates[position + 2] - coordinates[position]) ** 2 +
+                    (coordinates[position + 3] - coordinates[position + 1]) ** 2)
+               for position in range(0, len(coordinates) - 2, 2))
+
+
+# path formats of solve_query / find_paths, cells are returned as a list of (x, y)
+FORMATS = {'array': lambda grid, coordinates: coordinates,
+           'waypoints': lambda grid, coordinates: waypoints(coordinates),
+           'smoothed': string_pull}
@@ -0,0 +1,69 @@
+import unittest
+from array import array
+from algorithms.a_star import AStar, AGridNode
+from algorithms.batch import board_template, find_paths
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalGridNode
+from algorithms.d_star_lite import DStarLite
+from algorithms.jump_point_search import JumpPointSearch
+from algorithms.paths import as_array, as_pairs, waypoints, expand, line_of_sight, string_pull, length
+
+BOARD = [[0, 0, 0, 0, 0, 0, 0, 0],
+         [0, 0, 0, 0, 0, 0, 0, 0],
+         [0, 0, 0, 1, 1, 0, 0, 0],
+         [0, 0, 0, 1, 1, 0, 0, 0],
+         [0, 0, 0, 0, 0, 0, 0, 0],
+         [0, 0, 0, 0, 0, 0, 0, 0]]
+
+
+class TestPaths(unittest.TestCase):
+
+    def test_path_array(self):
+        for algorithm, node_type in [(AStar, AGridNode), (JumpPointSearch, AGridNode), (DStarLite, None),
+                                     (BidirectionalAStar, BidirectionalGridNode), (AStar, None)]:
+            if node_type:
+                alg = algorithm(board=board_template(BOARD), start=(0, 3), end=(7, 2), node_type=node_type)
+            else:
+                board = [row[:] for row in BOARD]
+                board[3][0], board[2][7] = 2, 3
+                alg = algorithm(board=board)
+            result = alg.solve()
+            self.assertEqual(alg.path_array(), as_array(reversed(result.path)), algorithm.__name__)
+        alg = AStar(board=board_template([[0, 1, 0]]), start=(0, 0), end=(2, 0), node_type=AGridNode)
+        alg.solve()
+        self.assertEqual(alg.path_array(), array('i'))
+
+    def test_waypoints(self):
+        cells = as_array([(0, 0), (1, 0), (2, 0), (3, 1), (4, 2), (4, 3), (4, 4)])
+        self.assertEqual(as_pairs(waypoints(cells)), [(0, 0), (2, 0), (4, 2), (4, 4)])
+        self.assertEqual(expand(waypoints(cells)), cells)
+        self.assertEqual(waypoints(as_array([(1, 1)])), as_array([(1, 1)]))
+        with self.assertRaises(ValueError):
+            expand(as_array([(0, 0), (2, 1)]))
+
+    def test_line_of_sight(self):
+        grid = board_template(BOARD)
+        self.assertTrue(line_of_sight(grid, (0, 0), (7, 1)))
+        self.assertFalse(line_of_sight(grid, (0, 3), (7, 2)))
+        self.assertFalse(line_of_sight(grid, (2, 5), (5, 1)))
+        self.assertTrue(line_of_sight(grid, (2, 1), (3, 1)))
+        # corners: one free cell beside the corner is enough, like for diagonal steps
+        self.assertTrue(line_of_sight(grid, (2, 1), (3, 0)))
+        self.assertFalse(line_of_sight(board_template([[0, 1], [1, 0]]), (0, 0), (1, 1)))
+        self.assertTrue(line_of_sight(board_template([[0, 0], [1, 0]]), (0, 0), (1, 1)))
+
+    def test_string_pull(self):
+        grid = board_template(BOARD)
+        cells = find_paths(grid, [((0, 3), (7, 2))], path_format='array')[0]
+        smoothed = string_pull(grid, cells)
+        self.assertEqual((smoothed[:2], smoothed[-2:]), (array('i', [0, 3]), array('i', [7, 2])))
+        self.assertLess(len(smoothed), len(waypoints(cells)))
+        self.assertLessEqual(length(smoothed), length(cells))
+        points = as_pairs(smoothed)
+        for start, end in zip(points, points[1:]):
+            self.assertTrue(line_of_sight(grid, start, end))
+        self.assertEqual(find_paths(grid, [((0, 3), (7, 2))], path_format='smoothed'), [smoothed])
+        self.assertEqual(find_paths(grid, [((0, 0), (7, 0))], path_format='smoothed'), [as_array([(0, 0), (7, 0)])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,337 @@
+"""
+Path query server: named boards stay resident, searches run in a process pool.
+
+    python -m algorithms.server --board arena=PATH --unix /tmp/paths.sock
+
+with PATH a board file written by algorithms.board_file.write_board.
+
+Protocol: one JSON object per line in both directions, answers can come out of order and carry the request id.
+    {"id": 1, "op": "path", "board": "arena", "start": [0, 0], "end": [9, 9], "deadline": 0.5, "format": "cells"}
+        -> {"id": 1, "status": "ok", "path": [[0, 0], ...], "cost": 12.7}
+        status is "ok", "unreachable", "deadline", "cancelled" or "error" (with "message")
+        format (optional) is "cells" (every cell), "waypoints" or "smoothed", see algorithms.paths
+    {"id": 1, "op": "cancel"}   cancels request 1 of the same connection, only request 1 is answered
+    {"id": 2, "op": "stats"}    -> {"id": 2, "status": "ok", "stats": {...}}
+Every request needs a string or integer id, unique among the requests of the connection still in flight.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from .a_star import AStar, AGridNode
+from .batch import board_template, solve_query
+from .board_file import open_board
+from .components import ComponentIndex
+from .paths import as_pairs
+
+# path formats of solve_query a request can ask for, replies are JSON so 'array' is left out
+PATH_FORMATS = ('cells', 'waypoints', 'smoothed')
+
+# boards and algorithm of the current worker process, set once by _init_worker
+_BOARDS = None
+_ALGORITHM = None
+_NODE_TYPE = None
+_COST_MODEL = None
+
+
+def _init_worker(boards, algorithm, node_type, cost_model=None):
+    global _BOARDS, _ALGORITHM, _NODE_TYPE, _COST_MODEL
+    _BOARDS = boards
+    _ALGORITHM = algorithm
+    _NODE_TYPE = node_type
+    _COST_MODEL = cost_model
+
+
+def _solve_on(boards, algorithm, node_type, cost_model, name, start, end, path_format):
+    path, cost = solve_query(boards[name], start, end, algorithm, node_type, cost_model, path_format=path_format)
+    # (x, y) pairs pickle and serialise the same for every format
+    return (path if path_format == 'cells' else as_pairs(path)), cost
+
+
+def _solve(name, start, end, path_format):
+    return _solve_on(_BOARDS, _ALGORITHM, _NODE_TYPE, _COST_MODEL, name, start, end, path_format)
+
+
+class _Search(object):
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+
+
+class PathServer(object):
+    def __init__(self, boards, workers=None, algorithm=AStar, node_type=AGridNode, cost_model=None):
+        """
+        Answer path queries on named boards. Identical queries in flight share one search, queries between
+        unconnected cells are answered from a ComponentIndex without a search.
+        :param dict boards:     name -> 2d Int Array [1-obstacle] or a Grid (board_template / open_board), start/end
+                                marks are ignored
+        :param int workers:     Worker processes (default: CPU count), 0 runs searches in a thread of this process
+        :param type algorithm:      BaseAlgorithm subclass
+        :param type node_type:      GridNode subclass matching the algorithm
+        :param CostModel cost_model:    (optional) Step costs and heuristic of the algorithm
+        """
+        self.boards = {name: board_template(board) for name, board in boards.items()}
+        self.components = {name: ComponentIndex(board) for name, board in self.boards.items()}
+        initargs = (self.boards, algorithm, node_type, cost_model)
+        if workers == 0:
+            # the boards stay with this server, other servers of the process have their own
+            self._solve = partial(_solve_on, *initargs)
+            self.executor = ThreadPoolExecutor(1)
+        else:
+            self._solve = _solve
+            # workers forked from the running server would inherit its connection sockets and keep them open
+            context = multiprocessing.get_context(
+                'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+            self.executor = ProcessPoolExecutor(workers or os.cpu_count(), context, _init_worker, initargs)
+        self.stats = {'queries': 0, 'searches': 0, 'coalesced': 0, 'unreachable': 0, 'cancelled': 0,
+                      'deadlines': 0, 'errors': 0}
+        self._in_flight = {}
+
+    async def find_path(self, board, start, end, deadline=None, path_format='cells'):
+        """
+        Path between two cells of a named board
+        :param str board:   Board name
+        :param (int,int) start:   [(x-coordinate, y-coordinate)]
+        :param (int,int) end:   [(x-coordinate, y-coordinate)]
+        :param float deadline:  (optional) Seconds to wait at most, asyncio.TimeoutError after that
+        :param str path_format:     'cells', 'waypoints' or 'smoothed', see solve_query
+        :return: (list of (x, y) from start to end, empty if unreachable; cost or None)
+        """
+        self.stats['queries'] += 1
+        grid = self.boards[board]
+        if path_format not in PATH_FORMATS:
+            raise ValueError("Unknown path format {!r}".format(path_format))
+        start, end = tuple(start), tuple(end)
+        for x, y in [start, end]:
+            if not (0 <= x < grid.len_x and 0 <= y < grid.len_y):
+                raise ValueError("({}, {}) is outside board {}".format(x, y, board))
+        if not self.components[board].connected(start, end):
+            self.stats['unreachable'] += 1
+            return [], None
+
+        key = (board, start, end, path_format)
+        search = self._in_flight.get(key)
+        if search is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, self._solve, board, start, end,
+                                                                path_format)
+            search = self._in_flight[key] = _Search(future)
+            future.add_done_callback(lambda _: self._forget(key, search))
+            self.stats['searches'] += 1
+        else:
+            self.stats['coalesced'] += 1
+        search.waiters += 1
+        try:
+            # shielded, so a waiter giving up does not cancel the search the other waiters share
+            return await asyncio.wait_for(asyncio.shield(search.future), deadline)
+        finally:
+            search.waiters -= 1
+            if not search.waiters and not search.future.done():
+                # nobody waits any more, drop the search if it has not started yet
+                search.future.cancel()
+                self._forget(key, search)
+
+    def _forget(self, key, search):
+        if self._in_flight.get(key) is search:
+            del self._in_flight[key]
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the JSON lines protocol on one connection until the client closes it
+        :return: None
+        """
+        tasks = {}
+
+        def send(request_id, task):
+            tasks.pop(request_id, None)
+            if task.cancelled():
+                self.stats['cancelled'] += 1
+                response = {'status': 'cancelled'}
+            else:
+                response = task.result()
+            response['id'] = request_id
+            if not writer.is_closing():
+                writer.write(json.dumps(response).encode() + b'\n')
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    request_id = request.get('id')
+                except (ValueError, AttributeError):
+                    request_id = None
+                # ids key the requests of the connection, so they have to be hashable and present
+                if not isinstance(request_id, (str, int)) or isinstance(request_id, bool):
+                    self.stats['errors'] += 1
+                    writer.write(json.dumps({'id': None, 'status': 'error', 'message': 'malformed request'}).encode()
+                                 + b'\n')
+                    continue
+                if request.get('op') == 'cancel':
+                    if request_id in tasks:
+                        tasks[request_id].cancel()
+                    continue
+                if request_id in tasks:
+                    self.stats['errors'] += 1
+                    writer.write(json.dumps({'id': request_id, 'status': 'error',
+                                             'message': 'request {!r} is still in flight'.format(request_id)}).encode()
+                                 + b'\n')
+                    continue
+                task = tasks[request_id] = asyncio.ensure_future(self._answer(request))
+                task.add_done_callback(lambda task, request_id=request_id: send(request_id, task))
+                await writer.drain()
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, request):
+        """
+        :return: response dict without the id
+        """
+        operation = request.get('op', 'path')
+        try:
+            if operation == 'stats':
+                return {'status': 'ok', 'stats': dict(self.stats, in_flight=len(self._in_flight))}
+            if operation != 'path':
+                raise ValueError("unknown op {!r}".format(operation))
+            path, cost = await self.find_path(request['board'], request['start'], request['end'],
+                                              request.get('deadline'), request.get('format', 'cells'))
+        except asyncio.TimeoutError:
+            self.stats['deadlines'] += 1
+            return {'status': 'deadline'}
+        except Exception as error:
+            # bad requests as well as failed searches or a broken worker pool, the client gets an answer either way
+            self.stats['errors'] += 1
+            return {'status': 'error', 'message': "{}: {}".format(type(error).__name__, error)}
+        if cost is None:
+            return {'status': 'unreachable', 'path': [], 'cost': None}
+        return {'status': 'ok', 'path': path, 'cost': cost}
+
+    async def start_unix(self, path):
+        """
+        :return: asyncio.Server listening on a Unix socket
+        """
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        """
+        :return: asyncio.Server listening on host:port (port 0 picks a free one)
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+class PathClient(object):
+    def __init__(self, reader, writer):
+        """
+        Client of a PathServer connection, many queries can be in flight at once. Use connect_unix / connect_tcp.
+        """
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect_unix(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    @classmethod
+    async def connect_tcp(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+
+    async def request(self, request):
+        """
+        Send one request and wait for its answer, cancelling the wait sends a cancel for the request
+        :param dict request:    Request without id
+        :return: response dict
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        future = self._waiting[request_id] = asyncio.get_running_loop().create_future()
+        self.writer.write(json.dumps(dict(request, id=request_id)).encode() + b'\n')
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._waiting.pop(request_id, None)
+            self.writer.write(json.dumps({'id': request_id, 'op': 'cancel'}).encode() + b'\n')
+            raise
+
+    async def find_path(self, board, start, end, deadline=None, path_format='cells'):
+        """
+        :return: response dict, see the module docstring
+        """
+        request = {'op': 'path', 'board': board, 'start': list(start), 'end': list(end)}
+        if deadline is not None:
+            request['deadline'] = deadline
+        if path_format != 'cells':
+            request['format'] = path_format
+        return await self.request(request)
+
+    async def stats(self):
+        return (await self.request({'op': 'stats'}))['stats']
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self._receiver
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serve path queries over a socket")
+    parser.add_argument('--board', action='append', required=True, metavar='NAME=PATH',
+                        help="board file written by write_board, repeatable")
+    parser.add_argument('--unix', help="Unix socket path")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878, help="TCP port, used without --unix")
+    parser.add_argument('--workers', type=int, help="worker processes, default CPU count")
+    options = parser.parse_args(arguments)
+
+    boards = {}
+    for board in options.board:
+        name, _, path = board.partition('=')
+        boards[name] = open_board(path, marks=False)
+    server = PathServer(boards, options.workers)
+
+    async def serve():
+        listener = await (server.start_unix(options.unix) if options.unix else
+                          server.start_tcp(options.host, options.port))
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
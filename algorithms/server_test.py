@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from algorithms.board_file import open_board, write_board
+from algorithms.grid import Grid
+from algorithms.server import PathServer, PathClient
+from maze_generators.generators import recursive_backtracker
+
+BOARD = [[0, 0, 0, 1, 0],
+         [0, 1, 0, 1, 0],
+         [0, 1, 0, 1, 0]]
+
+MARKED = [[2, 0, 0],
+          [0, 1, 0],
+          [0, 0, 3]]
+
+
+class TestPathServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # a maze whose corner to corner search takes a while
+        self.server = PathServer({'small': BOARD, 'maze': recursive_backtracker(201, 201)}, workers=0)
+        self.listener = await self.server.start_tcp()
+        self.client = await PathClient.connect_tcp(*self.listener.sockets[0].getsockname()[:2])
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.close()
+
+    async def test_queries(self):
+        response = await self.client.find_path('small', (0, 0), (2, 2))
+        self.assertEqual(response['status'], 'ok')
+        self.assertEqual(response['path'][0], [0, 0])
+        self.assertEqual(response['path'][-1], [2, 2])
+        response = await self.client.find_path('small', (2, 0), (2, 2), path_format='waypoints')
+        self.assertEqual(response['path'], [[2, 0], [2, 2]])
+        response = await self.client.find_path('small', (0, 0), (4, 0))
+        self.assertEqual((response['status'], response['path']), ('unreachable', []))
+        self.assertEqual((await self.client.find_path('other', (0, 0), (1, 0)))['status'], 'error')
+        self.assertEqual((await self.client.find_path('small', (0, 0), (9, 0)))['status'], 'error')
+        stats = await self.client.stats()
+        self.assertEqual((stats['queries'], stats['searches'], stats['unreachable'], stats['errors']), (5, 2, 1, 2))
+
+    async def test_failed_search(self):
+        def fail(*args):
+            raise RuntimeError("worker died")
+
+        self.server._solve = fail
+        response = await self.client.find_path('small', (0, 0), (2, 2))
+        self.assertEqual((response['status'], response['message']), ('error', 'RuntimeError: worker died'))
+
+    async def test_coalescing(self):
+        responses = await asyncio.gather(*[self.client.find_path('maze', (0, 0), (200, 200)) for _ in range(5)])
+        self.assertEqual(len({str(response['path']) for response in responses}), 1)
+        stats = await self.client.stats()
+        self.assertEqual((stats['searches'], stats['coalesced'], stats['in_flight']), (1, 4, 0))
+
+    async def test_deadline_and_cancel(self):
+        response = await self.client.find_path('maze', (0, 0), (200, 200), deadline=0.001)
+        self.assertEqual(response['status'], 'deadline')
+        query = asyncio.ensure_future(self.client.find_path('maze', (0, 200), (200, 0)))
+        await asyncio.sleep(0.01)
+        query.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await query
+        # the cancelled search unwinds in the server while the next requests are answered
+        for _ in range(100):
+            stats = await self.client.stats()
+            if stats['cancelled']:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual((stats['deadlines'], stats['cancelled']), (1, 1))
+
+    async def test_request_ids(self):
+        reader, writer = await asyncio.open_connection(*self.listener.sockets[0].getsockname()[:2])
+        try:
+            async def answer(request):
+                writer.write(json.dumps(request).encode() + b'\n')
+                return json.loads(await reader.readline())
+            # ids that are missing or cannot key a request are refused, the connection keeps serving
+            for request_id in [[1], {'a': 1}, None, True, 1.5]:
+                request = {'id': request_id, 'op': 'stats'} if request_id is not None else {'op': 'stats'}
+                self.assertEqual(await answer(request), {'id': None, 'status': 'error', 'message': 'malformed request'})
+            # a second request under an id still in flight is refused, the first one still gets its answer
+            query = {'id': 'q', 'op': 'path', 'board': 'maze', 'start': [0, 0], 'end': [200, 200]}
+            writer.write(json.dumps(query).encode() + b'\n')
+            duplicate = await answer(dict(query, board='small', end=[2, 2]))
+            self.assertEqual((duplicate['id'], duplicate['status']), ('q', 'error'))
+            response = json.loads(await reader.readline())
+            self.assertEqual((response['id'], response['status'], response['path'][-1]), ('q', 'ok', [200, 200]))
+            self.assertEqual((await answer({'id': 'q', 'op': 'stats'}))['stats']['errors'], 6)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_marked_grids(self):
+        path = os.path.join(tempfile.mkdtemp(), 'marked.board')
+        write_board(path, MARKED)
+        server = PathServer({'grid': Grid.from_board(MARKED), 'file': open_board(path)}, workers=0)
+        try:
+            for board in ['grid', 'file']:
+                path_found, _ = await server.find_path(board, (2, 0), (0, 2))
+                self.assertEqual((path_found[0], path_found[-1]), ((2, 0), (0, 2)))
+            # a second in-process server keeps its boards to itself
+            self.assertEqual((await self.client.find_path('small', (0, 0), (2, 2)))['status'], 'ok')
+        finally:
+            server.close()
+            os.remove(path)
+
+    async def test_unix_socket_and_processes(self):
+        server = PathServer({'small': BOARD}, workers=1)
+        path = os.path.join(tempfile.mkdtemp(), 'paths.sock')
+        listener = await server.start_unix(path)
+        client = await PathClient.connect_unix(path)
+        try:
+            response = await client.find_path('small', (4, 2), (4, 0))
+            self.assertEqual(response['path'], [[4, 2], [4, 1], [4, 0]])
+        finally:
+            await client.close()
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import time
+
+from algorithms import AStar
+from maze_generators import random_obstacles
+
+
+def mark_corners(board):
+    """
+    Put the start in the top-left and the end in the bottom-right corner of a generated board, odd sized mazes have
+    passages there
+    :param [bytearray] board:   Board from maze_generators, changed in place
+    :return: board
+    """
+    board[0][0] = 2
+    board[-1][-1] = 3
+    return board
+
+
+def wall_board(size):
+    """
+    Square board split by a wall with a single gap at the bottom, start and end on opposite sides
+    :param int size:    Board width/height
+    :return: [[int]]
+    """
+    board = [[0 for _ in range(size)] for _ in range(size)]
+    for y in range(size - 1):
+        board[y][size // 2] = 1
+    board[size // 2][size // 4] = 2
+    board[size // 2][size - 1 - size // 4] = 3
+    return board
+
+
+def time_search(algorithm, board):
+    """
+    Run algorithm on board until it ends
+    :return: (seconds, number of algorithm loops)
+    """
+    alg = algorithm(board=board)
+    steps = 0
+    start = time.perf_counter()
+    while not alg.alg_end:
+        alg.algorithm_loop()
+        steps += 1
+    return time.perf_counter() - start, steps
+
+
+if __name__ == "__main__":
+    boards = [("open", lambda size: mark_corners(random_obstacles(size, size, 0.0))),
+              ("random 30%", lambda size: mark_corners(random_obstacles(size, size, 0.3))),
+              ("wall", wall_board)]
+    for name, make_board in boards:
+        for size in [50, 100, 200, 400, 1000]:
+            seconds, steps = time_search(AStar, make_board(size))
+            print("{:<10} {:>4}x{:<4} loops={:>7} time={:.3f}s".format(name, size, size, steps, seconds))
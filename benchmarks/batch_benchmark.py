@@ -0,0 +1,34 @@
+import random
+import sys
+import time
+from multiprocessing import cpu_count
+
+from algorithms import find_paths
+from benchmarks.a_star_benchmark import mark_corners
+from maze_generators import random_obstacles
+
+
+def random_queries(board, count, seed=0):
+    """
+    Random (start, end) pairs on free cells of the board
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    free = [(x, y) for y, row in enumerate(board) for x, value in enumerate(row) if value != 1]
+    return [(rnd.choice(free), rnd.choice(free)) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    board = mark_corners(random_obstacles(200, 200, 0.2))
+    queries = random_queries(board, count)
+    workers = 1
+    baseline = None
+    while workers <= cpu_count():
+        start = time.perf_counter()
+        find_paths(board, queries, workers=workers)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print("workers={:<3} queries={} time={:.2f}s speedup={:.2f}x".format(workers, count, seconds,
+                                                                           baseline / seconds))
+        workers *= 2
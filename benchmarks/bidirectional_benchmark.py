@@ -0,0 +1,35 @@
+import time
+
+from algorithms import AStar, AGridNode, Dijkstra, DijkstraGridNode
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalDijkstra, BidirectionalGridNode
+from benchmarks.a_star_benchmark import mark_corners, wall_board
+from maze_generators import random_obstacles, recursive_backtracker
+
+ALGORITHMS = [(Dijkstra, DijkstraGridNode), (BidirectionalDijkstra, BidirectionalGridNode),
+              (AStar, AGridNode), (BidirectionalAStar, BidirectionalGridNode)]
+
+
+def run(algorithm, node_type, board):
+    """
+    :return: (seconds spent searching, SearchResult)
+    """
+    alg = algorithm(board=[row[:] for row in board], node_type=node_type)
+    start = time.perf_counter()
+    result = alg.solve()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    size = 200
+    boards = [("open", mark_corners(random_obstacles(size, size, 0.0))),
+              ("random 20%", mark_corners(random_obstacles(size, size, 0.2))),
+              ("random 35%", mark_corners(random_obstacles(size, size, 0.35))),
+              ("wall", wall_board(size)),
+              ("maze", mark_corners(recursive_backtracker(size + 1, size + 1)))]
+    for name, board in boards:
+        print("{} {}x{}".format(name, size, size))
+        for algorithm, node_type in ALGORITHMS:
+            seconds, result = run(algorithm, node_type, board)
+            cost = "{:.2f}".format(result.cost) if result.path else "-"
+            print("  {:<22} expanded={:>6} cost={:>8} time={:.3f}s".format(algorithm.__name__, result.nodes_expanded,
+                                                                          cost, seconds))
@@ -0,0 +1,86 @@
+import os
+import random
+import tempfile
+import time
+
+from algorithms import AStar, AGridNode, Grid
+from algorithms.board_file import open_board, write_board
+
+# bytes below this random value become obstacles, ~20% density
+_OBSTACLE_TABLE = bytes(1 if value < 51 else 0 for value in range(256))
+
+
+def random_rows(size, seed=0):
+    """
+    size x size random board as bytearray rows, generated without building lists of ints.
+    The cells of local_query are kept free.
+    :return: [bytearray]
+    """
+    rnd = random.Random(seed)
+    rows = [bytearray(rnd.randbytes(size).translate(_OBSTACLE_TABLE)) for _ in range(size)]
+    for x, y in local_query(size):
+        rows[y][x] = 0
+    return rows
+
+
+def resident_bytes():
+    """
+    Resident set size of this process (Linux only)
+    :return: int
+    """
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def local_query(size):
+    """
+    Start/end pair 100 cells apart in the middle of the board
+    :return: ((int,int), (int,int))
+    """
+    return (size // 2, size // 2), (size // 2 + 100, size // 2 + 60)
+
+
+def run_mapped(path, size):
+    """
+    :return: (seconds to open, seconds to solve, resident bytes added)
+    """
+    rss = resident_bytes()
+    start_time = time.perf_counter()
+    start, end = local_query(size)
+    alg = AStar(start=start, end=end, board=open_board(path, AGridNode, marks=False), node_type=AGridNode)
+    opened = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    alg.solve()
+    return opened, time.perf_counter() - start_time, resident_bytes() - rss
+
+
+def run_in_memory(rows, size):
+    """
+    :return: (seconds to build, seconds to solve, resident bytes added)
+    """
+    rss = resident_bytes()
+    start_time = time.perf_counter()
+    start, end = local_query(size)
+    alg = AStar(start=start, end=end, board=Grid.from_board(rows), node_type=AGridNode)
+    built = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    alg.solve()
+    return built, time.perf_counter() - start_time, resident_bytes() - rss
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for size in [1000, 4000, 16000]:
+            rows = random_rows(size)
+            for packed in [False, True]:
+                path = os.path.join(directory, "board.pfg")
+                write_board(path, rows, packed=packed)
+                opened, solved, rss = run_mapped(path, size)
+                print("mapped{} {:>5}x{:<5} file={:>7.1f}MB open={:.4f}s solve={:.3f}s rss=+{:.1f}MB".format(
+                    " packed" if packed else "       ", size, size, os.path.getsize(path) / 2 ** 20, opened, solved,
+                    rss / 2 ** 20))
+            if size <= 4000:
+                built, solved, rss = run_in_memory(rows, size)
+                print("in memory     {:>5}x{:<5}                 build={:.4f}s solve={:.3f}s rss=+{:.1f}MB".format(
+                    size, size, built, solved, rss / 2 ** 20))
+            del rows
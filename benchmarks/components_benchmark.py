@@ -0,0 +1,61 @@
+import random
+import time
+
+from algorithms import AStar, AGridNode
+from algorithms.batch import board_template, solve_query
+from algorithms.components import ComponentIndex
+from maze_generators import random_obstacles, caves
+
+
+def walled_off(board, seed=0):
+    """
+    Board with the right third cut off by a full-height wall
+    :return: (board, unreachable query)
+    """
+    board = [bytearray(row) for row in board]
+    wall = len(board[0]) * 2 // 3
+    for row in board:
+        row[wall] = 1
+    rnd = random.Random(seed)
+    start = end = None
+    while start is None or board[start[1]][start[0]]:
+        start = (rnd.randrange(wall), rnd.randrange(len(board)))
+    while end is None or board[end[1]][end[0]]:
+        end = (rnd.randrange(wall + 1, len(board[0])), rnd.randrange(len(board)))
+    return board, (start, end)
+
+
+def time_edits(index, count, seed=0):
+    """
+    Toggle random cells
+    :return: seconds per edit
+    """
+    rnd = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(count):
+        x, y = rnd.randrange(index.len_x), rnd.randrange(index.len_y)
+        if index.traversable[y * index.len_x + x]:
+            index.add_obstacle(x, y)
+        else:
+            index.remove_obstacle(x, y)
+    return (time.perf_counter() - start) / count
+
+
+if __name__ == "__main__":
+    for size in [128, 256, 512]:
+        for name, board in [("random 30%", random_obstacles(size, size, 0.3)), ("caves", caves(size, size))]:
+            board, query = walled_off(board)
+            grid = board_template(board)
+            start = time.perf_counter()
+            index = ComponentIndex(grid)
+            build_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            solve_query(grid, *query, AStar, AGridNode)
+            search_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(1000):
+                solve_query(grid, *query, AStar, AGridNode, components=index)
+            rejection_seconds = (time.perf_counter() - start) / 1000
+            print("{:<10} {:>3}x{:<3} build={:.3f}s unreachable query: search={:.3f}s index={:.2f}us ({:.0f}x) "
+                  "edit={:.1f}us".format(name, size, size, build_seconds, search_seconds, rejection_seconds * 1e6,
+                                         search_seconds / rejection_seconds, time_edits(index, 1000) * 1e6))
@@ -0,0 +1,52 @@
+import random
+import time
+
+from algorithms.batch import board_template
+from algorithms.components import ComponentIndex
+from algorithms.cooperative import CooperativePlanner
+from maze_generators import random_obstacles, rooms_and_corridors
+
+
+def random_agents(grid, count, seed=0):
+    """
+    Distinct starts and goals, every goal in the component of its start
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    components = ComponentIndex(grid)
+    free = [divmod(index, grid.len_x)[::-1] for index in range(grid.len_x * grid.len_y) if grid.traversable[index]]
+    starts = rnd.sample(free, count)
+    goals = rnd.sample(free, len(free))
+    agents = []
+    for start in starts:
+        goal = next(goal for goal in goals if components.connected(start, goal))
+        goals.remove(goal)
+        agents.append((start, goal))
+    return agents
+
+
+def run_ticks(planner, ticks):
+    """
+    :return: list of seconds per tick
+    """
+    seconds = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        planner.tick()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+if __name__ == "__main__":
+    size, ticks, window = 256, 48, 16
+    for name, board in [("random 10%", random_obstacles(size, size, 0.1)), ("rooms", rooms_and_corridors(size, size))]:
+        grid = board_template(board)
+        for count in [100, 250, 500, 1000]:
+            planner = CooperativePlanner(grid, random_agents(grid, count), window=window)
+            seconds = run_ticks(planner, ticks)
+            planning = seconds[planner.replan:]
+            print("{} {}x{} {:>4} agents window={} replan={}: first tick (goal distances)={:.2f}s, then mean={:.1f}ms "
+                  "max={:.1f}ms per tick, arrived={} blocked={} expanded={} reverse expanded={}".format(
+                      name, size, size, count, window, planner.replan, seconds[0],
+                      sum(planning) / len(planning) * 1e3, max(planning) * 1e3, planner.arrived(),
+                      planner.stats['blocked'], planner.stats['expanded'], planner.stats['reverse_expanded']))
@@ -0,0 +1,50 @@
+import random
+import time
+
+from algorithms import AStar, DStarLite
+from benchmarks.a_star_benchmark import mark_corners
+from maze_generators import random_obstacles
+
+
+def edit_batch(alg, rnd, size):
+    """
+    Toggle `size` random cells close to the current path
+    :return: list of (x, y)
+    """
+    cells = []
+    while len(cells) < size:
+        node = rnd.choice(alg.path)
+        x = min(max(node.x + rnd.randint(-2, 2), 0), alg.len_x - 1)
+        y = min(max(node.y + rnd.randint(-2, 2), 0), alg.len_y - 1)
+        if alg.BOARD[y][x] not in [alg.start_node, alg.end_node]:
+            cells.append((x, y))
+    return cells
+
+
+if __name__ == "__main__":
+    size = 200
+    for batch in [1, 5, 20]:
+        rnd = random.Random(batch)
+        d = DStarLite(board=mark_corners(random_obstacles(size, size, 0.2)))
+        d.solve()
+        repair_seconds = full_seconds = 0
+        ticks = 0
+        while ticks < 20 and d.path_found:
+            for x, y in edit_batch(d, rnd, batch):
+                if d.BOARD[y][x].traversable:
+                    d.add_obstacle(x, y)
+                else:
+                    d.remove_obstacle(x, y)
+            start = time.perf_counter()
+            d.solve()
+            repair_seconds += time.perf_counter() - start
+
+            board = [[0 if node.traversable else 1 for node in row] for row in d.BOARD]
+            board[d.start_node.y][d.start_node.x] = 2
+            board[d.end_node.y][d.end_node.x] = 3
+            start = time.perf_counter()
+            AStar(board=board).solve()
+            full_seconds += time.perf_counter() - start
+            ticks += 1
+        print("{}x{} edits/tick={:<3} ticks={:<3} D* Lite repair={:.4f}s  AStar rebuild+search={:.4f}s".format(
+            size, size, batch, ticks, repair_seconds / ticks, full_seconds / ticks))
@@ -0,0 +1,39 @@
+import random
+import time
+
+from algorithms import Dijkstra
+from algorithms.distance_field import DistanceField
+from benchmarks.a_star_benchmark import mark_corners
+from maze_generators import random_obstacles
+
+
+def dijkstra_exhaustive(board):
+    """
+    Run Dijkstra without an end node, so it expands every reachable cell
+    :return: seconds
+    """
+    alg = Dijkstra(board=board)
+    alg.end_node = None
+    start = time.perf_counter()
+    while alg.open_nodes:
+        alg.algorithm_loop()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for size in [100, 200, 1000, 4096]:
+        board = mark_corners(random_obstacles(size, size, 0.2))
+        start = time.perf_counter()
+        field = DistanceField(board)
+        field_seconds = time.perf_counter() - start
+
+        rnd = random.Random(0)
+        starts = [(rnd.randrange(size), rnd.randrange(size)) for _ in range(1000)]
+        start = time.perf_counter()
+        field.paths(starts)
+        paths_seconds = time.perf_counter() - start
+
+        line = "{:>4}x{:<4} field={:.3f}s 1000 paths={:.3f}s".format(size, size, field_seconds, paths_seconds)
+        if size <= 1000:
+            line += " dijkstra (all cells)={:.3f}s".format(dijkstra_exhaustive(board))
+        print(line)
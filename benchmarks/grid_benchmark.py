@@ -0,0 +1,28 @@
+import time
+import tracemalloc
+
+from algorithms import AStar, AGridNode
+from algorithms.a_star import ANode
+
+
+def measure_construction(size, node_type):
+    """
+    Build an empty size x size AStar board
+    :return: (seconds, bytes allocated per cell)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    alg = AStar(size, size, start=(0, 0), end=(size - 1, size - 1), node_type=node_type)
+    seconds = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del alg
+    return seconds, allocated / (size * size)
+
+
+if __name__ == "__main__":
+    for node_type, sizes in [(ANode, [256, 1024]), (AGridNode, [256, 1024, 4096])]:
+        for size in sizes:
+            seconds, per_cell = measure_construction(size, node_type)
+            print("{:<9} {:>4}x{:<4} build={:.3f}s memory={:.1f} B/cell".format(node_type.__name__, size, size,
+                                                                             seconds, per_cell))
@@ -0,0 +1,82 @@
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from algorithms import Dijkstra
+from benchmarks.a_star_benchmark import mark_corners
+from gui import gui
+from maze_generators import random_obstacles
+
+
+def legacy_frame(board):
+    """
+    One frame as drawn before incremental rendering: every cell is drawn, its text rendered again and the display
+    updated once per cell
+    :return: None
+    """
+    for y in range(board.board_size[1]):
+        for x in range(board.board_size[0]):
+            color = board._node_color(x, y)
+            if color == gui.WHITE and x % 2 == 0 and y % 2 == 0:
+                color = gui.WHITE_SMOKE
+            node_rect = pygame.draw.rect(board.screen, color,
+                                         [(gui.NODE_MARGIN + board.size[0]) * x + gui.NODE_MARGIN,
+                                          (gui.NODE_MARGIN + board.size[1]) * y + gui.NODE_MARGIN + gui.BOARD_MARGIN,
+                                          board.size[0], board.size[1]])
+            node_text = board._node_text(x, y, color) if gui.TEXT_ON_NODES else None
+            if node_text is not None:
+                text_surface = gui.FONT.render(node_text, True, gui.BLACK)
+                text_rect = board.screen.blit(text_surface, node_rect.topleft)
+                pygame.display.update([node_rect, text_rect])
+            else:
+                pygame.display.update(node_rect)
+
+
+def run(size, frames, incremental):
+    """
+    Step a Dijkstra search once per frame and draw it
+    :return: milliseconds per frame
+    """
+    screen = pygame.display.set_mode([gui.WIDTH, gui.HEIGHT])
+    board = gui.Board(screen, Dijkstra(board=mark_corners(random_obstacles(size, size, 0.2))))
+    start = time.perf_counter()
+    for _ in range(frames):
+        if incremental:
+            board.step(0)
+            board.render()
+        else:
+            board.alg.algorithm_loop()
+            legacy_frame(board)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def frames_to_finish(size, budget):
+    """
+    Frames a full Dijkstra search takes to visualise when every frame searches for budget seconds
+    :return: (frames, seconds spent searching and drawing)
+    """
+    screen = pygame.display.set_mode([gui.WIDTH, gui.HEIGHT])
+    board = gui.Board(screen, Dijkstra(board=mark_corners(random_obstacles(size, size, 0.2))), step_budget=budget)
+    frames = 0
+    start = time.perf_counter()
+    while not board.alg.alg_end:
+        board.step()
+        board.render()
+        frames += 1
+    return frames, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for size, frames in [(20, 200), (50, 100), (200, 20)]:
+        legacy = run(size, frames, False)
+        incremental = run(size, frames, True)
+        print("{:>3}x{:<3} per frame: full redraw={:.2f}ms incremental={:.3f}ms ({:.0f}x)".format(
+            size, size, legacy, incremental, legacy / incremental))
+    for size in [50, 200]:
+        for budget in [0, gui.STEP_BUDGET]:
+            frames, seconds = frames_to_finish(size, budget)
+            print("{:>3}x{:<3} budget={:.1f}ms frames={:>6} ({:.1f}s at 60 fps) work={:.2f}s".format(
+                size, size, budget * 1000, frames, frames / 60, seconds))
@@ -0,0 +1,337 @@
+"""
+Benchmark every search algorithm on reproducible boards and compare against a saved baseline.
+
+    python -m benchmarks.harness --output results.json
+    python -m benchmarks.harness --baseline results.json --threshold 0.25
+    python -m benchmarks.harness --scenario maps/arena.map.scen
+
+Exits with status 1 when a result regressed by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms import AStar, AGridNode, Dijkstra, DijkstraGridNode, DStarLite, JumpPointSearch, HPAStar, \
+    LandmarkTable, LandmarkCostModel
+from algorithms.a_star import ANode
+from algorithms.batch import board_template
+from algorithms.bidirectional import BidirectionalAStar, BidirectionalDijkstra, BidirectionalGridNode
+from algorithms.d_star_lite import DStarNode
+from algorithms.dijkstra import DijkstraNode
+from algorithms.grid import GridNode
+from benchmarks.a_star_benchmark import wall_board
+from benchmarks.moving_ai import load_map, load_scenarios
+from maze_generators import generators
+
+try:
+    from algorithms.distance_field import DistanceField
+except ImportError:
+    DistanceField = None
+
+# 2: generated boards come from maze_generators, 3: HPA* counts the cluster and refinement searches
+RESULTS_VERSION = 3
+# timings closer than this to the baseline are noise, never regressions
+TIME_SLACK = 0.005
+
+# name -> (algorithm, node_type), the ones in RUNNERS prepare per board or per goal and are run by their runner
+ALGORITHMS = {
+    'A*': (AStar, ANode),
+    'A* grid': (AStar, AGridNode),
+    'Dijkstra': (Dijkstra, DijkstraNode),
+    'Dijkstra grid': (Dijkstra, DijkstraGridNode),
+    'D* Lite': (DStarLite, DStarNode),
+    'JPS': (JumpPointSearch, ANode),
+    'Bidirectional Dijkstra': (BidirectionalDijkstra, BidirectionalGridNode),
+    'Bidirectional A*': (BidirectionalAStar, BidirectionalGridNode),
+    'HPA*': (HPAStar, None),
+    'ALT': (AStar, AGridNode),
+}
+if DistanceField is not None:
+    ALGORITHMS['Distance field'] = (DistanceField, None)
+REFERENCE = 'Dijkstra grid'
+
+
+def clear_marks(board):
+    """
+    :return: [[int]] copy of board with start/end marks removed
+    """
+    return [[0 if value in [2, 3] else value for value in row] for row in board]
+
+
+def reachable_queries(board, count, seed=0):
+    """
+    Random start/end pairs in the same connected area, the end is one of the farthest cells reached from the start
+    :param [[]] board:  2d Int Array [1-obstacle]
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    grid = board_template(board)
+    free = [index for index in range(grid.len_x * grid.len_y) if grid.traversable[index]]
+    queries = []
+    for _ in range(count * 10):
+        if len(queries) == count or not free:
+            break
+        start = rnd.choice(free)
+        # breadth first search, the last layer holds the farthest cells
+        seen, layer = {start}, [start]
+        while True:
+            following = []
+            for index in layer:
+                for neighbour in grid.neighbours(index):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        following.append(neighbour)
+            if not following:
+                break
+            layer = following
+        end = rnd.choice(layer)
+        if end != start:
+            queries.append((divmod(start, grid.len_x)[::-1], divmod(end, grid.len_x)[::-1]))
+    return queries
+
+
+def generated_boards(size, queries, seed=0):
+    """
+    Open board, random obstacle density sweep, wall, maze, rooms and caves (with numpy), all seeded
+    :return: list of (name, board, queries)
+    """
+    maze_size = size + 1 - size % 2
+    boards = [("open {}".format(size), generators.random_obstacles(size, size, 0.0, seed))]
+    boards += [("random {}% {}".format(int(density * 100), size),
+                generators.random_obstacles(size, size, density, seed)) for density in [0.1, 0.2, 0.3, 0.4]]
+    boards += [("wall {}".format(size), wall_board(size)),
+               ("maze {}".format(maze_size), generators.recursive_backtracker(maze_size, maze_size, seed)),
+               ("rooms {}".format(size), generators.rooms_and_corridors(size, size, seed=seed))]
+    if generators.np is not None:
+        boards.append(("caves {}".format(size), generators.caves(size, size, seed=seed)))
+    return [(name, clear_marks(board), reachable_queries(clear_marks(board), queries, seed))
+            for name, board in boards]
+
+
+def scenario_boards(path, queries):
+    """
+    Boards and queries of a Moving AI scenario file, up to `queries` scenarios per map spread over all buckets
+    :return: list of (name, board, queries)
+    """
+    by_map = {}
+    for map_path, start, end, _ in load_scenarios(path):
+        by_map.setdefault(map_path, []).append((start, end))
+    boards = []
+    for map_path, pairs in sorted(by_map.items()):
+        step = max(1, len(pairs) // queries)
+        boards.append((map_path.rsplit('/', 1)[-1], load_map(map_path), pairs[::step][:queries]))
+    return boards
+
+
+def solve(name, board, template, start, end):
+    """
+    Build the algorithm for one query and run it
+    :return: (cost or None, nodes expanded)
+    """
+    algorithm, node_type = ALGORITHMS[name]
+    if node_type is None or issubclass(node_type, GridNode):
+        alg = algorithm(start=start, end=end, board=template, node_type=node_type)
+    else:
+        marked = [row[:] for row in board]
+        marked[start[1]][start[0]] = 2
+        marked[end[1]][end[0]] = 3
+        alg = algorithm(board=marked, node_type=node_type)
+    result = alg.solve()
+    return result.cost, result.nodes_expanded
+
+
+def run_hpa_star(board, template, queries):
+    """
+    :return: (setup seconds, [(seconds, cost, nodes expanded)])
+    """
+    start_time = time.perf_counter()
+    hpa = HPAStar(template)
+    setup = time.perf_counter() - start_time
+    runs = []
+    for start, end in queries:
+        start_time = time.perf_counter()
+        _, cost = hpa.solve(start, end)
+        runs.append((time.perf_counter() - start_time, cost, hpa.nodes_expanded))
+    return setup, runs
+
+
+def run_alt(board, template, queries):
+    """
+    A* on the grid with the landmark heuristic, the landmark table is built once per board
+    :return: (setup seconds, [(seconds, cost, nodes expanded)])
+    """
+    start_time = time.perf_counter()
+    cost_model = LandmarkCostModel(LandmarkTable(template))
+    setup = time.perf_counter() - start_time
+    runs = []
+    for start, end in queries:
+        start_time = time.perf_counter()
+        result = AStar(start=start, end=end, board=template, node_type=AGridNode, cost_model=cost_model).solve()
+        runs.append((time.perf_counter() - start_time, result.cost, result.nodes_expanded))
+    return setup, runs
+
+
+def run_distance_field(board, template, queries):
+    """
+    One distance field per query, to its end. Nodes expanded are the cells the field reached.
+    :return: (setup seconds, [(seconds, cost, nodes expanded)])
+    """
+    runs = []
+    for start, end in queries:
+        start_time = time.perf_counter()
+        field = DistanceField(board, goal=end)
+        cost = field.distance(start)
+        seconds = time.perf_counter() - start_time
+        runs.append((seconds, cost if cost < float('inf') else None, int((field.field < float('inf')).sum())))
+    return 0.0, runs
+
+
+# name -> runner(board, template, queries) of the algorithms that are not run query by query through solve
+RUNNERS = {'HPA*': run_hpa_star, 'ALT': run_alt, 'Distance field': run_distance_field}
+
+
+def run_algorithm(name, board, template, queries):
+    """
+    :return: (setup seconds, [(seconds, cost, nodes expanded)])
+    """
+    if name in RUNNERS:
+        return RUNNERS[name](board, template, queries)
+    runs = []
+    for start, end in queries:
+        start_time = time.perf_counter()
+        cost, expanded = solve(name, board, template, start, end)
+        runs.append((time.perf_counter() - start_time, cost, expanded))
+    return 0.0, runs
+
+
+def peak_memory(name, board, template, queries):
+    """
+    Largest tracemalloc peak of a single query, for the algorithms in RUNNERS of their setup and first query
+    (the abstract graph of HPA*, the landmark table of ALT)
+    :return: int bytes
+    """
+    peak = 0
+    tracemalloc.start()
+    try:
+        if name in RUNNERS:
+            RUNNERS[name](board, template, queries[:1])
+            return tracemalloc.get_traced_memory()[1]
+        for start, end in queries:
+            tracemalloc.reset_peak()
+            solve(name, board, template, start, end)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark_board(board, queries, names, repeat):
+    """
+    Time every algorithm on the queries of one board, best of `repeat` runs.
+    Optimality is the worst cost ratio to the reference Dijkstra, on the queries both solved.
+    :return: dict name -> result dict
+    """
+    template = board_template(board)
+    reference = [solve(REFERENCE, board, template, start, end)[0] for start, end in queries]
+    results = {}
+    for name in names:
+        timings = [run_algorithm(name, board, template, queries) for _ in range(repeat)]
+        setup, runs = min(timings, key=lambda timing: timing[0] + sum(run[0] for run in timing[1]))
+        ratios = [cost / expected for (_, cost, _), expected in zip(runs, reference)
+                  if cost is not None and expected]
+        results[name] = {
+            'seconds': sum(run[0] for run in runs),
+            'setup_seconds': setup,
+            'nodes_expanded': sum(run[2] for run in runs),
+            'peak_memory': peak_memory(name, board, template, queries),
+            'optimality': max(ratios) if ratios else 1.0,
+            'missed': sum(1 for (_, cost, _), expected in zip(runs, reference) if (cost is None) != (expected is None)),
+        }
+    return results
+
+
+def run_suite(boards, names, repeat=3, log=None):
+    """
+    :param boards:  list of (name, board, queries)
+    :param names:   Algorithm names (keys of ALGORITHMS)
+    :param log:     (optional) file to print progress to
+    :return: dict ready to be written as JSON
+    """
+    results = {}
+    for board_name, board, queries in boards:
+        for name, result in benchmark_board(board, queries, names, repeat).items():
+            result['queries'] = len(queries)
+            results["{} / {}".format(board_name, name)] = result
+            if log:
+                print("{:<18} {:<22} {:>9.4f}s expanded={:>8} memory={:>9.1f}KB optimality={:.3f}".format(
+                    board_name, name, result['seconds'], result['nodes_expanded'], result['peak_memory'] / 1024,
+                    result['optimality']), file=log)
+    return {'version': RESULTS_VERSION, 'python': platform.python_version(), 'platform': platform.platform(),
+            'results': results}
+
+
+def compare(current, baseline, threshold):
+    """
+    Regressions of current against baseline: time, setup time or nodes expanded grown by more than threshold,
+    worse optimality or queries newly missed. Results missing from either side are skipped, a baseline of another
+    results version is reported instead of compared.
+    :param float threshold:     Allowed relative growth, 0.25 allows 25% slower
+    :return: list of str
+    """
+    if baseline.get('version') != current['version']:
+        return ["baseline has results version {}, not {}: boards differ".format(baseline.get('version'),
+                                                                               current['version'])]
+    regressions = []
+    for key, result in sorted(current['results'].items()):
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        for metric in ['seconds', 'setup_seconds', 'nodes_expanded']:
+            slack = TIME_SLACK if metric != 'nodes_expanded' else 0
+            if result[metric] > old[metric] * (1 + threshold) and result[metric] - old[metric] > slack:
+                regressions.append("{}: {} {:.4g} -> {:.4g} (+{:.0%})".format(
+                    key, metric, old[metric], result[metric], result[metric] / old[metric] - 1 if old[metric] else 1))
+        if result['optimality'] > old['optimality'] + 1e-9:
+            regressions.append("{}: optimality {:.4f} -> {:.4f}".format(key, old['optimality'], result['optimality']))
+        if result['missed'] > old['missed']:
+            regressions.append("{}: missed {} -> {}".format(key, old['missed'], result['missed']))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms")
+    parser.add_argument('--size', type=int, default=64,
+                        help="generated board width/height, 0 with --scenario runs only the scenarios")
+    parser.add_argument('--queries', type=int, default=5, help="queries per board")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement, the fastest is kept")
+    parser.add_argument('--scenario', action='append', default=[], help="Moving AI .scen file, repeatable")
+    parser.add_argument('--algorithm', action='append', choices=sorted(ALGORITHMS), help="default: all")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative regression")
+    options = parser.parse_args(arguments)
+
+    boards = [] if options.scenario and options.size <= 0 else generated_boards(options.size, options.queries,
+                                                                                options.seed)
+    for path in options.scenario:
+        boards += scenario_boards(path, options.queries)
+    results = run_suite(boards, options.algorithm or list(ALGORITHMS), options.repeat, log=sys.stdout)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compare(results, json.load(file), options.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from benchmarks import harness
+
+
+def results(**metrics):
+    result = {'seconds': 1.0, 'setup_seconds': 0.0, 'nodes_expanded': 100, 'peak_memory': 1024, 'optimality': 1.0,
+              'missed': 0, 'queries': 5}
+    result.update(metrics)
+    return {'version': harness.RESULTS_VERSION, 'results': {'random 64 / A*': result}}
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_within_threshold(self):
+        self.assertEqual(harness.compare(results(seconds=1.2, nodes_expanded=125), results(), 0.25), [])
+
+    def test_regressions(self):
+        regressions = harness.compare(results(seconds=1.5, nodes_expanded=126, optimality=1.1, missed=1), results(),
+                                      0.25)
+        self.assertEqual([regression.split(': ')[1].split()[0] for regression in regressions],
+                         ['seconds', 'nodes_expanded', 'optimality', 'missed'])
+
+    def test_time_slack(self):
+        # tiny timings doubling is noise
+        baseline = results(seconds=0.001, setup_seconds=0.001)
+        self.assertEqual(harness.compare(results(seconds=0.002, setup_seconds=0.002), baseline, 0.25), [])
+        self.assertEqual(len(harness.compare(results(seconds=0.01), baseline, 0.25)), 1)
+
+    def test_missing_results_and_versions(self):
+        baseline = results()
+        baseline['results'] = {'other / A*': baseline['results'].pop('random 64 / A*')}
+        self.assertEqual(harness.compare(results(seconds=9), baseline, 0.25), [])
+        baseline['version'] = harness.RESULTS_VERSION - 1
+        self.assertEqual(len(harness.compare(results(), baseline, 0.25)), 1)
+
+
+class TestMain(unittest.TestCase):
+
+    def test_results_round_trip(self):
+        path = os.path.join(tempfile.mkdtemp(), 'results.json')
+        arguments = ['--size', '16', '--queries', '2', '--repeat', '1', '--algorithm', 'A* grid']
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(harness.main(arguments + ['--output', path]), 0)
+                with open(path) as file:
+                    saved = json.load(file)
+                self.assertEqual(saved['version'], harness.RESULTS_VERSION)
+                self.assertTrue(saved['results'])
+                # rerun timings are noise, a slow baseline leaves the deterministic counts to decide
+                for result in saved['results'].values():
+                    result['seconds'] *= 10
+                    result['setup_seconds'] *= 10
+                with open(path, 'w') as file:
+                    json.dump(saved, file)
+                self.assertEqual(harness.main(arguments + ['--baseline', path]), 0)
+                # a baseline that expanded fewer nodes makes the run a regression
+                for result in saved['results'].values():
+                    result['nodes_expanded'] //= 2
+                with open(path, 'w') as file:
+                    json.dump(saved, file)
+                self.assertEqual(harness.main(arguments + ['--baseline', path]), 1)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
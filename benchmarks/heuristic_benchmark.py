@@ -0,0 +1,57 @@
+import random
+import time
+
+from algorithms import AStar, AGridNode, CostModel
+from benchmarks.a_star_benchmark import mark_corners, wall_board
+from maze_generators import random_obstacles, recursive_backtracker
+
+COST_MODELS = [("manhattan (1/2 steps)", CostModel(1, 2, 'manhattan')),
+               ("octile", CostModel()),
+               ("chebyshev", CostModel(heuristic='chebyshev')),
+               ("euclidean", CostModel(heuristic='euclidean')),
+               ("octile eps=1.5", CostModel(epsilon=1.5)),
+               ("octile eps=3", CostModel(epsilon=3))]
+
+
+def terrain_weights(size, seed=0):
+    """
+    Random terrain with weights 1 (road), 2 (grass) and 5 (swamp)
+    :return: [[int]]
+    """
+    rnd = random.Random(seed)
+    return [[rnd.choice([1, 1, 2, 5]) for _ in range(size)] for _ in range(size)]
+
+
+def run(board, cost_model):
+    """
+    :return: (seconds spent searching, SearchResult)
+    """
+    alg = AStar(board=[row[:] for row in board], node_type=AGridNode, cost_model=cost_model)
+    start = time.perf_counter()
+    result = alg.solve()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    size = 300
+    boards = [("open", mark_corners(random_obstacles(size, size, 0.0))),
+              ("random 20%", mark_corners(random_obstacles(size, size, 0.2))),
+              ("random 35%", mark_corners(random_obstacles(size, size, 0.35))),
+              ("wall", wall_board(size)),
+              ("maze", mark_corners(recursive_backtracker(size + 1, size + 1)))]
+    for name, board in boards:
+        print("{} {}x{}".format(name, size, size))
+        for model_name, cost_model in COST_MODELS:
+            seconds, result = run(board, cost_model)
+            cost = "{:.2f}".format(result.cost) if result.path else "-"
+            print("  {:<22} expanded={:>6} cost={:>8} time={:.3f}s".format(model_name, result.nodes_expanded, cost,
+                                                                          seconds))
+
+    weights = terrain_weights(size)
+    print("terrain {}x{}".format(size, size))
+    for model_name, heuristic, epsilon in [("octile", 'octile', 1), ("euclidean", 'euclidean', 1),
+                                           ("octile eps=2", 'octile', 2)]:
+        seconds, result = run(mark_corners(random_obstacles(size, size, 0.1)),
+                              CostModel(heuristic=heuristic, weights=weights, epsilon=epsilon))
+        print("  {:<22} expanded={:>6} cost={:>8.2f} time={:.3f}s".format(model_name, result.nodes_expanded,
+                                                                         result.cost, seconds))
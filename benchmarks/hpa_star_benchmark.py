@@ -0,0 +1,53 @@
+import random
+import time
+
+from algorithms import AStar, AGridNode
+from algorithms.batch import board_template, solve_query
+from algorithms.hpa_star import HPAStar
+from benchmarks.a_star_benchmark import mark_corners
+from maze_generators import random_obstacles, recursive_backtracker
+
+
+def long_queries(grid, count, seed=0):
+    """
+    Random queries between free cells in opposite quarters of the board
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    quarter_x, quarter_y = grid.len_x // 4, grid.len_y // 4
+
+    def free(min_x, min_y):
+        while True:
+            x, y = rnd.randrange(min_x, min_x + quarter_x), rnd.randrange(min_y, min_y + quarter_y)
+            if grid.traversable[grid.index(x, y)]:
+                return x, y
+
+    return [(free(0, 0), free(grid.len_x - quarter_x, grid.len_y - quarter_y)) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    for name, board in [("random 20%", mark_corners(random_obstacles(512, 512, 0.2))),
+                        ("random 35%", mark_corners(random_obstacles(512, 512, 0.35))),
+                        ("maze", mark_corners(recursive_backtracker(257, 257)))]:
+        grid = board_template(board)
+        queries = long_queries(grid, 10)
+        start = time.perf_counter()
+        expected = [solve_query(grid, *query, AStar, AGridNode)[1] for query in queries]
+        a_star_seconds = (time.perf_counter() - start) / len(queries)
+
+        for cluster_size in [8, 16, 32]:
+            start = time.perf_counter()
+            hpa = HPAStar(grid, cluster_size)
+            build_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            results = [hpa.solve(*query) for query in queries]
+            hpa_seconds = (time.perf_counter() - start) / len(queries)
+            ratios = [cost / optimal for (_, cost), optimal in zip(results, expected) if optimal]
+            start = time.perf_counter()
+            hpa.add_obstacle(grid.len_x // 2, grid.len_y // 2)
+            edit_seconds = time.perf_counter() - start
+            print("{:<10} {}x{} cluster={:<2} build={:.2f}s edit={:.4f}s query={:.4f}s (AStar {:.3f}s, {:.0f}x) "
+                  "cost/optimal mean={:.3f} max={:.3f}".format(name, grid.len_x, grid.len_y, cluster_size,
+                                                               build_seconds, edit_seconds, hpa_seconds,
+                                                               a_star_seconds, a_star_seconds / hpa_seconds,
+                                                               sum(ratios) / len(ratios), max(ratios)))
@@ -0,0 +1,31 @@
+import time
+
+from algorithms import AStar, JumpPointSearch
+from benchmarks.a_star_benchmark import mark_corners
+from maze_generators import random_obstacles, recursive_backtracker
+
+
+def time_solve(algorithm, board):
+    """
+    :return: (seconds spent searching, SearchResult)
+    """
+    alg = algorithm(board=board)
+    start = time.perf_counter()
+    result = alg.solve()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    boards = [("open", lambda size: mark_corners(random_obstacles(size, size, 0.0))),
+              ("random 10%", lambda size: mark_corners(random_obstacles(size, size, 0.1))),
+              ("random 30%", lambda size: mark_corners(random_obstacles(size, size, 0.3))),
+              ("maze", lambda size: mark_corners(recursive_backtracker(size + 1, size + 1)))]
+    for name, make_board in boards:
+        for size in [100, 400]:
+            board = make_board(size)
+            line = "{:<10} {:>3}x{:<3}".format(name, size, size)
+            for algorithm in [AStar, JumpPointSearch]:
+                seconds, result = time_solve(algorithm, [row[:] for row in board])
+                line += "  {} expanded={:>6} cost={} time={:.3f}s".format(algorithm.__name__, result.nodes_expanded,
+                                                                         result.cost, seconds)
+            print(line)
@@ -0,0 +1,49 @@
+import random
+import time
+
+from algorithms import AStar, AGridNode
+from algorithms.batch import board_template
+from algorithms.landmarks import LandmarkTable, LandmarkCostModel
+from benchmarks.harness import reachable_queries
+from maze_generators import recursive_backtracker, prim_maze, rooms_and_corridors, caves
+
+
+def run_queries(grid, queries, cost_model=None):
+    """
+    :return: (nodes expanded, seconds)
+    """
+    expanded = 0
+    start = time.perf_counter()
+    for query_start, query_end in queries:
+        expanded += AStar(start=query_start, end=query_end, board=grid, node_type=AGridNode,
+                          cost_model=cost_model).solve().nodes_expanded
+    return expanded, time.perf_counter() - start
+
+
+def random_queries(grid, count, seed=0):
+    """
+    Random pairs of free cells
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    free = [divmod(index, grid.len_x)[::-1] for index in range(grid.len_x * grid.len_y) if grid.traversable[index]]
+    return [(rnd.choice(free), rnd.choice(free)) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    size = 257
+    for name, board in [("prim maze", prim_maze(size, size)), ("backtracker maze", recursive_backtracker(size, size)),
+                        ("rooms", rooms_and_corridors(size, size)), ("caves", caves(size, size))]:
+        grid = board_template(board)
+        queries = random_queries(grid, 10) if 'maze' in name else reachable_queries(board, 10)
+        expanded, seconds = run_queries(grid, queries)
+        print("{} {}x{} octile A*: expanded={} time={:.2f}s".format(name, size, size, expanded, seconds))
+        for count in [4, 8, 16]:
+            start = time.perf_counter()
+            table = LandmarkTable(grid, count)
+            build_seconds = time.perf_counter() - start
+            alt_expanded, alt_seconds = run_queries(grid, queries, LandmarkCostModel(table))
+            print("  {:>2} landmarks build={:.2f}s tables={:.0f}KB ({}) expanded={:>7} ({:.1f}x fewer) "
+                  "time={:.2f}s".format(count, build_seconds, table.memory_size() / 1024,
+                                        'uint16' if table.typecode == 'H' else 'uint32', alt_expanded,
+                                        expanded / alt_expanded, alt_seconds))
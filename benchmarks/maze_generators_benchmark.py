@@ -0,0 +1,28 @@
+import time
+
+from maze_generators.generators import random_obstacles, recursive_backtracker, prim_maze, caves, rooms_and_corridors
+
+GENERATORS = [
+    ('random 30%', lambda size: random_obstacles(size, size, 0.3)),
+    ('caves', lambda size: caves(size, size)),
+    ('rooms and corridors', lambda size: rooms_and_corridors(size, size)),
+    ('prim maze', lambda size: prim_maze(size, size)),
+    ('recursive backtracker', lambda size: recursive_backtracker(size, size)),
+]
+
+
+def time_generator(generate, size):
+    """
+    :return: (seconds, share of free cells)
+    """
+    start = time.perf_counter()
+    board = generate(size)
+    seconds = time.perf_counter() - start
+    return seconds, sum(row.count(0) for row in board) / (size * size)
+
+
+if __name__ == "__main__":
+    for size in [256, 1024, 4096]:
+        for name, generate in GENERATORS:
+            seconds, free = time_generator(generate, size)
+            print("{:>4}x{:<4} {:<22} {:>8.3f}s free={:.0%}".format(size, size, name, seconds, free))
@@ -0,0 +1,50 @@
+import os
+
+# Moving AI grid map terrain, '.' ground, 'G' ground, 'S' swamp are passable for ground units
+PASSABLE = set('.GS')
+
+
+def load_map(path):
+    """
+    Read a Moving AI .map file (header "type octile", "height", "width", "map", then one line per row)
+    :param str path:    Map file
+    :return: [[int]] board without start/end marks
+    """
+    with open(path) as file:
+        lines = file.read().splitlines()
+    header = {}
+    for position, line in enumerate(lines):
+        if line.strip() == 'map':
+            rows = lines[position + 1:position + 1 + int(header['height'])]
+            break
+        key, _, value = line.partition(' ')
+        header[key] = value.strip()
+    else:
+        raise ValueError("{} is not a Moving AI map".format(path))
+    width = int(header['width'])
+    if len(rows) != int(header['height']) or any(len(row) < width for row in rows):
+        raise ValueError("{} is truncated".format(path))
+    return [[0 if cell in PASSABLE else 1 for cell in row[:width]] for row in rows]
+
+
+def load_scenarios(path):
+    """
+    Read a Moving AI .scen file, "version 1" followed by tab separated
+    bucket, map, width, height, start x, start y, goal x, goal y, optimal length lines
+    :param str path:    Scenario file
+    :return: list of (map path, (x, y), (x, y), float), map paths are resolved next to the scenario file
+    """
+    scenarios = []
+    directory = os.path.dirname(os.path.abspath(path))
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == 'version':
+                continue
+            map_path = os.path.join(directory, fields[1])
+            if not os.path.exists(map_path):
+                map_path = os.path.join(directory, os.path.basename(fields[1]))
+            start = (int(fields[4]), int(fields[5]))
+            end = (int(fields[6]), int(fields[7]))
+            scenarios.append((map_path, start, end, float(fields[8])))
+    return scenarios
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from benchmarks.moving_ai import load_map, load_scenarios
+
+MAP = """type octile
+height 3
+width 4
+map
+..@.
+.T.G
+S..W
+"""
+
+SCENARIOS = """version 1
+0\tsmall.map\t4\t3\t0\t0\t3\t1\t3.41421356
+1\tmaps/small.map\t4\t3\t0\t2\t2\t0\t2.82842712
+"""
+
+
+class TestMovingAI(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.map_path = self.write('small.map', MAP)
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def test_load_map(self):
+        self.assertEqual(load_map(self.map_path), [[0, 0, 1, 0],
+                                                   [0, 1, 0, 0],
+                                                   [0, 0, 0, 1]])
+
+    def test_truncated_map(self):
+        path = self.write('truncated.map', MAP[:-len("S..W\n")])
+        with self.assertRaises(ValueError):
+            load_map(path)
+        path = self.write('short_row.map', MAP.replace("S..W", "S."))
+        with self.assertRaises(ValueError):
+            load_map(path)
+
+    def test_not_a_map(self):
+        with self.assertRaises(ValueError):
+            load_map(self.write('header.map', "type octile\nheight 3\nwidth 4\n"))
+
+    def test_load_scenarios(self):
+        path = self.write('small.map.scen', SCENARIOS)
+        # map paths resolve next to the scenario file, by base name when the directory is missing
+        self.assertEqual(load_scenarios(path), [(self.map_path, (0, 0), (3, 1), 3.41421356),
+                                                (self.map_path, (0, 2), (2, 0), 2.82842712)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import time
+import tracemalloc
+
+from algorithms import AStar
+from algorithms.a_star import ANode
+
+SIZE = 2000
+NEIGHBOUR_QUERIES = 200000
+
+
+class DictNode(object):
+    """
+    ANode as it was before __slots__, for comparison
+    """
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.traversable = True
+        self.parent = None
+        self.neighbours = None
+        self.g_cost = 0
+        self.h_cost = None
+        self.open_order = None
+
+
+def list_based_neighbours(alg, node):
+    """
+    _set_node_neighbours as it was before the neighbour offset table, for comparison
+    """
+    all_neighbours = [alg.BOARD[node.y + y][node.x + x] for x in reversed(range(-1, 2)) for y in
+                      reversed(range(-1, 2))
+                      if 0 <= node.x + x < alg.len_x and 0 <= node.y + y < alg.len_y]
+    non_traversable_neighbours = []
+    for neighbour in all_neighbours:
+        if not neighbour.traversable:
+            non_traversable_neighbours.append(neighbour)
+        elif neighbour.x != node.x and neighbour.y != node.y:
+            x_diff = neighbour.x - node.x
+            y_diff = neighbour.y - node.y
+            if not alg.BOARD[node.y + y_diff][node.x].traversable and \
+                    not alg.BOARD[node.y][node.x + x_diff].traversable:
+                non_traversable_neighbours.append(neighbour)
+    node.neighbours = [neighbour for neighbour in all_neighbours if neighbour not in non_traversable_neighbours]
+
+
+def build(node_type):
+    """
+    Build a SIZE x SIZE board with 30% obstacles
+    :return: (AStar, bytes per node)
+    """
+    tracemalloc.start()
+    alg = AStar(SIZE, SIZE, start=(0, 0), end=(SIZE - 1, SIZE - 1), node_type=node_type)
+    per_node = tracemalloc.get_traced_memory()[0] / (SIZE * SIZE)
+    tracemalloc.stop()
+    rnd = random.Random(0)
+    for row in alg.BOARD:
+        for node in row:
+            if rnd.random() < 0.3:
+                node.traversable = False
+    return alg, per_node
+
+
+def neighbour_throughput(alg, set_neighbours):
+    """
+    Neighbour generations per second over random nodes
+    :return: float
+    """
+    rnd = random.Random(1)
+    nodes = [alg.BOARD[rnd.randrange(SIZE)][rnd.randrange(SIZE)] for _ in range(NEIGHBOUR_QUERIES)]
+    start = time.perf_counter()
+    for node in nodes:
+        set_neighbours(node)
+    return NEIGHBOUR_QUERIES / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    alg, per_node = build(DictNode)
+    rate = neighbour_throughput(alg, lambda node: list_based_neighbours(alg, node))
+    print("dict + lists     {}x{} memory={:.0f} B/node neighbours={:.0f}/s".format(SIZE, SIZE, per_node, rate))
+    del alg
+
+    alg, per_node = build(ANode)
+    rate = neighbour_throughput(alg, alg._set_node_neighbours)
+    print("slots + offsets  {}x{} memory={:.0f} B/node neighbours={:.0f}/s".format(SIZE, SIZE, per_node, rate))
@@ -0,0 +1,57 @@
+import json
+import sys
+import time
+
+from algorithms import AStar, AGridNode
+from algorithms.batch import board_template
+from algorithms.paths import as_pairs, waypoints, string_pull
+from benchmarks.harness import reachable_queries
+from maze_generators import random_obstacles, rooms_and_corridors
+
+
+def node_list_size(path):
+    """
+    Bytes held by a list of nodes (GridNode views and their index ints)
+    :return: int
+    """
+    return sys.getsizeof(path) + sum(sys.getsizeof(node) + sys.getsizeof(node.index) for node in path)
+
+
+def downstream(paths):
+    """
+    What an agent does with a path: read its points and send them on as JSON
+    :return: seconds
+    """
+    start = time.perf_counter()
+    for path in paths:
+        json.dumps([[x, y] for x, y in path])
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    size = 512
+    boards = [("empty", [bytearray(size) for _ in range(size)]),
+              ("random 5%", random_obstacles(size, size, 0.05)),
+              ("random 20%", random_obstacles(size, size, 0.2)),
+              ("rooms", rooms_and_corridors(size, size))]
+    for name, board in boards:
+        grid = board_template(board)
+        nodes, arrays = [], []
+        for start, end in reachable_queries(board, 5):
+            alg = AStar(start=start, end=end, board=grid, node_type=AGridNode)
+            nodes.append(list(reversed(alg.solve().path)))
+            arrays.append(alg.path_array())
+        cells = [[(node.x, node.y) for node in path] for path in nodes]
+        print("{} {}x{}, {} paths of {:.0f} cells on average".format(name, size, size, len(nodes),
+                                                                      sum(map(len, nodes)) / len(nodes)))
+        print("  nodes      {:>8.0f} KB, downstream {:.1f}ms".format(sum(map(node_list_size, nodes)) / 1024,
+                                                                     downstream(cells) * 1e3))
+        for label, process in [("array", None), ("waypoints", waypoints), ("smoothed", string_pull)]:
+            start = time.perf_counter()
+            outputs = [process(grid, path) if process is string_pull else process(path) if process else path
+                       for path in arrays]
+            seconds = time.perf_counter() - start
+            size_bytes = sum(len(output) * output.itemsize for output in outputs)
+            print("  {:<10} {:>8.1f} KB, {:>6.0f} points, downstream {:.2f}ms, post-processing {:.1f}ms".format(
+                label, size_bytes / 1024, sum(len(output) // 2 for output in outputs) / len(outputs),
+                downstream([as_pairs(output) for output in outputs]) * 1e3, seconds * 1e3))
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import random
+import time
+
+from algorithms.server import PathServer, PathClient
+from maze_generators import random_obstacles, rooms_and_corridors
+
+
+def queries(board, count, distinct, seed=0):
+    """
+    Random queries between free cells, drawn from `distinct` different ones so some repeat
+    :return: list of ((x, y), (x, y))
+    """
+    rnd = random.Random(seed)
+    free = [(x, y) for y, row in enumerate(board) for x, cell in enumerate(row) if not cell]
+    pool = [(rnd.choice(free), rnd.choice(free)) for _ in range(distinct)]
+    return [rnd.choice(pool) for _ in range(count)]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load(client, board, queries, concurrency, deadline=None):
+    """
+    Send the queries with at most `concurrency` in flight
+    :return: (latencies in seconds, {status: count}, seconds)
+    """
+    latencies, statuses = [], {}
+    pending = iter(queries)
+
+    async def worker():
+        for start, end in pending:
+            began = time.perf_counter()
+            response = await client.find_path(board, start, end, deadline)
+            latencies.append(time.perf_counter() - began)
+            statuses[response['status']] = statuses.get(response['status'], 0) + 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, statuses, time.perf_counter() - began
+
+
+async def main(options):
+    boards = {'random': random_obstacles(options.size, options.size, 0.3, options.seed),
+              'rooms': rooms_and_corridors(options.size, options.size, seed=options.seed)}
+    server = listener = None
+    if options.unix:
+        client = await PathClient.connect_unix(options.unix)
+    elif options.port:
+        client = await PathClient.connect_tcp(options.host, options.port)
+    else:
+        # no server given, serve the generated boards in this process
+        server = PathServer(boards, options.workers)
+        listener = await server.start_tcp()
+        client = await PathClient.connect_tcp(*listener.sockets[0].getsockname()[:2])
+    try:
+        for name in options.board or sorted(boards):
+            load = queries(boards[name], options.queries, options.distinct, options.seed)
+            latencies, statuses, seconds = await run_load(client, name, load, options.concurrency, options.deadline)
+            print("{:<7} {} queries, concurrency {}: p50={:.2f}ms p99={:.2f}ms throughput={:.0f} queries/s {}".format(
+                name, len(load), options.concurrency, percentile(latencies, 0.5) * 1e3,
+                percentile(latencies, 0.99) * 1e3, len(load) / seconds,
+                " ".join("{}={}".format(status, count) for status, count in sorted(statuses.items()))))
+        print("server stats:", await client.stats())
+    finally:
+        await client.close()
+        if server is not None:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a path query server")
+    parser.add_argument('--unix', help="socket of a running server, which must serve the generated boards")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="TCP port of a running server")
+    parser.add_argument('--workers', type=int, help="worker processes of the in-process server")
+    parser.add_argument('--board', action='append', choices=['random', 'rooms'], help="default: both")
+    parser.add_argument('--size', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--distinct', type=int, default=200, help="different queries, fewer means more coalescing")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--deadline', type=float, help="seconds per query")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,28 @@
+import time
+
+from algorithms import AStar, Dijkstra, AGridNode, DijkstraGridNode
+from algorithms.a_star import ANode
+from algorithms.dijkstra import DijkstraNode
+from benchmarks.a_star_benchmark import wall_board, time_search
+
+
+def time_solve(algorithm, board, node_type):
+    """
+    Run algorithm with solve()
+    :return: (seconds, nodes expanded)
+    """
+    alg = algorithm(board=board, node_type=node_type)
+    start = time.perf_counter()
+    result = alg.solve()
+    return time.perf_counter() - start, result.nodes_expanded
+
+
+if __name__ == "__main__":
+    for algorithm, node_types in [(AStar, [ANode, AGridNode]), (Dijkstra, [DijkstraNode, DijkstraGridNode])]:
+        for node_type in node_types:
+            for size in [100, 400]:
+                step_seconds, _ = time_search(lambda board: algorithm(board=board, node_type=node_type),
+                                              wall_board(size))
+                solve_seconds, expanded = time_solve(algorithm, wall_board(size), node_type)
+                print("{:<8} {:<16} wall {:>3}x{:<3} expanded={:>6} step={:.3f}s solve={:.3f}s".format(
+                    algorithm.__name__, node_type.__name__, size, size, expanded, step_seconds, solve_seconds))
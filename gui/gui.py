@@ -1,7 +1,11 @@
+import time
+from math import inf
+
 import pygame
 from algorithms import AStar, Dijkstra
 
-pygame.init()
+# only the font module at import, the display is initialised when the gui runs
+pygame.font.init()
 
 DARK_RED = (139, 0, 0)
 MEDIUM_BLUE = (0, 0, 205)
@@ -24,6 +28,8 @@ BUTTON_MARGIN = 5
 
 FONT = pygame.font.SysFont("comicsansms", int(min([WIDTH, HEIGHT]) / 50))
 TEXT_ON_NODES = True
+# seconds of search per frame, the rest of a 60 fps frame is left for drawing
+STEP_BUDGET = 1 / 120
 RUNNING = True
 
 
@@ -32,55 +38,116 @@ class Board:
     moving_pos = [None, None]
     moving_node = False
 
-    def __init__(self, screen, alg=AStar()):
-        self.alg = alg
-        self.board_size = (len(self.alg.board_array[0]), len(self.alg.board_array))
+    def __init__(self, screen, alg=AStar(), step_budget=STEP_BUDGET):
+        self.step_budget = step_budget
+        self.board_size = (len(alg.board_array[0]), len(alg.board_array))
         self.size = ((WIDTH - self.board_size[0] * NODE_MARGIN) // self.board_size[0],
                      (BOARD_HEIGHT - self.board_size[1] * NODE_MARGIN) // self.board_size[1])
         self.start_node = (0, 0)
-        self.end_node = (board_size[0] - 1, board_size[1] - 1)
+        self.end_node = (self.board_size[0] - 1, self.board_size[1] - 1)
         self.screen = screen
-
+        # rendered text surfaces by string, cleared when the font changes
+        self.text_surfaces = {}
+        self.set_algorithm(alg)
+
+    def set_algorithm(self, alg):
+        """
+        Show a new algorithm instance, its search is stepped through iter_search events
+        :return: None
+        """
+        self.alg = alg
+        self.search = alg.iter_search()
         self.update_all()
 
     def draw_node(self, x, y, color):
+        """
+        Draw one cell without updating the display
+        :return: list of changed rects
+        """
         if color == WHITE:
             if x % 2 == 0 and y % 2 == 0:
                 color = WHITE_SMOKE
 
-        node_rect = pygame.draw.rect(screen, color, [(NODE_MARGIN + self.size[0]) * x + NODE_MARGIN,
-                                                     (NODE_MARGIN + self.size[1]) * y + NODE_MARGIN + BOARD_MARGIN,
-                                                     self.size[0],
-                                                     self.size[1]])
+        node_rect = pygame.draw.rect(self.screen, color, [(NODE_MARGIN + self.size[0]) * x + NODE_MARGIN,
+                                                          (NODE_MARGIN + self.size[1]) * y + NODE_MARGIN + BOARD_MARGIN,
+                                                          self.size[0],
+                                                          self.size[1]])
 
         if TEXT_ON_NODES:
             node_text_rect = self._get_node_text(x, y, color, node_rect)
-            pygame.display.update([node_rect, node_text_rect])
-        else:
-            pygame.display.update(node_rect)
+            if node_text_rect:
+                return [node_rect, node_text_rect]
+        return [node_rect]
+
+    def _node_color(self, x, y):
+        if self.alg.BOARD[y][x] == self.alg.start_node:
+            return GOLD
+        if self.alg.BOARD[y][x] == self.alg.end_node:
+            return ORANGE
+        return COLORS[self.alg.board_array[y][x]]
+
+    def _node_text(self, x, y, color):
+        if color in [FOREST_GREEN, DARK_RED, MEDIUM_BLUE]:
+            return str(self.alg.BOARD[y][x])
+        if color is GOLD:
+            return "START"
+        if color is ORANGE:
+            return "END"
+        return None
+
+    def render(self):
+        """
+        Redraw the cells marked dirty whose color or text changed since they were drawn,
+        with one display update for the whole frame
+        :return: None
+        """
+        rects = []
+        for x, y in self.dirty:
+            color = self._node_color(x, y)
+            look = (color, self._node_text(x, y, color) if TEXT_ON_NODES else None)
+            if self.drawn[y][x] != look:
+                self.drawn[y][x] = look
+                rects += self.draw_node(x, y, color)
+        self.dirty.clear()
+        if rects:
+            pygame.display.update(rects)
 
     def update_all(self):
-        for y in range(len(self.alg.board_array)):
-            for x in range(len(self.alg.board_array[0])):
-                if self.alg.BOARD[y][x] not in [self.alg.start_node, self.alg.end_node]:
-                    color = COLORS[self.alg.board_array[y][x]]
-                    self.draw_node(x, y, color)
-                elif self.alg.BOARD[y][x] == self.alg.start_node:
-                    self.draw_node(x, y, GOLD)
-                else:
-                    self.draw_node(x, y, ORANGE)
+        """
+        Redraw every cell, after the screen was cleared or the algorithm replaced
+        :return: None
+        """
+        self.drawn = [[None] * self.board_size[0] for _ in range(self.board_size[1])]
+        self.dirty = {(x, y) for y in range(self.board_size[1]) for x in range(self.board_size[0])}
+        self.render()
+
+    def step(self, budget=None):
+        """
+        Run algorithm loops until the time budget is spent (at least one), marking the cells they changed dirty.
+        Search speed no longer depends on the frame rate, an inf budget skips to the result.
+        :param float budget:    (optional) Seconds to search, step_budget by default
+        :return: None
+        """
+        deadline = time.perf_counter() + (self.step_budget if budget is None else budget)
+        for events in self.search:
+            for event in events:
+                self.dirty.add((event.x, event.y))
+                if event.kind == 'path':
+                    self.dirty.update(event.value)
+            if time.perf_counter() >= deadline:
+                break
 
     def add_obstacle(self, pos):
         x, y = self._convert_mouse_pos_to_cords(pos)
         if self.alg.BOARD[y][x] not in [self.alg.start_node, self.alg.end_node]:
             self.alg.add_obstacle(x, y)
-            self.update_all()
+            self.dirty.add((x, y))
 
     def remove_obstacle(self, pos):
         x, y = self._convert_mouse_pos_to_cords(pos)
         if self.alg.BOARD[y][x] not in [self.alg.start_node, self.alg.end_node]:
             self.alg.remove_obstacle(x, y)
-            self.draw_node(x, y, WHITE)
+            self.dirty.add((x, y))
 
     def move_start_or_end_node(self, from_pos, to_pos):
         old_x, old_y = self._convert_mouse_pos_to_cords(from_pos)
@@ -89,25 +156,19 @@ class Board:
         self.alg.move_node(new_x, new_y, old_node)
 
     def _get_node_text(self, x, y, color, node_rect):
-        node_text_rect = None
-        if color in [FOREST_GREEN, DARK_RED, MEDIUM_BLUE]:
-            # node_text = f"{self.alg.BOARD[y][x].g_cost}, {self.alg.BOARD[y][x].h_cost}"
-            node_text = str(self.alg.BOARD[y][x])
-            text_surface = FONT.render(node_text, True, BLACK)
-            node_text_rect = screen.blit(text_surface,
-                                         (node_rect.centerx - text_surface.get_width() // 2,
-                                          node_rect.centery - text_surface.get_height() // 2))
-
-        elif color is GOLD:
-            text_surface = FONT.render("START", True, BLACK)
-            node_text_rect = screen.blit(text_surface,
-                                         (node_rect.centerx - text_surface.get_width() // 2,
-                                          node_rect.centery - text_surface.get_height() // 2))
-        elif color is ORANGE:
-            text_surface = FONT.render("END", True, BLACK)
-            node_text_rect = screen.blit(text_surface,
-                                         (node_rect.centerx - text_surface.get_width() // 2,
-                                          node_rect.centery - text_surface.get_height() // 2))
+        node_text = self._node_text(x, y, color)
+        if node_text is None:
+            return None
+        text_surface = self.text_surfaces.get(node_text)
+        if text_surface is None:
+            text_surface = self.text_surfaces[node_text] = FONT.render(node_text, True, BLACK)
+        # text is clipped to its cell, so cells can be redrawn in any order
+        clip = self.screen.get_clip()
+        self.screen.set_clip(node_rect)
+        node_text_rect = self.screen.blit(text_surface,
+                                          (node_rect.centerx - text_surface.get_width() // 2,
+                                           node_rect.centery - text_surface.get_height() // 2))
+        self.screen.set_clip(clip)
         return node_text_rect
 
     def _convert_mouse_pos_to_cords(self, pos):
@@ -121,7 +182,11 @@ class Board:
                 if event.key == pygame.K_SPACE:
                     self.start_algorithm = True
                     if self.alg.path_found:
-                        self.alg = Algorithm(board=self.alg.board_array)
+                        self.set_algorithm(type(self.alg)(board=self.alg.board_array))
+                elif event.key == pygame.K_s:
+                    # skip to result
+                    self.start_algorithm = True
+                    self.step(inf)
 
         mouse_pos = pygame.mouse.get_pos()
         mouse_click = pygame.mouse.get_pressed()
@@ -138,15 +203,15 @@ class Board:
             elif self.moving_node:
                 self.moving_pos[1] = mouse_pos
                 if self.alg.path_found:
-                    self.alg = Algorithm(board=self.alg.board_array)
+                    self.alg = type(self.alg)(board=self.alg.board_array)
                 self.move_start_or_end_node(self.moving_pos[0], self.moving_pos[1])
                 self.moving_pos = [None, None]
                 self.moving_node = False
-                self.update_all()
+                self.set_algorithm(self.alg)
 
         if self.start_algorithm and not self.alg.path_found:
-            self.alg.algorithm_loop()
-            self.update_all()
+            self.step()
+        self.render()
 
     def _reset(self):
         pass
@@ -181,6 +246,7 @@ def resize(event, board):
     BOARD_HEIGHT = int(0.95 * HEIGHT)
     BOARD_MARGIN = HEIGHT - BOARD_HEIGHT
     FONT = pygame.font.SysFont("comicsansms", int(min([WIDTH, HEIGHT]) / 50))
+    board.text_surfaces.clear()
 
     board.size = (
         (WIDTH - board.board_size[0] * NODE_MARGIN) // board.board_size[0],
@@ -188,13 +254,14 @@ def resize(event, board):
             1])
     board.screen = pygame.display.set_mode(event.dict['size'], pygame.RESIZABLE)
 
-    screen_bkg = screen.fill(BLACK)
+    screen_bkg = board.screen.fill(BLACK)
     pygame.display.update(screen_bkg)
 
     board.update_all()
 
 
 if __name__ == "__main__":
+    pygame.init()
     screen = pygame.display.set_mode([WIDTH, HEIGHT], pygame.RESIZABLE)
     pygame.display.set_caption("AStart Algorithm")
     screen_bkg = screen.fill(BLACK)
@@ -0,0 +1,59 @@
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from algorithms import AStar, Dijkstra
+from gui import gui
+
+
+class TestBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = pygame.display.set_mode([gui.WIDTH, gui.HEIGHT])
+
+    def tearDown(self):
+        # an initialised display breaks processes forked later, e.g. by batch.find_paths
+        pygame.display.quit()
+
+    def test_incremental_render_matches_full_redraw(self):
+        board = [[0 for _ in range(12)] for _ in range(12)]
+        for y in range(10):
+            board[y][6] = 1
+        board[0][0] = 2
+        board[11][11] = 3
+        for algorithm in [AStar, Dijkstra]:
+            view = gui.Board(self.screen, algorithm(board=[row[:] for row in board]))
+            while not view.alg.alg_end:
+                view.step()
+                view.render()
+            incremental = pygame.image.tobytes(self.screen, 'RGB')
+            view.update_all()
+            self.assertEqual(incremental, pygame.image.tobytes(self.screen, 'RGB'))
+
+    def test_render_skips_unchanged_cells(self):
+        view = gui.Board(self.screen, AStar(5, 5, start=(0, 0), end=(4, 4)))
+        drawn = []
+        view.draw_node = lambda x, y, color: drawn.append((x, y)) or []
+        view.dirty.update([(1, 1), (2, 2)])
+        view.render()
+        self.assertEqual(drawn, [])
+        view.alg.add_obstacle(1, 1)
+        view.dirty.add((1, 1))
+        view.render()
+        self.assertEqual(drawn, [(1, 1)])
+
+    def test_step_budget(self):
+        view = gui.Board(self.screen, Dijkstra(20, 20, start=(0, 0), end=(19, 19)))
+        view.step(0)
+        self.assertEqual(len(view.alg.closed_nodes), 1)
+        view.step(float('inf'))
+        self.assertTrue(view.alg.alg_end)
+        view.render()
+        self.assertEqual(view.drawn[10][10][0], gui.MEDIUM_BLUE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1 @@
+from .generators import random_obstacles, recursive_backtracker, prim_maze, caves, rooms_and_corridors
@@ -0,0 +1,322 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# boards are lists of bytearray rows in board_array encoding, 0 free and 1 obstacle, without start/end marks.
+# Rows can be indexed like [[int]] boards and passed to Grid.from_board or write_board as they are.
+
+
+def _rows(cells, width):
+    """
+    :param cells:   Flat bytes-like board
+    :return: [bytearray]
+    """
+    cells = bytearray(cells)
+    return [cells[position:position + width] for position in range(0, len(cells), width)]
+
+
+def _require_numpy(name):
+    if np is None:
+        raise ImportError("{} requires numpy".format(name))
+
+
+def random_obstacles(width, height, density, seed=0):
+    """
+    Random obstacle field, every cell is an obstacle with chance density (in steps of 1/256)
+    :param int width:   Board width
+    :param int height:  Board height
+    :param float density:   Chance of a cell being an obstacle
+    :param int seed:    Random seed
+    :return: [bytearray]
+    """
+    if not 0 <= density <= 1:
+        raise ValueError("density must be between 0 and 1")
+    threshold = round(density * 256)
+    table = bytes(1 if value < threshold else 0 for value in range(256))
+    return _rows(random.Random(seed).randbytes(width * height).translate(table), width)
+
+
+def recursive_backtracker(width, height, seed=0):
+    """
+    Perfect maze by randomized depth-first search, long winding corridors with few branches.
+    Passages are on even coordinates, even widths/heights leave the last column/row as wall.
+    The search is sequential pure Python, about 3 seconds per million maze cells (a 4095x4095 board has 4 million),
+    use prim_maze for large boards.
+    :param int width:   Board width
+    :param int height:  Board height
+    :param int seed:    Random seed
+    :return: [bytearray]
+    """
+    rnd = random.Random(seed)
+    cells_x, cells_y = (width + 1) // 2, (height + 1) // 2
+    padded_x = cells_x + 2
+    # maze cells surrounded by a visited border, so moves need no bounds checks
+    visited = bytearray(b'\x01') * (padded_x * (cells_y + 2))
+    for y in range(1, cells_y + 1):
+        visited[y * padded_x + 1:y * padded_x + 1 + cells_x] = bytes(cells_x)
+    board = bytearray(b'\x01') * (width * height)
+    # (step in visited, step to the wall in board)
+    moves = [(1, 1), (-1, -1), (padded_x, width), (-padded_x, -width)]
+    start = padded_x + 1
+    visited[start] = 1
+    board[0] = 0
+    stack = [(start, 0)]
+    random_ = rnd.random
+    while stack:
+        cell, position = stack[-1]
+        options = [move for move in moves if not visited[cell + move[0]]]
+        if not options:
+            stack.pop()
+            continue
+        step, wall = options[int(random_() * len(options))]
+        cell += step
+        visited[cell] = 1
+        board[position + wall] = 0
+        position += 2 * wall
+        board[position] = 0
+        stack.append((cell, position))
+    return _rows(board, width)
+
+
+def _roots(parent):
+    """
+    Follow parent links until every node points at the root of its tree
+    :param parent:  numpy array of node -> parent node, roots point at themselves
+    :return: (numpy array of node -> component, roots numbered in order, number of components)
+    """
+    while True:
+        jumped = parent[parent]
+        if (jumped == parent).all():
+            break
+        parent = jumped
+    roots = parent == np.arange(len(parent), dtype=parent.dtype)
+    return (np.cumsum(roots, dtype=np.int32) - 1)[parent], int(roots.sum())
+
+
+def prim_maze(width, height, seed=0):
+    """
+    Perfect maze with the short dead ends of randomized Prim, the minimum spanning tree of the maze cells under
+    random wall weights. The tree is built with vectorized Boruvka rounds, which give the same tree as Prim. The first
+    round works on the board layout, and the dearest wall around every 2x2 block of cells is dropped before the
+    others as it closes a cycle.
+    Passages are on even coordinates, even widths/heights leave the last column/row as wall. Requires numpy.
+    :param int width:   Board width
+    :param int height:  Board height
+    :param int seed:    Random seed
+    :return: [bytearray]
+    """
+    _require_numpy('prim_maze')
+    rng = np.random.default_rng(seed)
+    cells_x, cells_y = (width + 1) // 2, (height + 1) // 2
+    count = cells_x * cells_y
+    # walls between horizontal, then vertical neighbours
+    horizontal = cells_y * (cells_x - 1)
+    walls = horizontal + (cells_y - 1) * cells_x
+    bits = max(1, walls.bit_length())
+    # unique random weights, the low bits hold the wall
+    keys = (rng.integers(0, 1 << (62 - bits), walls, dtype=np.int64) << bits) | np.arange(walls, dtype=np.int64)
+    west_east = keys[:horizontal].reshape(cells_y, cells_x - 1)
+    north_south = keys[horizontal:].reshape(cells_y - 1, cells_x)
+
+    # first round: the cheapest wall of every cell
+    cheapest = np.full((cells_y, cells_x), np.iinfo(np.int64).max)
+    cheapest[:, 1:] = west_east
+    np.minimum(cheapest[:, :-1], west_east, out=cheapest[:, :-1])
+    np.minimum(cheapest[1:], north_south, out=cheapest[1:])
+    np.minimum(cheapest[:-1], north_south, out=cheapest[:-1])
+    east, west = west_east == cheapest[:, :-1], west_east == cheapest[:, 1:]
+    south, north = north_south == cheapest[:-1], north_south == cheapest[1:]
+    # every cell hooks onto the cell behind its cheapest wall, of two cells that chose each other the east or south
+    # one hooks onto the other
+    parent = np.arange(count, dtype=np.int32).reshape(cells_y, cells_x)
+    parent[:, :-1] += east & ~west
+    parent[:, 1:] -= west
+    parent[:-1] += (south & ~north) * np.int32(cells_x)
+    parent[1:] -= north * np.int32(cells_x)
+    label, components = _roots(parent.ravel())
+    # walls left between components, without the dearest wall around each 2x2 block
+    dearest = np.maximum(np.maximum(west_east[:-1], west_east[1:]),
+                         np.maximum(north_south[:, :-1], north_south[:, 1:]))
+    label = label.reshape(cells_y, cells_x)
+    across_x, across_y = label[:, :-1] != label[:, 1:], label[:-1] != label[1:]
+    across_x[:-1] &= west_east[:-1] != dearest
+    across_x[1:] &= west_east[1:] != dearest
+    across_y[:, :-1] &= north_south[:, :-1] != dearest
+    across_y[:, 1:] &= north_south[:, 1:] != dearest
+    across_x, across_y = np.flatnonzero(across_x), np.flatnonzero(across_y)
+    label = label.ravel()
+    cell_x = across_x + across_x // max(1, cells_x - 1)
+    u = np.concatenate([label[cell_x], label[across_y]])
+    v = np.concatenate([label[cell_x + 1], label[across_y + cells_x]])
+    keys = np.concatenate([keys[across_x], keys[across_y + horizontal]])
+
+    chosen = [keys[:0]]
+    while len(keys):
+        # cheapest wall leaving every component
+        cheapest = np.full(components, np.iinfo(np.int64).max)
+        np.minimum.at(cheapest, u, keys)
+        np.minimum.at(cheapest, v, keys)
+        from_u, from_v = keys == cheapest[u], keys == cheapest[v]
+        chosen.append(keys[from_u | from_v])
+        # hook components along their cheapest wall, pairs that chose each other keep the lower root
+        from_u, from_v = np.flatnonzero(from_u), np.flatnonzero(from_v)
+        nodes = np.arange(components, dtype=np.int32)
+        parent = nodes.copy()
+        parent[u[from_u]] = v[from_u]
+        parent[v[from_v]] = u[from_v]
+        mutual = (parent[parent] == nodes) & (nodes < parent)
+        parent[mutual] = nodes[mutual]
+        label, components = _roots(parent)
+        u, v = label[u], label[v]
+        outside = u != v
+        u, v, keys = u[outside], v[outside], keys[outside]
+
+    board = np.ones((height, width), dtype=np.uint8)
+    board[::2, ::2] = 0
+    board[::2, 1:2 * cells_x - 1:2][east | west] = 0
+    board[1:2 * cells_y - 1:2, ::2][south | north] = 0
+    wall = np.concatenate(chosen) & ((1 << bits) - 1)
+    between_x = wall < horizontal
+    y, x = np.divmod(wall[between_x], max(1, cells_x - 1))
+    board[2 * y, 2 * x + 1] = 0
+    y, x = np.divmod(wall[~between_x] - horizontal, cells_x)
+    board[2 * y + 1, 2 * x] = 0
+    return _rows(board.tobytes(), width)
+
+
+def caves(width, height, fill=0.45, steps=4, seed=0):
+    """
+    Cellular automaton caves: random fill, then every step a cell becomes an obstacle when at least 5 cells of its
+    3x3 neighbourhood are obstacles (outside the board counts as obstacle). Caves can be disconnected.
+    Requires numpy.
+    :param int width:   Board width
+    :param int height:  Board height
+    :param float fill:  Chance of a cell being an obstacle before smoothing
+    :param int steps:   Smoothing steps
+    :param int seed:    Random seed
+    :return: [bytearray]
+    """
+    _require_numpy('caves')
+    rng = np.random.default_rng(seed)
+    threshold = round(fill * 256)
+    board = np.ones((height + 2, width + 2), dtype=np.uint8)
+    board[1:-1, 1:-1] = rng.integers(0, 256, (height, width), dtype=np.uint8) < threshold
+    inner = board[1:-1, 1:-1]
+    rows = np.empty((height + 2, width), dtype=np.uint8)
+    counts = np.empty((height, width), dtype=np.uint8)
+    for _ in range(steps):
+        # 3x3 sums as a row pass then a column pass
+        np.add(board[:, :-2], board[:, 1:-1], out=rows)
+        rows += board[:, 2:]
+        np.add(rows[:-2], rows[1:-1], out=counts)
+        counts += rows[2:]
+        np.greater_equal(counts, 5, out=inner)
+    return _rows(inner.tobytes(), width)
+
+
+def rooms_and_corridors(width, height, room_size=(3, 9), loops=0.1, seed=0):
+    """
+    Rectangular rooms joined by corridors. The board is split into sections of room_size[1] + 2 cells that hold one
+    room each. Every section is joined to its west or north neighbour (a binary tree, so all rooms are connected) and
+    with chance loops to the other one as well, by L-shaped corridors between the room centers.
+    Drawn at once with numpy when it is installed, room by room in Python otherwise, both give the same board.
+    :param int width:   Board width
+    :param int height:  Board height
+    :param (int, int) room_size:    Smallest and largest room width/height
+    :param float loops: Chance of a second corridor, which adds a loop
+    :param int seed:    Random seed
+    :return: [bytearray]
+    """
+    smallest, largest = room_size
+    if not 1 <= smallest <= largest:
+        raise ValueError("room_size must be (smallest, largest) with 1 <= smallest <= largest")
+    section = largest + 2
+    sections_x, sections_y = max(1, width // section), max(1, height // section)
+    span_x, span_y = min(section, width), min(section, height)
+    sizes = largest - smallest + 1
+    loop_threshold = round(loops * 256)
+    # six random bytes per section: room width, height, left and top offset, corridor choice and loop chance
+    randoms = random.Random(seed).randbytes(6 * sections_x * sections_y)
+    if np is not None:
+        return _draw_rooms_and_corridors(width, height, smallest, largest, loop_threshold, randoms)
+    board = [bytearray(b'\x01') * width for _ in range(height)]
+    centers = []
+    position = 0
+    for section_y in range(sections_y):
+        for section_x in range(sections_x):
+            room_x = max(1, min(smallest + randoms[position] % sizes, span_x - 2))
+            room_y = max(1, min(smallest + randoms[position + 1] % sizes, span_y - 2))
+            left = min(section_x * section + 1 + randoms[position + 2] % max(1, span_x - room_x - 1), width - room_x)
+            top = min(section_y * section + 1 + randoms[position + 3] % max(1, span_y - room_y - 1), height - room_y)
+            empty = bytes(room_x)
+            for y in range(top, top + room_y):
+                board[y][left:left + room_x] = empty
+            center_x, center_y = left + room_x // 2, top + room_y // 2
+            joined = []
+            if section_x and section_y:
+                west = randoms[position + 4] & 1
+                joined.append(centers[-1] if west else centers[-sections_x])
+                if randoms[position + 5] < loop_threshold:
+                    joined.append(centers[-sections_x] if west else centers[-1])
+            elif section_x:
+                joined.append(centers[-1])
+            elif section_y:
+                joined.append(centers[-sections_x])
+            for other_x, other_y in joined:
+                # along the row of the other room, then down the column of this one
+                if other_x < center_x:
+                    board[other_y][other_x:center_x + 1] = bytes(center_x + 1 - other_x)
+                else:
+                    board[other_y][center_x:other_x + 1] = bytes(other_x + 1 - center_x)
+                for row in board[other_y:center_y + 1] if other_y < center_y else board[center_y:other_y + 1]:
+                    row[center_x] = 0
+            centers.append((center_x, center_y))
+            position += 6
+    return board
+
+
+def _draw_rooms_and_corridors(width, height, smallest, largest, loop_threshold, randoms):
+    """
+    rooms_and_corridors with numpy: rooms and corridor legs are rectangles, their corners are counted into a
+    difference array whose running sums over both axes are the number of rectangles covering each cell
+    :param bytes randoms:   Six random bytes per section, as drawn by rooms_and_corridors
+    :return: [bytearray]
+    """
+    section = largest + 2
+    sections_x, sections_y = max(1, width // section), max(1, height // section)
+    span_x, span_y = min(section, width), min(section, height)
+    randoms = np.frombuffer(randoms, dtype=np.uint8).reshape(sections_y, sections_x, 6).astype(np.int64)
+    section_x, section_y = np.arange(sections_x), np.arange(sections_y)[:, None]
+    room_x = np.maximum(1, np.minimum(smallest + randoms[..., 0] % (largest - smallest + 1), span_x - 2))
+    room_y = np.maximum(1, np.minimum(smallest + randoms[..., 1] % (largest - smallest + 1), span_y - 2))
+    left = np.minimum(section_x * section + 1 + randoms[..., 2] % np.maximum(1, span_x - room_x - 1), width - room_x)
+    top = np.minimum(section_y * section + 1 + randoms[..., 3] % np.maximum(1, span_y - room_y - 1), height - room_y)
+    center_x, center_y = left + room_x // 2, top + room_y // 2
+    west, loop = (randoms[..., 4] & 1).astype(bool), randoms[..., 5] < loop_threshold
+    to_west = (section_x > 0) & ((section_y == 0) | west | loop)
+    to_north = (section_y > 0) & ((section_x == 0) | ~west | loop)
+    # rectangles [left, right) x [top, bottom)
+    lefts, rights, tops, bottoms = [left], [left + room_x], [top], [top + room_y]
+    for joined, x, y, other_x, other_y in [
+            (to_west[:, 1:], center_x[:, 1:], center_y[:, 1:], center_x[:, :-1], center_y[:, :-1]),
+            (to_north[1:], center_x[1:], center_y[1:], center_x[:-1], center_y[:-1])]:
+        x, y, other_x, other_y = x[joined], y[joined], other_x[joined], other_y[joined]
+        # along the row of the other room, then down the column of this one
+        lefts += [np.minimum(x, other_x), x]
+        rights += [np.maximum(x, other_x) + 1, x + 1]
+        tops += [other_y, np.minimum(y, other_y)]
+        bottoms += [other_y + 1, np.maximum(y, other_y) + 1]
+    lefts, rights, tops, bottoms = [np.concatenate([corner.ravel() for corner in corners])
+                                    for corners in [lefts, rights, tops, bottoms]]
+    tops, bottoms = tops * (width + 1), bottoms * (width + 1)
+    # a cell lies in a room and a few corridors at most, the counts fit in a byte
+    covered = np.zeros((height + 1) * (width + 1), dtype=np.int8)
+    np.add.at(covered, np.concatenate([tops + lefts, bottoms + rights]), np.int8(1))
+    np.add.at(covered, np.concatenate([tops + rights, bottoms + lefts]), np.int8(-1))
+    covered = covered.reshape(height + 1, width + 1)
+    np.cumsum(covered, axis=0, out=covered)
+    np.cumsum(covered, axis=1, out=covered)
+    return _rows((covered[:-1, :-1] == 0).tobytes(), width)
@@ -0,0 +1,101 @@
+import unittest
+from unittest import mock
+from algorithms.dijkstra import Dijkstra, DijkstraGridNode
+from algorithms.grid import Grid
+from maze_generators import generators
+from maze_generators.generators import random_obstacles, recursive_backtracker, rooms_and_corridors, np
+
+if np is not None:
+    from maze_generators.generators import prim_maze, caves
+
+
+def free_cells(board):
+    return [(x, y) for y, row in enumerate(board) for x, value in enumerate(row) if value == 0]
+
+
+def reached(board, start):
+    """
+    :return: set of free cells 4-connected to start
+    """
+    seen, stack = {start}, [start]
+    while stack:
+        x, y = stack.pop()
+        for neighbour in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
+            if neighbour not in seen and 0 <= neighbour[0] < len(board[0]) and 0 <= neighbour[1] < len(board) \
+                    and board[neighbour[1]][neighbour[0]] == 0:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+class TestGenerators(unittest.TestCase):
+
+    def assertPerfectMaze(self, board, width, height):
+        self.assertEqual((len(board[0]), len(board)), (width, height))
+        cells = ((width + 1) // 2) * ((height + 1) // 2)
+        free = free_cells(board)
+        # every cell reached and one wall opened less than there are cells: a spanning tree
+        self.assertEqual(len(free), 2 * cells - 1)
+        self.assertEqual(reached(board, (0, 0)), set(free))
+
+    def test_recursive_backtracker(self):
+        for width, height in [(1, 1), (2, 7), (21, 15), (40, 40)]:
+            self.assertPerfectMaze(recursive_backtracker(width, height, seed=3), width, height)
+        self.assertEqual(recursive_backtracker(31, 31, seed=1), recursive_backtracker(31, 31, seed=1))
+        self.assertNotEqual(recursive_backtracker(31, 31, seed=1), recursive_backtracker(31, 31, seed=2))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_prim_maze(self):
+        for width, height in [(1, 1), (2, 7), (21, 15), (40, 40)]:
+            self.assertPerfectMaze(prim_maze(width, height, seed=3), width, height)
+        self.assertEqual(prim_maze(31, 31, seed=1), prim_maze(31, 31, seed=1))
+        self.assertNotEqual(prim_maze(31, 31, seed=1), prim_maze(31, 31, seed=2))
+
+    def test_random_obstacles(self):
+        board = random_obstacles(200, 100, 0.3, seed=5)
+        self.assertEqual((len(board[0]), len(board)), (200, 100))
+        self.assertAlmostEqual(sum(row.count(1) for row in board) / 20000, 0.3, delta=0.02)
+        self.assertEqual(board, random_obstacles(200, 100, 0.3, seed=5))
+        self.assertEqual(free_cells(random_obstacles(10, 10, 0.0)), free_cells([[0] * 10] * 10))
+        self.assertEqual(free_cells(random_obstacles(10, 10, 1.0)), [])
+        self.assertRaises(ValueError, random_obstacles, 10, 10, 1.5)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_caves(self):
+        board = caves(120, 80, seed=2)
+        self.assertEqual((len(board[0]), len(board)), (120, 80))
+        self.assertEqual(board, caves(120, 80, seed=2))
+        self.assertTrue(set(bytes().join(board)) <= {0, 1})
+        free = len(free_cells(board))
+        self.assertTrue(0 < free < 120 * 80)
+        # smoothing removes isolated obstacles
+        self.assertGreater(free, len(free_cells(caves(120, 80, steps=0, seed=2))))
+
+    def test_rooms_and_corridors(self):
+        for width, height in [(3, 3), (11, 11), (60, 35), (100, 100)]:
+            board = rooms_and_corridors(width, height, seed=4)
+            self.assertEqual((len(board[0]), len(board)), (width, height))
+            free = free_cells(board)
+            self.assertTrue(free)
+            self.assertEqual(reached(board, free[0]), set(free))
+        self.assertEqual(rooms_and_corridors(50, 50, seed=1), rooms_and_corridors(50, 50, seed=1))
+        self.assertRaises(ValueError, rooms_and_corridors, 50, 50, (5, 4))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_rooms_and_corridors_without_numpy(self):
+        for width, height, kwargs in [(3, 3, {}), (60, 35, {}), (100, 100, {'room_size': (1, 2), 'loops': 1}),
+                                      (90, 40, {'room_size': (2, 20), 'loops': 0.5, 'seed': 7})]:
+            with mock.patch.object(generators, 'np', None):
+                board = rooms_and_corridors(width, height, **kwargs)
+            self.assertEqual(rooms_and_corridors(width, height, **kwargs), board)
+
+    def test_search(self):
+        board = recursive_backtracker(21, 21, seed=0)
+        grid = Grid.from_board(board)
+        result = Dijkstra(start=(0, 0), end=(20, 20), board=grid, node_type=DijkstraGridNode).solve()
+        self.assertIsNotNone(result.cost)
+        self.assertEqual(len(result.path), len(set(result.path)))
+
+
+if __name__ == '__main__':
+    unittest.main()